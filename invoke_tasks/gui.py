@@ -6,19 +6,80 @@ Electron-based desktop GUI client.
 
 from invoke import task
 
+# Written into node_modules after an install; holds the package-lock.json
+# hash the install was made from
+LOCK_HASH_FILE = ".putplace-lock-hash"
+
+
+def _lockfile_hash(electron_dir):
+    """Return the sha256 of package-lock.json, or None if there isn't one."""
+    import hashlib
+    import os
+
+    try:
+        with open(os.path.join(electron_dir, "package-lock.json"), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _ensure_node_modules(c, electron_dir):
+    """Install npm dependencies unless node_modules matches package-lock.json.
+
+    Installs when node_modules is missing or was installed from a different
+    lockfile, so dependency changes are picked up and unchanged trees skip
+    npm entirely. Installs use `npm ci`, which takes the lockfile as-is
+    instead of re-resolving the dependency tree.
+    """
+    import os
+
+    node_modules = os.path.join(electron_dir, "node_modules")
+    stamp_path = os.path.join(node_modules, LOCK_HASH_FILE)
+    lock_hash = _lockfile_hash(electron_dir)
+
+    if os.path.exists(node_modules):
+        if lock_hash is None:
+            return
+        try:
+            with open(stamp_path) as f:
+                if f.read().strip() == lock_hash:
+                    return
+        except OSError:
+            pass
+
+    print("📦 Installing npm dependencies...")
+    with c.cd(electron_dir):
+        if lock_hash is None:
+            # npm ci needs a lockfile; npm install will create one
+            c.run("npm install --no-audit --no-fund")
+            lock_hash = _lockfile_hash(electron_dir)
+        else:
+            c.run("npm ci --prefer-offline --no-audit --no-fund")
+
+    if lock_hash is not None:
+        with open(stamp_path, "w") as f:
+            f.write(lock_hash)
+
 
 @task
-def pp_gui_build(c):
+def pp_gui_build(c, clean=False):
     """Build the Electron GUI desktop app.
 
     Builds the TypeScript source files and copies assets to dist directory.
     The Electron app provides a modern cross-platform desktop interface.
 
+    TypeScript compiles incrementally: build info is kept in
+    dist/.tsbuildinfo, so only changed files are recompiled.
+
+    Args:
+        clean: Remove dist/ first for a full rebuild (default: False)
+
     Requirements:
         - Node.js and npm must be installed
         - Run from project root directory
     """
     import os
+    import shutil
     electron_dir = "pp_gui_client"
 
     if not os.path.exists(electron_dir):
@@ -26,13 +87,13 @@ def pp_gui_build(c):
         print("Make sure you're running from the project root directory")
         return
 
+    if clean:
+        print("🧹 Removing previous build output...")
+        shutil.rmtree(os.path.join(electron_dir, "dist"), ignore_errors=True)
+
     print("🔨 Building Electron GUI app...")
+    _ensure_node_modules(c, electron_dir)
     with c.cd(electron_dir):
-        # Check if node_modules exists
-        if not os.path.exists(f"{electron_dir}/node_modules"):
-            print("📦 Installing npm dependencies...")
-            c.run("npm install")
-
         print("🔧 Compiling TypeScript and copying assets...")
         c.run("npm run build")
 
@@ -59,12 +120,8 @@ def pp_gui_package(c):
         return
 
     print("📦 Packaging Electron GUI app...")
+    _ensure_node_modules(c, electron_dir)
     with c.cd(electron_dir):
-        # Check if node_modules exists
-        if not os.path.exists(f"{electron_dir}/node_modules"):
-            print("📦 Installing npm dependencies...")
-            c.run("npm install")
-
         print("🔧 Building and packaging app...")
         c.run("npm run package")
 
@@ -123,12 +180,8 @@ def pp_gui(c, dev=False, packaged=False):
     else:
         # Development mode - build and run directly
         print("🔨 Building Electron app...")
+        _ensure_node_modules(c, electron_dir)
         with c.cd(electron_dir):
-            # Install dependencies if needed
-            if not os.path.exists("node_modules"):
-                print("📦 Installing dependencies...")
-                c.run("npm install")
-
             # Build TypeScript files
             result = c.run("npm run build", warn=True, hide=True)
             if not result.ok:
@@ -215,9 +268,10 @@ def pp_gui_test_install(c, automated=False):
             print(f"  Removing existing installation...")
             c.run(f'rm -rf "{installed_app}"', warn=True)
 
-        # Copy the app bundle directly
+        # Copy the app bundle directly (-c clones on APFS, so the copy is
+        # nearly instant; cp falls back to a normal copy elsewhere)
         print(f"  Copying app to /Applications...")
-        c.run(f'cp -R "{app_bundle}" /Applications/')
+        c.run(f'cp -cR "{app_bundle}" /Applications/')
         print("✓ App installed\n")
     else:
         print("Step 2: Opening DMG installer...")
@@ -237,7 +291,7 @@ def pp_gui_test_install(c, automated=False):
             automated = True
             if os.path.exists(installed_app):
                 c.run(f'rm -rf "{installed_app}"', warn=True)
-            c.run(f'cp -R "{app_bundle}" /Applications/')
+            c.run(f'cp -cR "{app_bundle}" /Applications/')
             print("✓ App installed")
 
     # Step 3: Test launching the installed app
@@ -36,6 +36,54 @@ def flush_dns(c):
         print("❌ Failed to flush DNS cache")
 
 
+RELEASES_URL = "https://api.github.com/repos/jdrumgoole/putplace/releases"
+RELEASE_CACHE_FILE = "~/.cache/putplace/latest_release.json"
+RELEASE_CACHE_TTL_SECONDS = 600
+
+
+def _latest_electron_release_tag():
+    """Return the tag of the newest Electron client release, or "" if none.
+
+    The GitHub API response is cached for RELEASE_CACHE_TTL_SECONDS so
+    repeated installs don't hit the API.
+    """
+    import json
+    import os
+    import time
+    import urllib.error
+    import urllib.request
+
+    cache_path = os.path.expanduser(RELEASE_CACHE_FILE)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < RELEASE_CACHE_TTL_SECONDS:
+            with open(cache_path) as f:
+                return json.load(f)["tag_name"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    try:
+        with urllib.request.urlopen(RELEASES_URL, timeout=10) as response:
+            releases = json.load(response)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"   Could not query GitHub releases: {e}")
+        return ""
+
+    latest = next(
+        (r for r in releases if r.get("tag_name", "").startswith("electron-v")), None
+    )
+    if latest is None:
+        return ""
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump({"tag_name": latest["tag_name"]}, f)
+    except OSError:
+        pass
+
+    return latest["tag_name"]
+
+
 @task
 def install_electron_client(c, arch="arm64"):
     """Download and install the latest PutPlace Electron Client (macOS only).
@@ -74,16 +122,7 @@ def install_electron_client(c, arch="arm64"):
 
     # Step 1: Get latest release info from GitHub
     print("1️⃣  Fetching latest release info from GitHub...")
-    result = c.run(
-        "curl -s https://api.github.com/repos/jdrumgoole/putplace/releases | "
-        "python3 -c \"import sys, json; "
-        "releases = json.load(sys.stdin); "
-        "electron_releases = [r for r in releases if r['tag_name'].startswith('electron-v')]; "
-        "print(electron_releases[0]['tag_name'] if electron_releases else '')\"",
-        hide=True,
-    )
-
-    latest_tag = result.stdout.strip()
+    latest_tag = _latest_electron_release_tag()
     if not latest_tag:
         print("❌ Could not find latest Electron release")
         return
@@ -142,9 +181,10 @@ def install_electron_client(c, arch="arm64"):
     # Remove old version if it exists
     c.run('rm -rf "/Applications/PutPlace Client.app"', warn=True, hide=True)
 
-    # Copy new version
+    # Copy new version (-c clones where the filesystem allows it and falls
+    # back to a normal copy otherwise, e.g. from the DMG's own volume)
     result = c.run(
-        f'cp -R "{volume_path}/PutPlace Client.app" /Applications/',
+        f'cp -cR "{volume_path}/PutPlace Client.app" /Applications/',
         warn=True,
     )
 
@@ -176,3 +216,34 @@ def install_electron_client(c, arch="arm64"):
     print("   • Spotlight (Cmd+Space, type 'PutPlace')")
     print("   • Command: open -a 'PutPlace Client'")
     print(f"\nDownloaded DMG saved at: {download_path}")
+
+
+@task
+def pp_scan_cache_clear(c, host="127.0.0.1", port=8765):
+    """Clear the pp_assist scan cache so the next scan walks every directory.
+
+    The scan cache (enabled with [scanner] cache_enabled) skips directories
+    whose mtime has not changed since the last scan. Clear it after editing
+    files in place under a registered path.
+
+    Args:
+        host: pp_assist host. Default: 127.0.0.1
+        port: pp_assist port. Default: 8765
+
+    Examples:
+        invoke pp-scan-cache-clear
+        invoke pp-scan-cache-clear --port=9000
+    """
+    import json
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(f"http://{host}:{port}/scan/cache", method="DELETE")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            result = json.load(response)
+    except (urllib.error.URLError, OSError) as e:
+        print(f"❌ Could not reach pp_assist at {host}:{port}: {e}")
+        return
+
+    print(f"✓ Scan cache cleared ({result.get('directories', 0)} directories)")
@@ -89,6 +89,11 @@ def load_toml_config() -> dict:
         for key, value in config["sha256"].items():
             flat[f"sha256_{key}"] = value
 
+    # Scanner settings
+    if "scanner" in config:
+        for key, value in config["scanner"].items():
+            flat[f"scanner_{key}"] = value
+
     # Remote server settings
     if "remote_server" in config:
         for key, value in config["remote_server"].items():
@@ -152,9 +157,15 @@ class Settings(BaseSettings):
         default=65536,
         description="Chunk size for reading files during SHA256 calculation (bytes)"
     )
-    sha256_chunk_delay_ms: int = Field(
-        default=1,
-        description="Delay in milliseconds between chunks to avoid CPU saturation"
+    sha256_nice: int = Field(
+        default=10,
+        ge=0,
+        description="Niceness increment for the hashing worker, Linux only (0 = normal priority)"
+    )
+    sha256_workers: int = Field(
+        default=0,
+        ge=0,
+        description="Number of files hashed in parallel (0 = one per CPU core)"
     )
     sha256_batch_size: int = Field(
         default=100,
@@ -165,6 +176,21 @@ class Settings(BaseSettings):
         description="Delay between processing batches"
     )
 
+    # Scanner settings
+    scanner_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Number of threads used to walk directory trees during a scan"
+    )
+    scanner_cache_enabled: bool = Field(
+        default=False,
+        description=(
+            "Skip directories whose mtime is unchanged since the last scan. "
+            "Faster rescans, but in-place edits to existing files are only "
+            "picked up by the watcher"
+        ),
+    )
+
     # PID file location
     pid_file: str = Field(
         default="~/.local/share/putplace/ppassist.pid",
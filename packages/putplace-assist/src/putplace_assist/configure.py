@@ -226,7 +226,7 @@ def configure_sha256() -> dict:
     if not advanced:
         return {
             "chunk_size": 65536,
-            "chunk_delay_ms": 1,
+            "nice": 10,
             "batch_size": 100,
             "batch_delay_seconds": 1.0,
         }
@@ -237,9 +237,9 @@ def configure_sha256() -> dict:
             default=65536,
             min_val=1024
         ),
-        "chunk_delay_ms": prompt_int(
-            "Delay between chunks in milliseconds",
-            default=1,
+        "nice": prompt_int(
+            "Niceness for the hashing worker (0-19, higher = lower priority)",
+            default=10,
             min_val=0
         ),
         "batch_size": prompt_int(
@@ -338,7 +338,7 @@ Examples:
                 },
                 "sha256": {
                     "chunk_size": 65536,
-                    "chunk_delay_ms": 1,
+                    "nice": 10,
                     "batch_size": 100,
                     "batch_delay_seconds": 1.0,
                 },
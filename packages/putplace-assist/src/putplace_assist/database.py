@@ -1,5 +1,6 @@
 """SQLite database operations for putplace-assist."""
 
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -171,6 +172,14 @@ CREATE INDEX IF NOT EXISTS idx_files_path ON files(filepath);
 CREATE INDEX IF NOT EXISTS idx_files_sha256 ON files(sha256);
 CREATE INDEX IF NOT EXISTS idx_files_status ON files(status);
 CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(file_mtime);
+
+-- Directory signatures from the last scan, used to skip unchanged directories
+CREATE TABLE IF NOT EXISTS scan_cache (
+    dir_path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    entry_count INTEGER NOT NULL,  -- regular files directly in the directory
+    signature BLOB NOT NULL  -- NUL-separated subdirectory names
+);
 """
 
 
@@ -215,6 +224,10 @@ class Database:
         self.db_path = db_path or settings.db_path_resolved
         self._connection: Optional[aiosqlite.Connection] = None
         self._current_month_table: Optional[str] = None
+        # Set whenever files are added to the checksum queue
+        self.checksum_queued = asyncio.Event()
+        # Set whenever files are added to the upload queue
+        self.upload_queued = asyncio.Event()
 
     async def connect(self) -> None:
         """Connect to the database and create tables if needed."""
@@ -317,21 +330,107 @@ class Database:
 
     async def delete_path(self, path_id: int) -> bool:
         """Delete a path."""
+        path = await self.get_path(path_id)
         cursor = await self.connection.execute(
             "DELETE FROM registered_paths WHERE id = ?",
             (path_id,),
         )
+        if path:
+            await self._delete_scan_cache(path.path)
         await self.connection.commit()
         return cursor.rowcount > 0
 
-    async def update_path_scanned(self, path_id: int) -> None:
-        """Update the last_scanned_at timestamp."""
+    async def update_path_scanned(
+        self,
+        path_id: int,
+        scan_root: Optional[str] = None,
+        scan_cache: Optional[dict[str, tuple[float, int, list[str]]]] = None,
+    ) -> None:
+        """Update the last_scanned_at timestamp.
+
+        Args:
+            path_id: ID of the registered path
+            scan_root: Resolved directory that was scanned
+            scan_cache: Directory signatures recorded by the scan, keyed by
+                directory path. When given, they replace the cached
+                signatures under scan_root in the same transaction.
+        """
+        if scan_root is not None and scan_cache is not None:
+            await self._delete_scan_cache(scan_root)
+            await self.connection.executemany(
+                """
+                INSERT OR REPLACE INTO scan_cache (dir_path, mtime, entry_count, signature)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (
+                        dir_path,
+                        mtime,
+                        entry_count,
+                        "\0".join(subdirs).encode("utf-8", "surrogateescape"),
+                    )
+                    for dir_path, (mtime, entry_count, subdirs) in scan_cache.items()
+                ],
+            )
+
         await self.connection.execute(
             "UPDATE registered_paths SET last_scanned_at = ? WHERE id = ?",
             (datetime.utcnow().isoformat(), path_id),
         )
         await self.connection.commit()
 
+    # ===== Scan Cache =====
+
+    async def get_scan_cache(self, scan_root: str) -> dict[str, tuple[float, int, list[str]]]:
+        """Get the cached directory signatures under a scan root.
+
+        Args:
+            scan_root: Resolved directory being scanned
+
+        Returns:
+            Dict mapping directory path to (mtime, entry_count, subdirectory names)
+        """
+        prefix = scan_root.rstrip("/") + "/"
+        cursor = await self.connection.execute(
+            """
+            SELECT dir_path, mtime, entry_count, signature FROM scan_cache
+            WHERE dir_path = ? OR substr(dir_path, 1, ?) = ?
+            """,
+            (scan_root, len(prefix), prefix),
+        )
+        rows = await cursor.fetchall()
+
+        cache = {}
+        for row in rows:
+            signature = bytes(row["signature"]).decode("utf-8", "surrogateescape")
+            subdirs = signature.split("\0") if signature else []
+            cache[row["dir_path"]] = (row["mtime"], row["entry_count"], subdirs)
+        return cache
+
+    async def clear_scan_cache(self, scan_root: Optional[str] = None) -> int:
+        """Forget cached directory signatures so the next scan walks everything.
+
+        Args:
+            scan_root: Only clear directories under this path (default: all)
+
+        Returns:
+            Number of cached directories removed
+        """
+        if scan_root is None:
+            cursor = await self.connection.execute("DELETE FROM scan_cache")
+        else:
+            cursor = await self._delete_scan_cache(scan_root)
+        await self.connection.commit()
+        return cursor.rowcount
+
+    async def _delete_scan_cache(self, scan_root: str) -> aiosqlite.Cursor:
+        """Delete cached signatures under a scan root without committing."""
+        prefix = scan_root.rstrip("/") + "/"
+        return await self.connection.execute(
+            "DELETE FROM scan_cache WHERE dir_path = ? OR substr(dir_path, 1, ?) = ?",
+            (scan_root, len(prefix), prefix),
+        )
+
     async def get_path_file_count(self, path_id: int) -> int:
         """Get the number of files logged for a path.
 
@@ -396,6 +495,10 @@ class Database:
             "DELETE FROM exclude_patterns WHERE id = ?",
             (pattern_id,),
         )
+        if cursor.rowcount > 0:
+            # Files the pattern used to hide may sit in directories the scan
+            # cache would skip, so the next scan has to walk everything
+            await self.connection.execute("DELETE FROM scan_cache")
         await self.connection.commit()
         return cursor.rowcount > 0
 
@@ -1070,6 +1173,7 @@ class Database:
             (filepath, reason),
         )
         await self.connection.commit()
+        self.checksum_queued.set()
 
     async def dequeue_for_checksum(self, limit: int = 1) -> list[dict]:
         """Get next files from checksum queue (FIFO).
@@ -1093,6 +1197,17 @@ class Database:
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
+    async def count_pending_checksums(self) -> int:
+        """Get the number of files waiting in the checksum queue.
+
+        Returns:
+            Number of entries in queue_pending_checksum
+        """
+        cursor = await self.connection.execute(
+            "SELECT COUNT(*) FROM queue_pending_checksum"
+        )
+        return (await cursor.fetchone())[0]
+
     async def remove_from_checksum_queue(self, filepath: str) -> None:
         """Remove file from checksum queue.
 
@@ -1119,6 +1234,7 @@ class Database:
             (filepath, sha256),
         )
         await self.connection.commit()
+        self.upload_queued.set()
 
     async def dequeue_for_upload(self, limit: int = 1) -> list[dict]:
         """Get next files from upload queue (FIFO).
@@ -1274,6 +1390,113 @@ class Database:
         )
         await self.connection.commit()
 
+    async def upsert_files_bulk(self, rows: list[dict]) -> dict[str, str]:
+        """Insert or update many files and queue new/modified ones for checksum.
+
+        All rows are written in a single transaction. A file is queued when it
+        is not yet in the files table ('new') or its mtime is newer than the
+        stored one ('modified'); unchanged files keep their sha256 and status
+        and only have their stat fields and last_checked_at refreshed.
+
+        Args:
+            rows: File dicts with keys filepath, file_size, file_mtime,
+                file_mode, file_uid, file_gid, file_atime, file_ctime
+
+        Returns:
+            Mapping of filepath to queue reason ('new' or 'modified') for every
+            file that was queued for checksum
+        """
+        if not rows:
+            return {}
+
+        # Look up existing records, staying below SQLite's bound-variable limit
+        existing: dict[str, tuple[float, Optional[str]]] = {}
+        filepaths = [row["filepath"] for row in rows]
+        for start in range(0, len(filepaths), 500):
+            chunk = filepaths[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await self.connection.execute(
+                "SELECT filepath, file_mtime, status FROM files "
+                f"WHERE filepath IN ({placeholders})",
+                chunk,
+            )
+            for row in await cursor.fetchall():
+                existing[row["filepath"]] = (row["file_mtime"], row["status"])
+
+        queued: dict[str, str] = {}
+        file_params = []
+        for row in rows:
+            filepath = row["filepath"]
+            previous = existing.get(filepath)
+            if previous is None:
+                queued[filepath] = "new"
+                status = "discovered"
+            elif row["file_mtime"] > previous[0]:
+                queued[filepath] = "modified"
+                status = "discovered"
+            else:
+                status = previous[1] or "unchanged"
+
+            file_params.append((
+                filepath, row["file_size"], row["file_mtime"], row["file_mode"],
+                row["file_uid"], row["file_gid"], row["file_atime"], row["file_ctime"],
+                status,
+            ))
+
+        await self.connection.executemany(
+            """
+            INSERT INTO files (
+                filepath, file_size, file_mtime, file_mode, file_uid, file_gid,
+                file_atime, file_ctime, status, last_checked_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+            ON CONFLICT(filepath) DO UPDATE SET
+                file_size = excluded.file_size,
+                file_mtime = excluded.file_mtime,
+                file_mode = excluded.file_mode,
+                file_uid = excluded.file_uid,
+                file_gid = excluded.file_gid,
+                file_atime = excluded.file_atime,
+                file_ctime = excluded.file_ctime,
+                status = excluded.status,
+                last_checked_at = datetime('now')
+            """,
+            file_params,
+        )
+
+        if queued:
+            await self.connection.executemany(
+                """
+                INSERT OR IGNORE INTO queue_pending_checksum (filepath, reason)
+                VALUES (?, ?)
+                """,
+                list(queued.items()),
+            )
+
+        await self.connection.commit()
+        if queued:
+            self.checksum_queued.set()
+        return queued
+
+    async def get_file_times(self, path_prefix: str) -> dict[str, tuple[float, Optional[float]]]:
+        """Get the recorded (mtime, ctime) of every file under a directory.
+
+        Loaded once at the start of a scan so unchanged files can be skipped
+        without a database round trip.
+
+        Args:
+            path_prefix: Resolved directory path
+
+        Returns:
+            Dict mapping filepath to (file_mtime, file_ctime)
+        """
+        prefix = path_prefix.rstrip("/") + "/"
+        cursor = await self.connection.execute(
+            "SELECT filepath, file_mtime, file_ctime FROM files WHERE substr(filepath, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+        return {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
+
     async def get_file(self, filepath: str) -> Optional[dict]:
         """Get file from files table.
 
@@ -1306,6 +1529,59 @@ class Database:
         )
         await self.connection.commit()
 
+    async def complete_checksums(self, results: list[tuple[str, str, bool]]) -> None:
+        """Record calculated checksums for a batch in a single transaction.
+
+        Changed files are marked 'ready_for_upload' and queued for upload;
+        files whose checksum matches the stored one are marked 'unchanged'.
+        Every file is removed from the checksum queue.
+
+        Args:
+            results: (filepath, sha256, changed) tuples
+        """
+        if not results:
+            return
+
+        changed = [
+            (sha256, filepath) for filepath, sha256, is_changed in results if is_changed
+        ]
+        unchanged = [
+            (sha256, filepath) for filepath, sha256, is_changed in results if not is_changed
+        ]
+
+        if changed:
+            await self.connection.executemany(
+                """
+                UPDATE files
+                SET sha256 = ?, status = 'ready_for_upload', last_checked_at = datetime('now')
+                WHERE filepath = ?
+                """,
+                changed,
+            )
+            await self.connection.executemany(
+                """
+                INSERT OR IGNORE INTO queue_pending_upload (sha256, filepath)
+                VALUES (?, ?)
+                """,
+                changed,
+            )
+        if unchanged:
+            await self.connection.executemany(
+                """
+                UPDATE files
+                SET sha256 = ?, status = 'unchanged', last_checked_at = datetime('now')
+                WHERE filepath = ?
+                """,
+                unchanged,
+            )
+        await self.connection.executemany(
+            "DELETE FROM queue_pending_checksum WHERE filepath = ?",
+            [(filepath,) for filepath, _, _ in results],
+        )
+        await self.connection.commit()
+        if changed:
+            self.upload_queued.set()
+
     async def mark_file_uploaded(self, filepath: str) -> None:
         """Mark file as uploaded.
 
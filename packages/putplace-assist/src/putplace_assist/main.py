@@ -783,6 +783,13 @@ async def scan_all_paths_background():
         logger.error(f"Full scan failed: {e}")
 
 
+@app.delete("/scan/cache", tags=["Scanning"])
+async def clear_scan_cache():
+    """Clear the scan cache so the next scan walks every directory."""
+    cleared = await db.clear_scan_cache()
+    return {"status": "cleared", "directories": cleared}
+
+
 # ===== Root =====
 
 
@@ -821,17 +828,27 @@ async def get_config():
             },
             "sha256": {
                 "chunk_size": settings.sha256_chunk_size,
-                "chunk_delay_ms": settings.sha256_chunk_delay_ms,
+                "nice": settings.sha256_nice,
+                "workers": settings.sha256_workers,
                 "batch_size": settings.sha256_batch_size,
                 "batch_delay_seconds": settings.sha256_batch_delay_seconds,
             },
+            "scanner": {
+                "cache_enabled": settings.scanner_cache_enabled,
+                "workers": settings.scanner_workers,
+            },
         }
     }
 
 
 @app.post("/config", tags=["Configuration"])
 async def save_config(config: dict):
-    """Save configuration to config file."""
+    """Save configuration to config file.
+
+    The new settings are merged into the existing file, so sections and keys
+    missing from the request (e.g. the remote server password, or settings
+    the UI does not show) keep their current values.
+    """
     from .config import find_config_file
     import tomli_w
     import sys
@@ -848,22 +865,23 @@ async def save_config(config: dict):
         config_file = Path.home() / ".config" / "putplace" / "pp_assist.toml"
         config_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # If password not provided in new config, preserve existing password
-    if config_file.exists() and "password" not in config.get("remote_server", {}):
+    merged: dict = {}
+    if config_file.exists():
         try:
             with open(config_file, "rb") as f:
-                existing_config = tomllib.load(f)
-            # Preserve existing password if present
-            if "remote_server" in existing_config and "password" in existing_config["remote_server"]:
-                if "remote_server" not in config:
-                    config["remote_server"] = {}
-                config["remote_server"]["password"] = existing_config["remote_server"]["password"]
+                merged = tomllib.load(f)
         except Exception:
             pass  # If we can't read existing config, just save the new one
 
+    for section, values in config.items():
+        if isinstance(values, dict) and isinstance(merged.get(section), dict):
+            merged[section].update(values)
+        else:
+            merged[section] = values
+
     # Write TOML file
     with open(config_file, "wb") as f:
-        tomli_w.dump(config, f)
+        tomli_w.dump(merged, f)
 
     return {
         "status": "saved",
@@ -21,11 +21,13 @@ class EventType(str, Enum):
     SCAN_STARTED = "scan_started"
     SCAN_COMPLETE = "scan_complete"
     FILE_DISCOVERED = "file_discovered"
+    FILE_DISCOVERED_BATCH = "file_discovered_batch"
     FILE_CHANGED = "file_changed"
     FILE_DELETED = "file_deleted"
     FILE_MODIFIED = "file_modified"
     SHA256_STARTED = "sha256_started"
     SHA256_COMPLETE = "sha256_complete"
+    SHA256_BATCH_COMPLETE = "sha256_batch_complete"
     SHA256_FAILED = "sha256_failed"
     UPLOAD_STARTED = "upload_started"
     UPLOAD_PROGRESS = "upload_progress"
@@ -8,18 +8,42 @@ import asyncio
 import fnmatch
 import logging
 import os
-from dataclasses import dataclass
+import queue
+import re
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional, Sequence, Union
 
 from .activity import activity_manager
+from .config import settings
 from .database import db
 from .models import EventType
 
 logger = logging.getLogger(__name__)
 
+# Number of files written to the database per transaction during a scan
+SCAN_BATCH_SIZE = 1000
 
-@dataclass
+# A scan reports progress after this many files or this many seconds,
+# whichever comes first, so a slow callback (e.g. a GUI over IPC) does not
+# throttle the scan itself
+PROGRESS_EVERY_FILES = 500
+PROGRESS_INTERVAL_SECONDS = 0.1
+
+# Number of example filenames carried by each FILE_DISCOVERED_BATCH event
+DISCOVERED_SAMPLE_SIZE = 3
+
+# List directories through an open descriptor where os.scandir accepts one
+# (Linux, macOS); elsewhere fall back to listing by path
+_SCANDIR_BY_FD = os.scandir in os.supports_fd
+_DIR_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+@dataclass(slots=True)
 class FileMetadata:
     """Metadata collected from a file."""
 
@@ -33,7 +57,7 @@ class FileMetadata:
     file_ctime: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanProgress:
     """Progress information for a scan."""
 
@@ -47,7 +71,7 @@ class ScanProgress:
     current_file: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """Result of a directory scan."""
 
@@ -60,38 +84,189 @@ class ScanResult:
     errors: list[tuple[str, str]]  # List of (filepath, error_message)
 
 
-def get_file_stats(filepath: Path) -> Optional[dict]:
-    """Get file stat information.
+def file_metadata_from_stat(filepath: Path, stat_info: os.stat_result) -> FileMetadata:
+    """Build FileMetadata from a stat result.
 
     Args:
         filepath: Path to the file
+        stat_info: Stat result for the file
 
     Returns:
-        Dictionary with stat information or None if stat fails
+        FileMetadata for the file
     """
-    try:
-        stat_info = os.stat(filepath)
-        return {
-            "file_size": stat_info.st_size,
-            "file_mode": stat_info.st_mode,
-            "file_uid": stat_info.st_uid,
-            "file_gid": stat_info.st_gid,
-            "file_mtime": stat_info.st_mtime,
-            "file_atime": stat_info.st_atime,
-            "file_ctime": stat_info.st_ctime,
-        }
-    except (IOError, OSError) as e:
-        logger.warning(f"Cannot stat {filepath}: {e}")
+    return FileMetadata(
+        filepath=filepath,
+        file_size=stat_info.st_size,
+        file_mode=stat_info.st_mode,
+        file_uid=stat_info.st_uid,
+        file_gid=stat_info.st_gid,
+        file_mtime=stat_info.st_mtime,
+        file_atime=stat_info.st_atime,
+        file_ctime=stat_info.st_ctime,
+    )
+
+
+def _compile_wildcards(patterns: Sequence[str]) -> Optional[re.Pattern]:
+    """Fold fnmatch patterns into one regex, or None if there are none."""
+    if not patterns:
         return None
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+@dataclass
+class ExcludeMatcher:
+    """Exclude patterns compiled once for matching many paths.
+
+    A pattern excludes a path if it equals the relative path or any of its
+    parts, or - for patterns containing "*" - if it fnmatch-es the relative
+    path or any of its parts. A pattern ending in "/" only matches directory
+    names, and excludes everything below a matching directory.
+
+    Literal patterns are split into those that can only equal a whole
+    relative path (they contain a separator) and those that can equal a
+    single part, so the common case is a set lookup. Wildcard patterns are
+    folded into a single regex.
+    """
+
+    patterns: tuple[str, ...]
+    literal_paths: frozenset[str] = field(init=False)
+    literal_parts: frozenset[str] = field(init=False)
+    wildcard_re: Optional[re.Pattern] = field(init=False)
+    dir_names: frozenset[str] = field(init=False)
+    dir_wildcard_re: Optional[re.Pattern] = field(init=False)
+    fold_case: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        # normcase is the identity on POSIX; only pay for it where it folds
+        self.fold_case = os.path.normcase("A") != "A"
+
+        file_patterns = []
+        dir_patterns = []
+        for pattern in self.patterns:
+            if pattern.endswith(("/", os.sep)):
+                dir_patterns.append(pattern.rstrip("/" + os.sep))
+            else:
+                file_patterns.append(pattern)
+
+        literals = [p for p in file_patterns if "*" not in p]
+        self.literal_paths = frozenset(p for p in literals if os.sep in p)
+        self.literal_parts = frozenset(p for p in literals if os.sep not in p)
+        self.wildcard_re = _compile_wildcards([p for p in file_patterns if "*" in p])
+        self.dir_names = frozenset(p for p in dir_patterns if "*" not in p)
+        self.dir_wildcard_re = _compile_wildcards([p for p in dir_patterns if "*" in p])
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    @property
+    def prunes_directories(self) -> bool:
+        """Whether any pattern can exclude a whole directory by its name."""
+        return bool(
+            self.literal_parts or self.wildcard_re or self.dir_names or self.dir_wildcard_re
+        )
+
+    def matches(self, relative_str: str, parts: Sequence[str]) -> bool:
+        """Check a path, given relative to the scan root, against the patterns.
+
+        Args:
+            relative_str: Path relative to the base path
+            parts: Components of the relative path
+
+        Returns:
+            True if any pattern matches
+        """
+        if relative_str in self.literal_paths:
+            return True
+
+        if not self.literal_parts.isdisjoint(parts):
+            return True
 
+        wildcard_re = self.wildcard_re
+        if wildcard_re is not None:
+            if self.fold_case:
+                normcase = os.path.normcase
+                relative_str = normcase(relative_str)
+                parts = [normcase(part) for part in parts]
 
-def matches_exclude_pattern(path: Path, base_path: Path, patterns: list[str]) -> bool:
+            # All wildcard patterns are one regex, and map/any keep the
+            # per-part loop in C
+            if wildcard_re.match(relative_str) or any(map(wildcard_re.match, parts)):
+                return True
+
+        if self.dir_names or self.dir_wildcard_re is not None:
+            for directory in parts[:-1]:
+                if self.matches_dir(directory):
+                    return True
+
+        return False
+
+    def matches_file(self, relative_str: str, name: str) -> bool:
+        """Check a file whose parent directories have already passed matches_dir.
+
+        Every pattern that can match a directory part is applied by
+        matches_dir during a pruning walk, so only the whole relative path
+        and the file's own name are left to check.
+
+        Args:
+            relative_str: Path relative to the base path
+            name: Name of the file (last component of relative_str)
+
+        Returns:
+            True if any pattern matches
+        """
+        if relative_str in self.literal_paths or name in self.literal_parts:
+            return True
+
+        wildcard_re = self.wildcard_re
+        if wildcard_re is None:
+            return False
+
+        if self.fold_case:
+            relative_str = os.path.normcase(relative_str)
+            name = os.path.normcase(name)
+        return bool(wildcard_re.match(relative_str) or wildcard_re.match(name))
+
+    def matches_dir(self, name: str) -> bool:
+        """Check whether a directory, and so everything below it, is excluded.
+
+        Only patterns that match a directory by name can exclude a whole
+        subtree: a file below the directory has that name among its parts.
+        Patterns matched against the whole relative path are left to the
+        per-file check.
+
+        Args:
+            name: Name of the directory
+
+        Returns:
+            True if the directory should not be descended into
+        """
+        if name in self.literal_parts or name in self.dir_names:
+            return True
+
+        if self.fold_case:
+            name = os.path.normcase(name)
+        for wildcard_re in (self.wildcard_re, self.dir_wildcard_re):
+            if wildcard_re is not None and wildcard_re.match(name):
+                return True
+
+        return False
+
+
+@lru_cache(maxsize=32)
+def _compile_exclude_patterns(patterns: tuple[str, ...]) -> ExcludeMatcher:
+    """Compile (and cache) an ExcludeMatcher for a tuple of patterns."""
+    return ExcludeMatcher(patterns)
+
+
+def matches_exclude_pattern(
+    path: Path, base_path: Path, patterns: Union[list[str], ExcludeMatcher]
+) -> bool:
     """Check if a path matches any exclude pattern.
 
     Args:
         path: Path to check
         base_path: Base path for relative matching
-        patterns: List of exclude patterns
+        patterns: List of exclude patterns, or an already compiled ExcludeMatcher
 
     Returns:
         True if path matches any pattern
@@ -99,93 +274,331 @@ def matches_exclude_pattern(path: Path, base_path: Path, patterns: list[str]) ->
     if not patterns:
         return False
 
+    if not isinstance(patterns, ExcludeMatcher):
+        patterns = _compile_exclude_patterns(tuple(patterns))
+
     try:
         relative_path = path.relative_to(base_path)
     except ValueError:
         # Path is not relative to base_path
         return False
 
-    relative_str = str(relative_path)
-    path_parts = relative_path.parts
+    return patterns.matches(str(relative_path), relative_path.parts)
 
-    for pattern in patterns:
-        # Check if pattern matches the full relative path
-        if relative_str == pattern:
-            return True
 
-        # Check if pattern matches any part of the path
-        if pattern in path_parts:
-            return True
+class DirectoryCache:
+    """Directory signatures carried from one scan to the next.
 
-        # Check for wildcard patterns
-        if "*" in pattern:
-            if fnmatch.fnmatch(relative_str, pattern):
-                return True
+    A directory whose mtime matches the previous scan has had no entries
+    added, removed or renamed, so its files are skipped and its cached
+    subdirectory list is used to keep descending. Edits to the contents of
+    existing files do not change the directory mtime and are missed for
+    skipped directories; the cache is therefore opt-in.
 
-            # Check each part for pattern match
-            for part in path_parts:
-                if fnmatch.fnmatch(part, pattern):
-                    return True
+    Directories are looked up and recorded from traversal threads.
+    """
 
-    return False
+    def __init__(self, previous: dict[str, tuple[float, int, list[str]]]):
+        """Initialize the cache.
+
+        Args:
+            previous: Signatures from the last scan, as returned by
+                Database.get_scan_cache
+        """
+        self.previous = previous
+        self.current: dict[str, tuple[float, int, list[str]]] = {}
+        self.skipped_dirs = 0
+        self.skipped_files = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, directory: str, mtime: float) -> Optional[list[str]]:
+        """Return the subdirectories of an unchanged directory.
+
+        Args:
+            directory: Directory about to be listed
+            mtime: Its current mtime
+
+        Returns:
+            Full paths of the cached subdirectories, or None if the directory
+            changed (or was never seen) and must be listed
+        """
+        cached = self.previous.get(directory)
+        if cached is None or cached[0] != mtime:
+            return None
+
+        self.current[directory] = cached
+        with self._lock:
+            self.skipped_dirs += 1
+            self.skipped_files += cached[1]
+        return [os.path.join(directory, name) for name in cached[2]]
+
+    def record(self, directory: str, mtime: float, file_count: int, subdirs: list[str]) -> None:
+        """Record the signature of a directory that was listed.
+
+        Args:
+            directory: Directory that was listed
+            mtime: Its mtime before listing
+            file_count: Number of regular files found in it that are not excluded
+            subdirs: Full paths of its subdirectories
+        """
+        self.current[directory] = (mtime, file_count, [os.path.basename(d) for d in subdirs])
+
+
+def _scan_one_directory(
+    directory: str,
+    recursive: bool,
+    cache: Optional[DirectoryCache] = None,
+    skip_dir: Optional[Callable[[str], bool]] = None,
+    skip_file: Optional[Callable[[str, str], bool]] = None,
+) -> tuple[list[str], list[tuple[str, os.stat_result]]]:
+    """List a single directory with os.scandir.
+
+    Directory/file checks use the entry type cached by readdir, so the only
+    syscall per file is the stat whose result is handed back to the caller.
+    Where the platform supports it the directory is opened once and listed
+    through its file descriptor, so each of those stats is an fstatat()
+    relative to the open directory rather than a full path lookup.
+    Symlinks are not followed.
 
+    Args:
+        directory: Directory to list
+        recursive: Whether subdirectories should be returned for descent
+        cache: Optional directory cache used to skip unchanged directories
+            (recursive walks only)
+        skip_dir: Optional predicate on a subdirectory name; matching
+            subdirectories are not returned for descent
+        skip_file: Optional predicate on a file's path and name; matching
+            files are neither stat'ed nor returned
 
-def collect_files(
-    directory: Path, recursive: bool, exclude_patterns: list[str]
-) -> list[Path]:
-    """Collect all files in a directory.
+    Returns:
+        Tuple of (subdirectories, list of (path, stat_result) for regular files)
+    """
+    subdirs: list[str] = []
+    files: list[tuple[str, os.stat_result]] = []
+
+    dir_fd = None
+    try:
+        if _SCANDIR_BY_FD:
+            dir_fd = os.open(directory, _DIR_OPEN_FLAGS)
+
+        dir_mtime = None
+        if cache is not None:
+            # Taken before listing so a change made mid-listing is seen next time
+            dir_stat = os.fstat(dir_fd) if dir_fd is not None else os.stat(directory)
+            dir_mtime = dir_stat.st_mtime
+            cached_subdirs = cache.lookup(directory, dir_mtime)
+            if cached_subdirs is not None:
+                if skip_dir is not None:
+                    cached_subdirs = [
+                        d for d in cached_subdirs if not skip_dir(os.path.basename(d))
+                    ]
+                return cached_subdirs, files
+
+        # Bound methods are looked up once; this loop runs for every entry
+        add_subdir = subdirs.append
+        add_file = files.append
+        prefix = os.path.join(directory, "")
+
+        with os.scandir(dir_fd if dir_fd is not None else directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not (skip_dir is not None and skip_dir(entry.name)):
+                            add_subdir(prefix + entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        path = prefix + entry.name
+                        if skip_file is None or not skip_file(path, entry.name):
+                            add_file((path, entry.stat(follow_symlinks=False)))
+                except OSError as e:
+                    logger.warning(f"Cannot stat {prefix + entry.name}: {e}")
+    except OSError as e:
+        logger.warning(f"Cannot scan directory {directory}: {e}")
+        return subdirs, files
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    if cache is not None and dir_mtime is not None:
+        cache.record(directory, dir_mtime, len(files), subdirs)
+
+    return subdirs, files
+
+
+def _walk_scandir(
+    directory: str,
+    recursive: bool,
+    cache: Optional[DirectoryCache] = None,
+    skip_dir: Optional[Callable[[str], bool]] = None,
+    skip_file: Optional[Callable[[str, str], bool]] = None,
+) -> Iterator[tuple[str, os.stat_result]]:
+    """Walk a directory on the calling thread, yielding regular files and their stats.
 
     Args:
-        directory: Directory to scan
-        recursive: Whether to scan recursively
-        exclude_patterns: Patterns to exclude
+        directory: Directory to walk
+        recursive: Whether to descend into subdirectories
+        cache: Optional directory cache used to skip unchanged directories
+        skip_dir: Optional predicate on a directory name; matching
+            directories are not descended into
+        skip_file: Optional predicate on a file's path and name; matching
+            files are skipped
+
+    Yields:
+        Tuples of (path, stat_result) for each regular file
+    """
+    stack = [directory]
+
+    while stack:
+        subdirs, files = _scan_one_directory(
+            stack.pop(), recursive, cache, skip_dir, skip_file
+        )
+        stack.extend(subdirs)
+        yield from files
+
+
+def parallel_scandir(
+    root: str,
+    recursive: bool = True,
+    num_workers: int = 8,
+    cache: Optional[DirectoryCache] = None,
+    skip_dir: Optional[Callable[[str], bool]] = None,
+    skip_file: Optional[Callable[[str, str], bool]] = None,
+) -> list[tuple[str, os.stat_result]]:
+    """Walk a directory tree with a pool of threads.
+
+    Workers take directories from a shared queue, list them, and push the
+    subdirectories they find back onto the queue, so independent subtrees
+    are read concurrently. This helps on cold caches and network or SSD
+    storage where directory reads are I/O-bound.
+
+    Args:
+        root: Directory to walk
+        recursive: Whether to descend into subdirectories
+        num_workers: Number of traversal threads
+        cache: Optional directory cache used to skip unchanged directories
+        skip_dir: Optional predicate on a directory name; matching
+            directories are not descended into
+        skip_file: Optional predicate on a file's path and name; matching
+            files are skipped
 
     Returns:
-        List of file paths
+        List of (path, stat_result) tuples for each regular file, in no
+        particular order
     """
-    files = []
+    if not recursive or num_workers <= 1:
+        return list(_walk_scandir(root, recursive, cache, skip_dir, skip_file))
+
+    pending: queue.Queue[Optional[str]] = queue.Queue()
+    pending.put(root)
+    per_worker: list[list[tuple[str, os.stat_result]]] = []
+
+    def worker() -> None:
+        found: list[tuple[str, os.stat_result]] = []
+        per_worker.append(found)
+        while True:
+            directory = pending.get()
+            if directory is None:
+                pending.task_done()
+                return
+            try:
+                subdirs, files = _scan_one_directory(
+                    directory, recursive, cache, skip_dir, skip_file
+                )
+                for subdir in subdirs:
+                    pending.put(subdir)
+                found.extend(files)
+            finally:
+                pending.task_done()
+
+    threads = [
+        threading.Thread(target=worker, name=f"scandir-{i}", daemon=True)
+        for i in range(num_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # Every directory is put before its parent is marked done, so join()
+    # only returns once the whole tree has been listed
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+
+    return [item for found in per_worker for item in found]
 
-    if recursive:
-        iterator = directory.rglob("*")
-    else:
-        iterator = directory.glob("*")
 
-    for filepath in iterator:
-        if not filepath.is_file():
-            continue
+def collect_files(
+    directory: Path,
+    recursive: bool,
+    exclude_patterns: Union[list[str], ExcludeMatcher],
+    num_workers: int = 1,
+    cache: Optional[DirectoryCache] = None,
+) -> list[tuple[str, os.stat_result]]:
+    """Collect all files in a directory.
 
-        if matches_exclude_pattern(filepath, directory, exclude_patterns):
-            logger.debug(f"Excluded: {filepath}")
-            continue
+    Directories excluded by name (a literal part, a wildcard, or a pattern
+    ending in "/") are pruned during the walk, so nothing below them is
+    listed or stat'ed. Other patterns are checked for each file.
 
-        files.append(filepath)
+    Args:
+        directory: Directory to scan
+        recursive: Whether to scan recursively
+        exclude_patterns: Patterns to exclude, or an already compiled ExcludeMatcher
+        num_workers: Number of traversal threads (1 walks on the calling thread)
+        cache: Optional directory cache; files in unchanged directories are
+            not returned
 
-    return files
+    Returns:
+        List of (resolved file path, stat_result) tuples
+    """
+    base_path = directory.resolve()
+    if not isinstance(exclude_patterns, ExcludeMatcher):
+        exclude_patterns = ExcludeMatcher(tuple(exclude_patterns))
+
+    skip_dir = exclude_patterns.matches_dir if exclude_patterns.prunes_directories else None
+
+    # Files are matched while walking, so excluded files are not stat'ed and
+    # are left out of the counts the directory cache records. Traversal
+    # paths all start with the root, so the relative path is a slice of the
+    # string; no Path objects are built per file. Directories were already
+    # checked while walking, so only the full path and the file name are
+    # matched here. Without patterns there is nothing to match.
+    skip_file = None
+    if exclude_patterns:
+        prefix_len = len(os.path.join(str(base_path), ""))
+        matches_file = exclude_patterns.matches_file
+
+        def skip_file(path: str, name: str) -> bool:
+            return matches_file(path[prefix_len:], name)
+
+    if num_workers > 1:
+        return parallel_scandir(
+            str(base_path), recursive, num_workers, cache, skip_dir, skip_file
+        )
+    return list(_walk_scandir(str(base_path), recursive, cache, skip_dir, skip_file))
 
 
 async def get_file_metadata(filepath: Path) -> Optional[FileMetadata]:
     """Get metadata for a single file.
 
+    Used for one-off lookups (e.g. watcher events); directory scans build
+    metadata from the stat results collected during traversal instead.
+
     Args:
         filepath: Path to the file
 
     Returns:
         FileMetadata or None if file cannot be read
     """
-    stats = await asyncio.to_thread(get_file_stats, filepath)
-    if stats is None:
+    try:
+        stat_info = await asyncio.to_thread(os.stat, filepath)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Cannot stat {filepath}: {e}")
         return None
 
-    return FileMetadata(
-        filepath=filepath,
-        file_size=stats["file_size"],
-        file_mode=stats["file_mode"],
-        file_uid=stats["file_uid"],
-        file_gid=stats["file_gid"],
-        file_mtime=stats["file_mtime"],
-        file_atime=stats["file_atime"],
-        file_ctime=stats["file_ctime"],
-    )
+    return file_metadata_from_stat(filepath, stat_info)
 
 
 async def scan_directory(
@@ -195,6 +608,8 @@ async def scan_directory(
     exclude_patterns: Optional[list[str]] = None,
     progress_callback: Optional[Callable[[ScanProgress], None]] = None,
     concurrency: int = 8,
+    traversal_concurrency: Optional[int] = None,
+    use_cache: Optional[bool] = None,
 ) -> ScanResult:
     """Scan a directory using the 3-component queue-based architecture.
 
@@ -210,7 +625,11 @@ async def scan_directory(
         recursive: Whether to scan recursively
         exclude_patterns: Patterns to exclude
         progress_callback: Optional callback for progress updates
-        concurrency: Number of concurrent file operations
+        concurrency: Number of metadata batches buffered ahead of the database writer
+        traversal_concurrency: Number of threads used to walk the directory tree
+            (default: settings.scanner_workers)
+        use_cache: Skip directories unchanged since the last recursive scan
+            (default: settings.scanner_cache_enabled)
 
     Returns:
         ScanResult with scan statistics
@@ -231,8 +650,46 @@ async def scan_directory(
 
     # Collect files (this is I/O bound but not async, run in thread)
     logger.info(f"Collecting files from {directory}...")
-    files = await asyncio.to_thread(collect_files, directory, recursive, exclude_patterns)
+    matcher = ExcludeMatcher(tuple(exclude_patterns))
+    scan_root = str(directory.resolve())
+    if use_cache is None:
+        use_cache = settings.scanner_cache_enabled
+    if traversal_concurrency is None:
+        traversal_concurrency = settings.scanner_workers
+    cache = None
+    if use_cache and recursive:
+        cache = DirectoryCache(await db.get_scan_cache(scan_root))
+    files = await asyncio.to_thread(
+        collect_files, directory, recursive, matcher, traversal_concurrency, cache
+    )
     total_files = len(files)
+    if cache is not None:
+        # Files in directories the scan cache skipped are unchanged
+        total_files += cache.skipped_files
+        skipped_files = scanned_files = cache.skipped_files
+
+    # Files whose mtime and ctime match the files table have not changed in
+    # content or metadata since they were recorded, so they are counted as
+    # skipped without touching the database. When the scan cache found
+    # nothing changed no files were listed, and the lookup is skipped too.
+    recorded = await db.get_file_times(scan_root) if files else None
+    if recorded:
+        changed = []
+        for entry in files:
+            filepath_str, stat_info = entry
+            if recorded.get(filepath_str) == (stat_info.st_mtime, stat_info.st_ctime):
+                skipped_files += 1
+            else:
+                changed.append(entry)
+        files = changed
+        scanned_files = skipped_files
+        del recorded
+
+    if cache is not None:
+        logger.info(
+            f"Skipped {cache.skipped_dirs} unchanged directories "
+            f"({cache.skipped_files} files)"
+        )
 
     logger.info(f"Found {total_files} files to scan")
 
@@ -244,136 +701,113 @@ async def scan_directory(
         path_id=path_id,
         path=str(directory),
         total_files=total_files,
-        scanned_files=0,
+        scanned_files=scanned_files,
         logged_files=0,
-        skipped_files=0,
+        skipped_files=skipped_files,
         error_count=0,
     )
 
+    last_progress_time = time.monotonic()
+    last_progress_count = scanned_files
     if progress_callback:
         progress_callback(progress)
 
-    # Process files with limited concurrency using semaphore
-    semaphore = asyncio.Semaphore(concurrency)
+    # Stream batches of metadata rows to a single writer, which records each
+    # batch in one transaction. The queue holds at most `concurrency` batches,
+    # so row dicts exist only for the files currently in flight.
+    batches: asyncio.Queue[Optional[list[dict]]] = asyncio.Queue(maxsize=concurrency)
+
+    async def produce() -> None:
+        for start in range(0, len(files), SCAN_BATCH_SIZE):
+            await batches.put(
+                [
+                    {
+                        "filepath": filepath_str,
+                        "file_size": stat_info.st_size,
+                        "file_mode": stat_info.st_mode,
+                        "file_uid": stat_info.st_uid,
+                        "file_gid": stat_info.st_gid,
+                        "file_mtime": stat_info.st_mtime,
+                        "file_atime": stat_info.st_atime,
+                        "file_ctime": stat_info.st_ctime,
+                    }
+                    for filepath_str, stat_info in files[start:start + SCAN_BATCH_SIZE]
+                ]
+            )
+        await batches.put(None)
+
+    async def flush(batch: list[dict]) -> None:
+        nonlocal scanned_files, logged_files, skipped_files
+        nonlocal last_progress_time, last_progress_count
+
+        try:
+            queued = await db.upsert_files_bulk(batch)
+        except Exception as e:
+            logger.error(f"Error logging batch of {len(batch)} files: {e}")
+            queued = None
+
+        new_files = 0
+        modified_files = 0
+        samples: list[str] = []
+        for row in batch:
+            filepath_str = row["filepath"]
+            scanned_filepaths.add(filepath_str)
+            scanned_files += 1
+
+            if queued is None:
+                errors.append((filepath_str, "Could not record file"))
+                progress.error_count += 1
+            elif filepath_str in queued:
+                logged_files += 1
+                progress.logged_files += 1
+                if queued[filepath_str] == "new":
+                    new_files += 1
+                else:
+                    modified_files += 1
+                if len(samples) < DISCOVERED_SAMPLE_SIZE:
+                    samples.append(os.path.basename(filepath_str))
+            else:
+                skipped_files += 1
+                progress.skipped_files += 1
+
+            if progress_callback and (
+                scanned_files - last_progress_count >= PROGRESS_EVERY_FILES
+                or time.monotonic() - last_progress_time >= PROGRESS_INTERVAL_SECONDS
+            ):
+                progress.scanned_files = scanned_files
+                progress.current_file = filepath_str
+                progress_callback(progress)
+                last_progress_time = time.monotonic()
+                last_progress_count = scanned_files
+
+        # One event per batch rather than per file keeps the activity log and
+        # its subscribers from being flooded during large scans
+        if new_files or modified_files:
+            count = new_files + modified_files
+            await activity_manager.emit(
+                EventType.FILE_DISCOVERED_BATCH,
+                path_id=path_id,
+                message=f"Discovered {count} new or modified files",
+                details={
+                    "count": count,
+                    "new": new_files,
+                    "modified": modified_files,
+                    "samples": samples,
+                },
+            )
 
-    async def process_file(filepath: Path) -> tuple[str, bool, Optional[str]]:
-        """Process a single file. Returns (filepath, was_queued, error_message)."""
-        async with semaphore:
-            try:
-                filepath_str = str(filepath.resolve())
-                scanned_filepaths.add(filepath_str)
-
-                metadata = await get_file_metadata(filepath)
-                if metadata is None:
-                    return filepath_str, False, "Could not read file stats"
-
-                # Check if file exists in files table
-                existing_file = await db.get_file(filepath_str)
-
-                if existing_file is None:
-                    # NEW FILE: Add to files table and queue for checksum
-                    await db.upsert_file(
-                        filepath=filepath_str,
-                        file_size=metadata.file_size,
-                        file_mtime=metadata.file_mtime,
-                        file_mode=metadata.file_mode,
-                        file_uid=metadata.file_uid,
-                        file_gid=metadata.file_gid,
-                        file_atime=metadata.file_atime,
-                        file_ctime=metadata.file_ctime,
-                        status="discovered",
-                    )
-
-                    # Queue for checksum calculation
-                    await db.enqueue_for_checksum(filepath_str, reason="new")
-
-                    logger.debug(f"New file discovered: {filepath_str}")
-
-                    # Emit activity event
-                    await activity_manager.emit(
-                        EventType.FILE_DISCOVERED,
-                        filepath=filepath_str,
-                        path_id=path_id,
-                        message=f"New file discovered: {filepath.name}",
-                        details={"size": metadata.file_size, "mtime": metadata.file_mtime},
-                    )
-
-                    return filepath_str, True, None
-
-                elif metadata.file_mtime > existing_file["file_mtime"]:
-                    # MODIFIED FILE: Update files table and queue for re-checksum
-                    await db.upsert_file(
-                        filepath=filepath_str,
-                        file_size=metadata.file_size,
-                        file_mtime=metadata.file_mtime,
-                        file_mode=metadata.file_mode,
-                        file_uid=metadata.file_uid,
-                        file_gid=metadata.file_gid,
-                        file_atime=metadata.file_atime,
-                        file_ctime=metadata.file_ctime,
-                        status="discovered",
-                    )
-
-                    # Queue for re-checksum
-                    await db.enqueue_for_checksum(filepath_str, reason="modified")
-
-                    logger.debug(f"Modified file detected: {filepath_str}")
-
-                    # Emit activity event
-                    await activity_manager.emit(
-                        EventType.FILE_DISCOVERED,
-                        filepath=filepath_str,
-                        path_id=path_id,
-                        message=f"File modified: {filepath.name}",
-                        details={"size": metadata.file_size, "mtime": metadata.file_mtime},
-                    )
-
-                    return filepath_str, True, None
+    async def consume() -> None:
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                break
+            await flush(batch)
 
-                else:
-                    # UNCHANGED FILE: Just update last_checked_at
-                    await db.upsert_file(
-                        filepath=filepath_str,
-                        file_size=metadata.file_size,
-                        file_mtime=metadata.file_mtime,
-                        file_mode=metadata.file_mode,
-                        file_uid=metadata.file_uid,
-                        file_gid=metadata.file_gid,
-                        file_atime=metadata.file_atime,
-                        file_ctime=metadata.file_ctime,
-                        sha256=existing_file.get("sha256"),
-                        status=existing_file.get("status", "unchanged"),
-                    )
-
-                    logger.debug(f"Unchanged file: {filepath_str}")
-                    return filepath_str, False, None
-
-            except Exception as e:
-                logger.error(f"Error processing {filepath}: {e}")
-                return str(filepath), False, str(e)
-
-    # Process all files concurrently
-    tasks = [process_file(f) for f in files]
-
-    for coro in asyncio.as_completed(tasks):
-        filepath, was_queued, error = await coro
-        scanned_files += 1
-
-        if error:
-            errors.append((filepath, error))
-            progress.error_count += 1
-        elif was_queued:
-            logged_files += 1
-            progress.logged_files += 1
-        else:
-            skipped_files += 1
-            progress.skipped_files += 1
-
-        progress.scanned_files = scanned_files
-        progress.current_file = filepath
-
-        if progress_callback:
-            progress_callback(progress)
+    await asyncio.gather(produce(), consume())
+
+    progress.scanned_files = scanned_files
+    if progress_callback and last_progress_count != scanned_files:
+        progress_callback(progress)
 
     # DELETION DETECTION: Find files in DB that weren't scanned (deleted from disk)
     # Only check files under this registered path
@@ -384,8 +818,13 @@ async def scan_directory(
     # For now, we'll skip deletion detection to keep the refactoring focused
     # TODO: Implement deletion detection in a separate task
 
-    # Update path last_scanned_at
-    await db.update_path_scanned(path_id)
+    # Update path last_scanned_at, saving directory signatures in the same
+    # transaction. A scan with write errors saves none, so those files are
+    # not skipped next time.
+    if cache is not None and not errors:
+        await db.update_path_scanned(path_id, scan_root, cache.current)
+    else:
+        await db.update_path_scanned(path_id)
 
     # Log scan complete
     await activity_manager.emit(
@@ -396,6 +835,7 @@ async def scan_directory(
             "total_files": total_files,
             "logged_files": logged_files,
             "skipped_files": skipped_files,
+            "cached_dirs": cache.skipped_dirs if cache is not None else 0,
             "errors": len(errors),
         },
     )
@@ -419,7 +859,7 @@ async def scan_all_paths(
 
     Args:
         progress_callback: Optional callback for progress updates
-        concurrency: Number of concurrent file operations per path
+        concurrency: Number of metadata batches buffered per path
 
     Returns:
         List of ScanResult for each path
@@ -436,7 +876,9 @@ async def scan_all_paths(
     for path_response in paths:
         path = Path(path_response.path)
 
-        if not path.exists():
+        try:
+            path_stat = await asyncio.to_thread(os.stat, path)
+        except OSError:
             logger.warning(f"Path does not exist: {path}")
             await activity_manager.emit(
                 EventType.ERROR,
@@ -445,7 +887,7 @@ async def scan_all_paths(
             )
             continue
 
-        if not path.is_dir():
+        if not stat.S_ISDIR(path_stat.st_mode):
             logger.warning(f"Path is not a directory: {path}")
             await activity_manager.emit(
                 EventType.ERROR,
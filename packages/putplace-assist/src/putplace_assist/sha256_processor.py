@@ -6,7 +6,7 @@ This module provides a background task that:
 1. Processes files from queue_pending_checksum (FIFO)
 2. Calculates SHA256 checksums for each file
 3. Updates files table with SHA256 and marks status='ready_for_upload'
-4. Enqueues files to queue_pending_upload
+4. Enqueues files to queue_pending_upload (one transaction per batch)
 5. Implements retry logic with exponential backoff (3 retries)
 6. Removes files from database after all retries exhausted
 """
@@ -14,6 +14,9 @@ This module provides a background task that:
 import asyncio
 import hashlib
 import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -24,6 +27,150 @@ from .models import EventType
 
 logger = logging.getLogger(__name__)
 
+# How long an idle processor waits for newly queued files before polling
+# again anyway (retried entries become due without a notification)
+IDLE_POLL_SECONDS = 30.0
+
+# Number of example filenames carried by each SHA256_BATCH_COMPLETE event
+COMPLETED_SAMPLE_SIZE = 10
+
+# Files at least this large are read with a larger buffer to cut syscalls
+LARGE_FILE_THRESHOLD = 4 * 1024 * 1024
+LARGE_FILE_CHUNK_SIZE = 1024 * 1024
+
+# Hashing only reads files, so don't make every hash dirty the inode with an
+# atime update where the platform lets us opt out (Linux)
+_HASH_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _open_for_hashing(file_path: Path) -> int:
+    """Open a file for reading without updating its access time if possible.
+
+    O_NOATIME is only permitted for the file's owner (or root), so it is
+    dropped for files owned by someone else.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Open file descriptor
+    """
+    if _O_NOATIME:
+        try:
+            return os.open(file_path, _HASH_OPEN_FLAGS | _O_NOATIME)
+        except PermissionError:
+            pass
+    return os.open(file_path, _HASH_OPEN_FLAGS)
+
+
+def sha256_backend() -> Optional[str]:
+    """Get the OpenSSL version backing hashlib.sha256, if any.
+
+    When Python is linked against OpenSSL, hashlib.sha256 is OpenSSL's
+    implementation, which picks the CPU's SHA instructions (x86 SHA-NI,
+    ARMv8 SHA2) at runtime. Otherwise hashlib falls back to a portable
+    built-in implementation that is several times slower.
+
+    Returns:
+        OpenSSL version string, or None if the built-in fallback is in use
+    """
+    if type(hashlib.sha256()).__module__ != "_hashlib":
+        return None
+
+    try:
+        import ssl
+    except ImportError:
+        return "OpenSSL"
+    return ssl.OPENSSL_VERSION
+
+
+def prefetch_files(filepaths: list[str], length: int) -> None:
+    """Ask the kernel to start reading the head of each file in the background.
+
+    Issuing readahead for a whole batch up front lets the device service
+    the reads concurrently instead of one file at a time as each is hashed.
+    Blocking (one open per file); run it in an executor. Files that cannot
+    be opened are skipped; hashing reports the error.
+
+    Args:
+        filepaths: Files about to be hashed
+        length: Number of bytes to prefetch from the start of each file
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    for filepath in filepaths:
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, length, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _lower_priority(increment: int) -> None:
+    """Raise the niceness of the calling hashing worker thread.
+
+    Only done on Linux, where niceness is per thread, so this only affects
+    the worker, not the event loop. The kernel also derives the default I/O
+    priority from it, so the worker's disk reads yield to interactive work
+    too. Elsewhere os.nice() applies to the whole process, so it is skipped.
+
+    Args:
+        increment: Niceness increment (0 leaves priority unchanged)
+    """
+    if increment <= 0:
+        return
+    if not sys.platform.startswith("linux"):
+        logger.info(
+            f"Not lowering SHA256 worker priority on {sys.platform} (niceness is per process)"
+        )
+        return
+    try:
+        os.nice(increment)
+    except OSError as e:
+        logger.warning(f"Could not lower SHA256 worker priority: {e}")
+
+
+def hash_file(file_path: Path, chunk_size: int) -> str:
+    """Calculate the SHA256 hash of a file, streaming it through a fixed buffer.
+
+    Blocking; run it in an executor. Memory use is bounded by the buffer
+    size regardless of file size; files of LARGE_FILE_THRESHOLD or more use
+    a buffer of at least LARGE_FILE_CHUNK_SIZE. The file is not mmap'd
+    because a concurrent truncate would kill the process with SIGBUS.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Read buffer size in bytes
+
+    Returns:
+        Hexadecimal SHA256 hash string
+    """
+    sha256_hash = hashlib.sha256()
+
+    with open(_open_for_hashing(file_path), "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size >= LARGE_FILE_THRESHOLD:
+            chunk_size = max(chunk_size, LARGE_FILE_CHUNK_SIZE)
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
+
+    return sha256_hash.hexdigest()
+
 
 class Sha256Processor:
     """Background processor for calculating SHA256 checksums."""
@@ -32,6 +179,8 @@ class Sha256Processor:
         """Initialize the processor."""
         self._running = False
         self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self._current_file: Optional[str] = None
         self._processed_today = 0
         self._failed_today = 0
@@ -43,7 +192,7 @@ class Sha256Processor:
 
     @property
     def current_file(self) -> Optional[str]:
-        """Get the file currently being processed."""
+        """Get the file most recently started by the processor."""
         return self._current_file
 
     @property
@@ -62,9 +211,26 @@ class Sha256Processor:
             logger.warning("SHA256 processor already running")
             return
 
+        backend = sha256_backend()
+        if backend is None:
+            logger.warning(
+                "hashlib is not using OpenSSL; SHA256 runs without hardware acceleration"
+            )
+
+        # hashlib releases the GIL while hashing, so threads hash in parallel
+        workers = settings.sha256_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="sha256",
+            initializer=_lower_priority,
+            initargs=(settings.sha256_nice,),
+        )
+        self._loop = asyncio.get_running_loop()
         self._running = True
         self._task = asyncio.create_task(self._process_loop())
-        logger.info("SHA256 processor started")
+        logger.info(
+            f"SHA256 processor started (backend: {backend or 'built-in'}, workers: {workers})"
+        )
 
     async def stop(self) -> None:
         """Stop the background processor."""
@@ -78,32 +244,90 @@ class Sha256Processor:
                 pass
             self._task = None
 
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
         logger.info("SHA256 processor stopped")
 
     async def _process_loop(self) -> None:
         """Main processing loop - processes queue_pending_checksum (FIFO)."""
+        batch_size = settings.sha256_batch_size
+        chunk_size = settings.sha256_chunk_size
+        batch_delay = settings.sha256_batch_delay_seconds
+
         while self._running:
             try:
+                # Cleared before dequeuing so files queued from here on wake us
+                db.checksum_queued.clear()
+
                 # Dequeue batch from queue_pending_checksum (FIFO)
-                queue_entries = await db.dequeue_for_checksum(
-                    limit=settings.sha256_batch_size
-                )
+                queue_entries = await db.dequeue_for_checksum(limit=batch_size)
 
                 if queue_entries:
                     logger.debug(f"Processing batch of {len(queue_entries)} files from checksum queue")
 
-                    for queue_entry in queue_entries:
-                        if not self._running:
-                            break
-
-                        await self._process_queue_entry(queue_entry)
+                    # On the hashing executor, so readahead runs at the
+                    # workers' lowered priority
+                    await self._loop.run_in_executor(
+                        self._executor,
+                        prefetch_files,
+                        [entry["filepath"] for entry in queue_entries],
+                        chunk_size,
+                    )
+
+                    # Hash the batch concurrently; the executor bounds parallelism
+                    results = await asyncio.gather(
+                        *(self._process_queue_entry(entry) for entry in queue_entries)
+                    )
+                    completed = [
+                        (entry, *result)
+                        for entry, result in zip(queue_entries, results, strict=True)
+                        if result is not None
+                    ]
+                    # Counters are only touched here, on the event loop, once
+                    # per batch; every entry that returned None has failed
+                    self._processed_today += len(completed)
+                    self._failed_today += len(results) - len(completed)
+
+                    # Write the whole batch in one transaction
+                    await db.complete_checksums(
+                        [
+                            (entry["filepath"], sha256, changed)
+                            for entry, sha256, changed in completed
+                        ]
+                    )
+
+                    # One event per batch rather than per file; failures are
+                    # still reported individually
+                    changed_files = [
+                        entry["filepath"] for entry, _, changed in completed if changed
+                    ]
+                    if changed_files:
+                        await activity_manager.emit(
+                            EventType.SHA256_BATCH_COMPLETE,
+                            message=f"SHA256 calculated for {len(changed_files)} files",
+                            details={
+                                "count": len(changed_files),
+                                "unchanged": len(completed) - len(changed_files),
+                                "samples": [
+                                    os.path.basename(filepath)
+                                    for filepath in changed_files[:COMPLETED_SAMPLE_SIZE]
+                                ],
+                            },
+                        )
+
+                    # Delay between batches
+                    await asyncio.sleep(batch_delay)
 
                 else:
-                    # No entries to process, wait before checking again
-                    await asyncio.sleep(settings.sha256_batch_delay_seconds * 5)
-
-                # Delay between batches
-                await asyncio.sleep(settings.sha256_batch_delay_seconds)
+                    # No entries to process, wait until more files are queued
+                    try:
+                        await asyncio.wait_for(
+                            db.checksum_queued.wait(), timeout=IDLE_POLL_SECONDS
+                        )
+                    except asyncio.TimeoutError:
+                        pass
 
             except asyncio.CancelledError:
                 break
@@ -111,190 +335,131 @@ class Sha256Processor:
                 logger.error(f"Error in SHA256 processor loop: {e}")
                 await asyncio.sleep(5)  # Wait before retrying
 
-    async def _process_queue_entry(self, queue_entry: dict) -> bool:
+    async def _process_queue_entry(self, queue_entry: dict) -> Optional[tuple[str, bool]]:
         """Process a single entry from queue_pending_checksum.
 
         Implements the Component 2 algorithm:
-        1. Check if file exists
-        2. Calculate SHA256 hash
-        3. Check if checksum changed
-        4. Update files table with SHA256 and status='ready_for_upload'
-        5. Enqueue to queue_pending_upload
-        6. Remove from queue_pending_checksum
-        7. Implement retry logic with exponential backoff
+        1. Calculate SHA256 hash (a missing file is dropped)
+        2. Check if checksum changed
+        3. Implement retry logic with exponential backoff
+
+        Successful results are returned rather than written so the caller
+        can record the whole batch in one transaction (updating the files
+        table, enqueueing to queue_pending_upload and removing from
+        queue_pending_checksum).
 
         Args:
             queue_entry: Entry from queue_pending_checksum table
                         {id, filepath, reason, queued_at, retry_count}
 
         Returns:
-            True if successful, False otherwise
+            (sha256, changed) if successful, None otherwise
         """
         filepath = queue_entry["filepath"]
-        queue_id = queue_entry["id"]
+        file_path = Path(filepath)
+        file_name = file_path.name
         retry_count = queue_entry.get("retry_count", 0)
 
         self._current_file = filepath
 
         try:
-            # Check if file still exists
-            file_path = Path(filepath)
-            if not file_path.exists():
-                # File deleted between scan and checksum - remove from queue and files table
-                logger.warning(f"File no longer exists, removing: {filepath}")
-                await db.remove_from_checksum_queue(queue_id)
-                await db.delete_file(filepath)
-                self._failed_today += 1
-                return False
-
             # Get file metadata from files table
             file_record = await db.get_file(filepath)
             if not file_record:
                 # File not in files table (shouldn't happen, but handle gracefully)
                 logger.error(f"File not found in files table: {filepath}")
-                await db.remove_from_checksum_queue(queue_id)
-                self._failed_today += 1
-                return False
+                await db.remove_from_checksum_queue(filepath)
+                return None
 
             # Calculate SHA256 hash
             sha256_hash = await self._calculate_sha256(file_path)
 
             # Check if checksum changed
-            existing_sha256 = file_record.get("sha256")
+            changed = file_record.get("sha256") != sha256_hash
 
-            if existing_sha256 == sha256_hash:
-                # Checksum unchanged, no upload needed
+            if changed:
+                logger.debug(f"Processed: {filepath} -> {sha256_hash[:16]}... (queued for upload)")
+            else:
                 logger.debug(f"File unchanged (same SHA256): {filepath}")
-                await db.upsert_file(
-                    filepath=filepath,
-                    file_size=file_record["file_size"],
-                    file_mtime=file_record["file_mtime"],
-                    file_mode=file_record.get("file_mode"),
-                    file_uid=file_record.get("file_uid"),
-                    file_gid=file_record.get("file_gid"),
-                    file_atime=file_record.get("file_atime"),
-                    file_ctime=file_record.get("file_ctime"),
-                    sha256=sha256_hash,
-                    status="unchanged",  # Mark as unchanged since SHA256 matches
-                )
-                await db.remove_from_checksum_queue(queue_id)
-                self._processed_today += 1
-                return True
-
-            # New or changed checksum - update files table and queue for upload
-            await db.update_file_sha256(filepath, sha256_hash, status="ready_for_upload")
-
-            # Enqueue to queue_pending_upload
-            await db.enqueue_for_upload(filepath, sha256_hash)
-
-            # Remove from queue_pending_checksum
-            await db.remove_from_checksum_queue(queue_id)
-
-            self._processed_today += 1
-
-            # Log activity
-            await activity_manager.emit(
-                EventType.SHA256_COMPLETE,
-                filepath=filepath,
-                message=f"SHA256 calculated: {file_path.name}",
-                details={
-                    "sha256": sha256_hash[:16] + "...",
-                    "reason": queue_entry.get("reason", "unknown"),
-                },
-            )
-
-            logger.debug(f"Processed: {filepath} -> {sha256_hash[:16]}... (queued for upload)")
-            return True
+            return sha256_hash, changed
 
         except FileNotFoundError:
-            # File not found - remove from queue and files table
-            logger.warning(f"File not found during SHA256 calculation: {filepath}")
-            await db.remove_from_checksum_queue(queue_id)
+            # File deleted between scan and checksum - remove from queue and files table
+            logger.warning(f"File no longer exists, removing: {filepath}")
+            await db.remove_from_checksum_queue(filepath)
             await db.delete_file(filepath)
-            self._failed_today += 1
-            return False
+            return None
 
         except PermissionError:
             # Permission denied - retry with exponential backoff
             logger.warning(f"Permission denied reading file: {filepath} (retry {retry_count}/3)")
-            self._failed_today += 1
-
-            await activity_manager.emit(
-                EventType.SHA256_FAILED,
-                filepath=filepath,
-                message=f"Permission denied: {Path(filepath).name} (retry {retry_count}/3)",
+            await self._handle_failure(
+                filepath,
+                retry_count,
+                f"Permission denied: {file_name} (retry {retry_count}/3)",
             )
-
-            if retry_count < 3:
-                # Retry with exponential backoff
-                delay = 5.0 * (2.0 ** retry_count)  # 5s, 10s, 20s
-                await db.retry_checksum_queue_entry(queue_id, delay_seconds=delay)
-                logger.debug(f"Retrying {filepath} in {delay}s")
-            else:
-                # Max retries exhausted - remove from queue and files table
-                logger.error(f"Max retries exhausted for {filepath}, removing from database")
-                await db.remove_from_checksum_queue(queue_id)
-                await db.delete_file(filepath)
-
-            return False
+            return None
 
         except (IOError, OSError) as e:
             # I/O error - retry with exponential backoff
             logger.error(f"I/O error processing {filepath}: {e} (retry {retry_count}/3)")
-            self._failed_today += 1
-
-            await activity_manager.emit(
-                EventType.SHA256_FAILED,
-                filepath=filepath,
-                message=f"I/O error: {Path(filepath).name} (retry {retry_count}/3)",
-                details={"error": str(e)},
+            await self._handle_failure(
+                filepath,
+                retry_count,
+                f"I/O error: {file_name} (retry {retry_count}/3)",
+                {"error": str(e)},
             )
-
-            if retry_count < 3:
-                # Retry with exponential backoff
-                delay = 5.0 * (2.0 ** retry_count)  # 5s, 10s, 20s
-                await db.retry_checksum_queue_entry(queue_id, delay_seconds=delay)
-                logger.debug(f"Retrying {filepath} in {delay}s")
-            else:
-                # Max retries exhausted - remove from queue and files table
-                logger.error(f"Max retries exhausted for {filepath}, removing from database")
-                await db.remove_from_checksum_queue(queue_id)
-                await db.delete_file(filepath)
-
-            return False
+            return None
 
         except Exception as e:
             # Unexpected error - retry with exponential backoff
             logger.error(f"Unexpected error processing {filepath}: {e} (retry {retry_count}/3)")
-            self._failed_today += 1
-
-            await activity_manager.emit(
-                EventType.SHA256_FAILED,
-                filepath=filepath,
-                message=f"SHA256 failed: {Path(filepath).name} (retry {retry_count}/3)",
-                details={"error": str(e)},
+            await self._handle_failure(
+                filepath,
+                retry_count,
+                f"SHA256 failed: {file_name} (retry {retry_count}/3)",
+                {"error": str(e)},
             )
-
-            if retry_count < 3:
-                # Retry with exponential backoff
-                delay = 5.0 * (2.0 ** retry_count)  # 5s, 10s, 20s
-                await db.retry_checksum_queue_entry(queue_id, delay_seconds=delay)
-                logger.debug(f"Retrying {filepath} in {delay}s")
-            else:
-                # Max retries exhausted - remove from queue and files table
-                logger.error(f"Max retries exhausted for {filepath}, removing from database")
-                await db.remove_from_checksum_queue(queue_id)
-                await db.delete_file(filepath)
-
-            return False
+            return None
 
         finally:
             self._current_file = None
 
-    async def _calculate_sha256(self, file_path: Path) -> str:
-        """Calculate SHA256 hash with rate limiting.
+    async def _handle_failure(
+        self,
+        filepath: str,
+        retry_count: int,
+        message: str,
+        details: Optional[dict] = None,
+    ) -> None:
+        """Report a failed checksum and schedule a retry or give up.
 
-        Reads file in chunks with delays to avoid CPU saturation.
+        Args:
+            filepath: Path to the file
+            retry_count: Retries already attempted for this entry
+            message: Activity message for the failure
+            details: Optional activity details
+        """
+        await activity_manager.emit(
+            EventType.SHA256_FAILED,
+            filepath=filepath,
+            message=message,
+            details=details,
+        )
+
+        if retry_count < 3:
+            # Retry with exponential backoff
+            delay = int(5 * (2 ** retry_count))  # 5s, 10s, 20s
+            await db.retry_queue_item("queue_pending_checksum", filepath, delay_seconds=delay)
+            logger.debug(f"Retrying {filepath} in {delay}s")
+        else:
+            # Max retries exhausted - remove from queue and files table
+            logger.error(f"Max retries exhausted for {filepath}, removing from database")
+            await db.remove_from_checksum_queue(filepath)
+            await db.delete_file(filepath)
+
+    async def _calculate_sha256(self, file_path: Path) -> str:
+        """Calculate SHA256 hash in the low-priority hashing workers.
 
         Args:
             file_path: Path to the file
@@ -302,31 +467,9 @@ class Sha256Processor:
         Returns:
             Hexadecimal SHA256 hash string
         """
-        sha256_hash = hashlib.sha256()
-        chunk_size = settings.sha256_chunk_size
-        chunk_delay_ms = settings.sha256_chunk_delay_ms
-
-        # Run file reading in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-
-        def read_file_chunks():
-            """Generator that reads file in chunks."""
-            with open(file_path, "rb") as f:
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    yield chunk
-
-        # Process chunks with rate limiting
-        for chunk in await loop.run_in_executor(None, lambda: list(read_file_chunks())):
-            sha256_hash.update(chunk)
-
-            # Rate limit between chunks
-            if chunk_delay_ms > 0:
-                await asyncio.sleep(chunk_delay_ms / 1000.0)
-
-        return sha256_hash.hexdigest()
+        return await self._loop.run_in_executor(
+            self._executor, hash_file, file_path, settings.sha256_chunk_size
+        )
 
     async def get_pending_count(self) -> int:
         """Get the count of entries waiting to be processed in queue_pending_checksum.
@@ -334,8 +477,7 @@ class Sha256Processor:
         Returns:
             Number of entries in checksum queue
         """
-        counts = await db.get_queue_counts()
-        return counts.get("queue_pending_checksum", 0)
+        return await db.count_pending_checksums()
 
     def reset_daily_counters(self) -> None:
         """Reset the daily counters (called at midnight)."""
@@ -10,13 +10,14 @@ This module provides background tasks that:
 """
 
 import asyncio
-import hashlib
 import logging
 import os
 import socket
+import time
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional, TypeVar
 
 import httpx
 from cryptography.fernet import Fernet
@@ -24,13 +25,20 @@ from cryptography.fernet import Fernet
 from .config import settings
 from .database import db
 from .models import EventType, UploadStatus, UploadType
+from .sha256_processor import hash_file
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Encryption key for storing passwords (should be persisted securely)
 # In production, this would come from a secure key store
 _ENCRYPTION_KEY: Optional[bytes] = None
 
+# Most files whose metadata a worker registers with one /put_files request.
+# A worker batches whatever is already queued, up to this many files.
+METADATA_BATCH_SIZE = 100
+
 
 def get_encryption_key() -> bytes:
     """Get or generate encryption key for password storage."""
@@ -61,19 +69,40 @@ def decrypt_password(encrypted: str) -> str:
     return f.decrypt(encrypted.encode()).decode()
 
 
+# Seconds a looked-up IP address is reused before it is checked again
+IP_ADDRESS_TTL_SECONDS = 300.0
+
+_ip_address_cache: Optional[tuple[float, str]] = None  # (looked up at, address)
+
+
+@lru_cache(maxsize=1)
 def get_hostname() -> str:
-    """Get the current hostname."""
+    """Get the current hostname (looked up once per process)."""
     return socket.gethostname()
 
 
 def get_ip_address() -> str:
-    """Get the primary IP address of this machine."""
+    """Get the primary IP address of this machine.
+
+    Looking the address up opens a UDP socket and it is needed for every
+    upload, so it is cached for IP_ADDRESS_TTL_SECONDS. The cache expires
+    because a long-running daemon can move between networks.
+    """
+    global _ip_address_cache
+
+    now = time.monotonic()
+    if _ip_address_cache and now - _ip_address_cache[0] < IP_ADDRESS_TTL_SECONDS:
+        return _ip_address_cache[1]
+
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
             s.connect(("8.8.8.8", 80))
-            return s.getsockname()[0]
+            address = s.getsockname()[0]
     except Exception:
-        return "127.0.0.1"
+        address = "127.0.0.1"
+
+    _ip_address_cache = (now, address)
+    return address
 
 
 @dataclass
@@ -126,6 +155,7 @@ class Uploader:
         self._queue: asyncio.Queue[UploadQueueItem] = asyncio.Queue()
         self._running = False
         self._workers: list[asyncio.Task] = []
+        self._client: Optional[httpx.AsyncClient] = None
         self._access_tokens: dict[str, str] = {}  # server_url -> token
         self._progress: dict[int, UploadProgress] = {}
         self._completed_count = 0
@@ -163,22 +193,50 @@ class Uploader:
         await asyncio.gather(*self._workers, return_exceptions=True)
         self._workers.clear()
 
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
         self._access_tokens.clear()
         logger.info("Uploader stopped")
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client shared by all requests, creating it on first use.
+
+        Reusing one client keeps connections to the server alive between
+        requests instead of reconnecting (and redoing TLS) for every file.
+
+        Returns:
+            Shared async HTTP client
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=float(self.timeout_seconds),
+                limits=httpx.Limits(max_keepalive_connections=self.parallel_uploads + 1),
+            )
+        return self._client
+
     async def _worker(self, worker_id: int) -> None:
         """Worker task that processes upload queue items."""
         logger.debug(f"Worker {worker_id} started")
 
         while self._running:
             try:
-                # Get item from queue with timeout
+                # Get item from queue with timeout, then whatever else is
+                # already queued so its metadata is registered in one request
                 item = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+                batch = [item]
+                while len(batch) < METADATA_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
 
                 try:
-                    await self._process_upload(item)
+                    await self._process_batch(batch)
                 finally:
-                    self._queue.task_done()
+                    for _ in batch:
+                        self._queue.task_done()
 
             except asyncio.TimeoutError:
                 continue
@@ -377,27 +435,14 @@ class Uploader:
         Returns:
             Hexadecimal SHA256 hash string
         """
-        sha256_hash = hashlib.sha256()
-
-        # Run file reading in thread pool to avoid blocking
         loop = asyncio.get_event_loop()
-
-        def read_and_hash():
-            """Read file and calculate hash."""
-            try:
-                with open(file_path, "rb") as f:
-                    # Read in chunks to handle large files
-                    while True:
-                        chunk = f.read(65536)  # 64KB chunks
-                        if not chunk:
-                            break
-                        sha256_hash.update(chunk)
-                return sha256_hash.hexdigest()
-            except Exception as e:
-                logger.error(f"Error calculating SHA256 for {file_path}: {e}")
-                raise
-
-        return await loop.run_in_executor(None, read_and_hash)
+        try:
+            return await loop.run_in_executor(
+                None, hash_file, file_path, settings.sha256_chunk_size
+            )
+        except Exception as e:
+            logger.error(f"Error calculating SHA256 for {file_path}: {e}")
+            raise
 
     async def _get_access_token(
         self,
@@ -424,51 +469,54 @@ class Uploader:
         login_url = f"{server_url.rstrip('/')}/api/login"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    login_url,
-                    json={"email": username, "password": password},
+            client = self._get_client()
+            response = await client.post(
+                login_url,
+                json={"email": username, "password": password},
+                timeout=30.0,
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                token = data.get("access_token")
+                if token:
+                    self._access_tokens[server_url] = token
+                    return token
+            elif response.status_code == 401:
+                # Unauthorized - credentials are invalid (user deleted or password changed)
+                logger.warning(
+                    f"Authentication failed with 401 Unauthorized for {username}@{server_url}. "
+                    "This usually means the user has been deleted or credentials are invalid."
                 )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    token = data.get("access_token")
-                    if token:
-                        self._access_tokens[server_url] = token
-                        return token
-                elif response.status_code == 401:
-                    # Unauthorized - credentials are invalid (user deleted or password changed)
-                    logger.warning(
-                        f"Authentication failed with 401 Unauthorized for {username}@{server_url}. "
-                        "This usually means the user has been deleted or credentials are invalid."
+                # Remove invalid credentials from database
+                if server_id:
+                    logger.info(
+                        f"Removing invalid server credentials (ID: {server_id}) from database"
                     )
+                    try:
+                        await db.delete_server(server_id)
+                        logger.info(f"Successfully removed server credentials for {server_url}")
+
+                        # Log activity for visibility
+                        await db.log_activity(
+                            EventType.UPLOAD_FAILED,
+                            filepath="N/A",
+                            message=f"Server credentials auto-removed: {username}@{server_url}",
+                            details={
+                                "reason": "401 Unauthorized - user deleted or credentials invalid",
+                                "server_id": server_id,
+                                "server_url": server_url,
+                                "username": username,
+                            },
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to remove server credentials: {e}")
 
-                    # Remove invalid credentials from database
-                    if server_id:
-                        logger.info(f"Removing invalid server credentials (ID: {server_id}) from database")
-                        try:
-                            await db.delete_server(server_id)
-                            logger.info(f"Successfully removed server credentials for {server_url}")
-
-                            # Log activity for visibility
-                            await db.log_activity(
-                                EventType.UPLOAD_FAILED,
-                                filepath="N/A",
-                                message=f"Server credentials auto-removed: {username}@{server_url}",
-                                details={
-                                    "reason": "401 Unauthorized - user deleted or credentials invalid",
-                                    "server_id": server_id,
-                                    "server_url": server_url,
-                                    "username": username,
-                                },
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to remove server credentials: {e}")
-
-                    return None
-                else:
-                    logger.error(f"Login failed: {response.status_code} - {response.text}")
-                    return None
+                return None
+            else:
+                logger.error(f"Login failed: {response.status_code} - {response.text}")
+                return None
 
         except httpx.ConnectError:
             logger.error(f"Could not connect to server: {server_url}")
@@ -477,11 +525,117 @@ class Uploader:
             logger.error(f"Login error: {e}")
             return None
 
-    async def _process_upload(self, item: UploadQueueItem) -> bool:
-        """Process a single upload.
+    async def _process_batch(self, items: list[UploadQueueItem]) -> None:
+        """Upload a batch of queued files.
+
+        The metadata of every file in the batch is registered with a single
+        /put_files request; content is then uploaded file by file where the
+        server asks for it.
+
+        Args:
+            items: Queued files, at most METADATA_BATCH_SIZE
+        """
+        hostname = get_hostname()
+        ip_address = get_ip_address()
+
+        ready = []
+        for item in items:
+            if not await self._start_upload(item):
+                continue
+            try:
+                metadata = self._file_metadata(item, hostname, ip_address)
+            except OSError as e:
+                await self._handle_upload_failure(item, str(e))
+                continue
+            ready.append((item, metadata))
+
+        if not ready:
+            return
+
+        # Get server configuration
+        server_result = await db.get_default_server()
+        if not server_result:
+            for item, _ in ready:
+                await self._handle_upload_failure(item, "No server configured")
+            return
+
+        server, encrypted_password = server_result
+        password = decrypt_password(encrypted_password)
+
+        # Get access token (pass server_id for automatic credential invalidation on 401)
+        token = await self._get_access_token(server.url, server.username, password, server.id)
+        if not token:
+            for item, _ in ready:
+                await self._handle_upload_failure(item, "Authentication failed")
+            return
+
+        # Prepare headers
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Register metadata with retry
+        all_metadata = [metadata for _, metadata in ready]
+        try:
+            responses = await self._with_retry(
+                partial(self._put_metadata, server.url, all_metadata, headers)
+            )
+        except Exception as e:
+            for item, _ in ready:
+                await self._handle_upload_failure(item, str(e))
+            return
+
+        for (item, metadata), data in zip(ready, responses, strict=True):
+            # Check if content upload is required
+            upload_url = data.get("upload_url")
+            if item.upload_content and data.get("upload_required", False) and upload_url:
+                # Skip content upload for 0-byte files (no content to upload)
+                if metadata["file_size"] == 0:
+                    logger.info(f"Skipping content upload for 0-byte file: {item.filepath}")
+                else:
+                    try:
+                        await self._with_retry(
+                            partial(
+                                self._upload_content,
+                                item=item,
+                                filepath=Path(item.filepath),
+                                server_url=server.url,
+                                upload_url=upload_url,
+                                hostname=hostname,
+                                headers=headers,
+                            )
+                        )
+                    except Exception as e:
+                        await self._handle_upload_failure(item, str(e))
+                        continue
+
+            await self._handle_upload_success(item, server.name)
+
+    async def _with_retry(self, attempt_fn: Callable[[], Awaitable[T]]) -> T:
+        """Run an upload step, retrying it after failures.
+
+        Args:
+            attempt_fn: Callable starting one attempt of the step
 
         Returns:
-            True if upload was successful
+            Result of the first successful attempt
+
+        Raises:
+            Exception: The error of the last attempt, if all attempts fail
+        """
+        for attempt in range(self.retry_attempts):
+            try:
+                return await attempt_fn()
+            except Exception as e:
+                logger.warning(f"Upload attempt {attempt + 1} failed: {e}")
+                if attempt >= self.retry_attempts - 1:
+                    raise
+                await asyncio.sleep(self.retry_delay)
+        raise RuntimeError("No upload attempts configured")
+
+    async def _start_upload(self, item: UploadQueueItem) -> bool:
+        """Check that a queued file is unchanged and mark its upload as started.
+
+        Returns:
+            True if the file should be uploaded
         """
         filepath = Path(item.filepath)
         logger.info(f"[UPLOAD] Starting processing for file_id={item.file_id}, filepath={filepath}")
@@ -558,138 +712,74 @@ class Uploader:
         )
         logger.info(f"[UPLOAD] Activity logged for file_id={item.file_id}")
 
-        # Get server configuration
-        logger.info(f"[UPLOAD] Getting server config for file_id={item.file_id}")
-        server_result = await db.get_default_server()
-        logger.info(f"[UPLOAD] Server config retrieved for file_id={item.file_id}: {server_result is not None}")
-        if not server_result:
-            error_msg = "No server configured"
-            await self._handle_upload_failure(item, error_msg)
-            return False
-
-        server, encrypted_password = server_result
-        password = decrypt_password(encrypted_password)
-
-        # Get access token (pass server_id for automatic credential invalidation on 401)
-        token = await self._get_access_token(server.url, server.username, password, server.id)
-        if not token:
-            error_msg = "Authentication failed"
-            await self._handle_upload_failure(item, error_msg)
-            return False
-
-        # Prepare headers
-        headers = {"Authorization": f"Bearer {token}"}
-
-        # Upload with retry
-        for attempt in range(self.retry_attempts):
-            try:
-                success = await self._do_upload(
-                    item=item,
-                    server_url=server.url,
-                    headers=headers,
-                )
-
-                if success:
-                    # Update progress
-                    self._progress[item.file_id] = UploadProgress(
-                        file_id=item.file_id,
-                        filepath=item.filepath,
-                        status=UploadStatus.SUCCESS,
-                        progress_percent=100.0,
-                        bytes_uploaded=item.file_size,
-                        total_bytes=item.file_size,
-                    )
-
-                    # Update upload status in database
-                    upload_type = "full" if item.upload_content else "meta"
-                    await db.update_upload_status(
-                        entry_id=item.file_id,
-                        status=upload_type,
-                    )
-
-                    await db.log_activity(
-                        EventType.UPLOAD_COMPLETE,
-                        filepath=item.filepath,
-                        message=f"Upload complete: {filepath.name}",
-                        details={"server": server.name, "upload_type": upload_type, "file_id": item.file_id},
-                    )
-
-                    self._completed_count += 1
-                    return True
-
-            except Exception as e:
-                logger.warning(f"Upload attempt {attempt + 1} failed: {e}")
-                if attempt < self.retry_attempts - 1:
-                    await asyncio.sleep(self.retry_delay)
-                else:
-                    await self._handle_upload_failure(item, str(e))
-
-        return False
+        return True
 
-    async def _do_upload(
-        self,
-        item: UploadQueueItem,
-        server_url: str,
-        headers: dict,
-    ) -> bool:
-        """Perform the actual upload.
+    @staticmethod
+    def _file_metadata(item: UploadQueueItem, hostname: str, ip_address: str) -> dict:
+        """Build the metadata registered with the server for a queued file.
 
-        Returns:
-            True if upload was successful
+        Raises:
+            OSError: If the file cannot be stat'd
         """
         filepath = Path(item.filepath)
-        hostname = get_hostname()
-        ip_address = get_ip_address()
-
-        # Prepare metadata
-        metadata = {
+        stat_info = os.stat(filepath)
+        return {
             "filepath": str(filepath.absolute()),
             "hostname": hostname,
             "ip_address": ip_address,
             "sha256": item.sha256,
+            "file_size": stat_info.st_size,
+            "file_mode": stat_info.st_mode,
+            "file_uid": stat_info.st_uid,
+            "file_gid": stat_info.st_gid,
+            "file_mtime": stat_info.st_mtime,
+            "file_atime": stat_info.st_atime,
+            "file_ctime": stat_info.st_ctime,
         }
 
-        # Get file stats if file exists
-        if filepath.exists():
-            import os
-            stat_info = os.stat(filepath)
-            metadata.update({
-                "file_size": stat_info.st_size,
-                "file_mode": stat_info.st_mode,
-                "file_uid": stat_info.st_uid,
-                "file_gid": stat_info.st_gid,
-                "file_mtime": stat_info.st_mtime,
-                "file_atime": stat_info.st_atime,
-                "file_ctime": stat_info.st_ctime,
-            })
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            # Send metadata
-            metadata_url = f"{server_url.rstrip('/')}/put_file"
-            response = await client.post(metadata_url, json=metadata, headers=headers)
-            response.raise_for_status()
+    async def _put_metadata(
+        self, server_url: str, metadata: list[dict], headers: dict
+    ) -> list[dict]:
+        """Register the metadata of several files with one /put_files request.
+
+        Returns:
+            Server response for each file, in the same order as metadata
+        """
+        client = self._get_client()
+        response = await client.post(
+            f"{server_url.rstrip('/')}/put_files", json=metadata, headers=headers, timeout=60.0
+        )
+        response.raise_for_status()
+        responses: list[dict] = response.json()
+        return responses
 
-            data = response.json()
+    async def _handle_upload_success(self, item: UploadQueueItem, server_name: str) -> None:
+        """Record a successful upload."""
+        # Update progress
+        self._progress[item.file_id] = UploadProgress(
+            file_id=item.file_id,
+            filepath=item.filepath,
+            status=UploadStatus.SUCCESS,
+            progress_percent=100.0,
+            bytes_uploaded=item.file_size,
+            total_bytes=item.file_size,
+        )
 
-            # Check if content upload is required
-            if item.upload_content and data.get("upload_required", False):
-                upload_url = data.get("upload_url")
-                if upload_url:
-                    # Skip content upload for 0-byte files (no content to upload)
-                    file_size = metadata.get("file_size", 0)
-                    if file_size == 0:
-                        logger.info(f"Skipping content upload for 0-byte file: {filepath.name}")
-                    else:
-                        await self._upload_content(
-                            item=item,
-                            filepath=filepath,
-                            server_url=server_url,
-                            upload_url=upload_url,
-                            hostname=hostname,
-                            headers=headers,
-                        )
+        # Update upload status in database
+        upload_type = "full" if item.upload_content else "meta"
+        await db.update_upload_status(
+            entry_id=item.file_id,
+            status=upload_type,
+        )
 
-        return True
+        await db.log_activity(
+            EventType.UPLOAD_COMPLETE,
+            filepath=item.filepath,
+            message=f"Upload complete: {Path(item.filepath).name}",
+            details={"server": server_name, "upload_type": upload_type, "file_id": item.file_id},
+        )
+
+        self._completed_count += 1
 
     async def _upload_content(
         self,
@@ -709,16 +799,16 @@ class Uploader:
         }
 
         # Read file and upload
-        async with httpx.AsyncClient(timeout=float(self.timeout_seconds)) as client:
-            with open(filepath, "rb") as f:
-                files = {"file": (filepath.name, f, "application/octet-stream")}
-                response = await client.post(
-                    full_url,
-                    files=files,
-                    params=params,
-                    headers=headers,
-                )
-                response.raise_for_status()
+        client = self._get_client()
+        with open(filepath, "rb") as f:
+            files = {"file": (filepath.name, f, "application/octet-stream")}
+            response = await client.post(
+                full_url,
+                files=files,
+                params=params,
+                headers=headers,
+            )
+            response.raise_for_status()
 
         logger.info(f"Uploaded content: {filepath.name}")
 
@@ -12,7 +12,6 @@ This module provides background tasks that:
 import asyncio
 import logging
 import os
-import socket
 from pathlib import Path
 from typing import Optional
 
@@ -23,9 +22,13 @@ from .activity import activity_manager
 from .config import settings
 from .database import db
 from .models import EventType
+from .uploader import get_hostname, get_ip_address
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for queue activity before re-polling (picks up retries whose delay has passed)
+QUEUE_POLL_SECONDS = 5.0
+
 # Encryption key for storing passwords
 _ENCRYPTION_KEY: Optional[bytes] = None
 
@@ -59,21 +62,6 @@ def decrypt_password(encrypted: str) -> str:
     return f.decrypt(encrypted.encode()).decode()
 
 
-def get_hostname() -> str:
-    """Get the current hostname."""
-    return socket.gethostname()
-
-
-def get_ip_address() -> str:
-    """Get the primary IP address of this machine."""
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-            s.connect(("8.8.8.8", 80))
-            return s.getsockname()[0]
-    except Exception:
-        return "127.0.0.1"
-
-
 class UploaderV3:
     """Component 3: Uploader with chunked uploads and deletion handling."""
 
@@ -82,6 +70,7 @@ class UploaderV3:
         self._running = False
         self._upload_task: Optional[asyncio.Task] = None
         self._deletion_task: Optional[asyncio.Task] = None
+        self._client: Optional[httpx.AsyncClient] = None
         self._access_tokens: dict[str, str] = {}  # server_url -> token
         self._current_file: Optional[str] = None
         self._uploaded_today = 0
@@ -143,31 +132,89 @@ class UploaderV3:
                 pass
             self._deletion_task = None
 
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
         logger.info("Uploader stopped")
 
-    async def _upload_worker(self) -> None:
-        """Upload worker - processes queue_pending_upload (FIFO)."""
-        while self._running:
-            try:
-                # Dequeue batch from queue_pending_upload (FIFO)
-                queue_entries = await db.dequeue_for_upload(limit=settings.uploader_parallel_uploads)
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client shared by all requests, creating it on first use.
 
-                if queue_entries:
-                    logger.debug(f"Processing {len(queue_entries)} files from upload queue")
+        Reusing one client keeps connections to the server alive between
+        requests instead of reconnecting (and redoing TLS) for every file.
 
-                    # Process uploads concurrently (up to parallel_uploads limit)
-                    tasks = [self._process_upload(entry) for entry in queue_entries]
-                    await asyncio.gather(*tasks, return_exceptions=True)
+        Returns:
+            Shared async HTTP client
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=float(settings.uploader_timeout_seconds),
+                limits=httpx.Limits(
+                    max_keepalive_connections=settings.uploader_parallel_uploads + 1
+                ),
+            )
+        return self._client
 
-                else:
-                    # No entries to process, wait before checking again
-                    await asyncio.sleep(5.0)
+    async def _upload_worker(self) -> None:
+        """Upload worker - processes queue_pending_upload (FIFO).
 
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in upload worker loop: {e}")
-                await asyncio.sleep(5)
+        Keeps up to uploader_parallel_uploads uploads in flight and starts the
+        next queued file as soon as any upload finishes, rather than waiting
+        for a whole batch, so one large file does not hold back the rest.
+        While a slot is free it also wakes as soon as the checksum stage
+        queues a file, instead of polling.
+        """
+        in_flight: dict[str, asyncio.Task] = {}  # filepath -> upload task
+
+        try:
+            while self._running:
+                try:
+                    # Cleared before dequeuing so files queued from here on wake us
+                    db.upload_queued.clear()
+
+                    parallel_uploads = settings.uploader_parallel_uploads
+                    free_slots = parallel_uploads - len(in_flight)
+
+                    if free_slots > 0:
+                        # Entries stay queued until their upload finishes, so
+                        # skip the ones already in flight
+                        queue_entries = await db.dequeue_for_upload(
+                            limit=free_slots + len(in_flight)
+                        )
+                        for entry in queue_entries:
+                            if len(in_flight) >= parallel_uploads:
+                                break
+                            if entry["filepath"] not in in_flight:
+                                in_flight[entry["filepath"]] = asyncio.create_task(
+                                    self._process_upload(entry)
+                                )
+
+                    # Wait for an upload to finish or, with a slot free, for new entries
+                    waiters = set(in_flight.values())
+                    queue_waiter = None
+                    if len(in_flight) < parallel_uploads:
+                        queue_waiter = asyncio.ensure_future(db.upload_queued.wait())
+                        waiters.add(queue_waiter)
+                    try:
+                        await asyncio.wait(
+                            waiters, timeout=QUEUE_POLL_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                        )
+                    finally:
+                        if queue_waiter:
+                            queue_waiter.cancel()
+
+                    for filepath in [fp for fp, task in in_flight.items() if task.done()]:
+                        del in_flight[filepath]
+
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in upload worker loop: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            for task in in_flight.values():
+                task.cancel()
 
     async def _deletion_worker(self) -> None:
         """Deletion worker - processes queue_pending_deletion (FIFO)."""
@@ -205,43 +252,43 @@ class UploaderV3:
         login_url = f"{server_url.rstrip('/')}/api/login"
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    login_url, json={"email": username, "password": password}
-                )
+            client = self._get_client()
+            response = await client.post(
+                login_url, json={"email": username, "password": password}, timeout=30.0
+            )
 
-                if response.status_code == 200:
-                    data = response.json()
-                    token = data.get("access_token")
-                    if token:
-                        self._access_tokens[server_url] = token
-                        return token
-
-                elif response.status_code == 401:
-                    # Unauthorized - credentials are invalid
-                    logger.warning(
-                        f"Authentication failed (401) for {username}@{server_url}. "
-                        "User deleted or credentials invalid."
-                    )
+            if response.status_code == 200:
+                data = response.json()
+                token = data.get("access_token")
+                if token:
+                    self._access_tokens[server_url] = token
+                    return token
+
+            elif response.status_code == 401:
+                # Unauthorized - credentials are invalid
+                logger.warning(
+                    f"Authentication failed (401) for {username}@{server_url}. "
+                    "User deleted or credentials invalid."
+                )
 
-                    # Remove invalid credentials from database
-                    if server_id:
-                        logger.info(f"Removing invalid server credentials (ID: {server_id})")
-                        try:
-                            await db.delete_server(server_id)
-                            await activity_manager.emit(
-                                EventType.ERROR,
-                                message=f"Server credentials removed: {username}@{server_url}",
-                                details={"reason": "401 Unauthorized", "server_id": server_id},
-                            )
-                        except Exception as e:
-                            logger.error(f"Failed to remove server credentials: {e}")
-
-                    return None
+                # Remove invalid credentials from database
+                if server_id:
+                    logger.info(f"Removing invalid server credentials (ID: {server_id})")
+                    try:
+                        await db.delete_server(server_id)
+                        await activity_manager.emit(
+                            EventType.ERROR,
+                            message=f"Server credentials removed: {username}@{server_url}",
+                            details={"reason": "401 Unauthorized", "server_id": server_id},
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to remove server credentials: {e}")
+
+                return None
 
-                else:
-                    logger.error(f"Login failed: {response.status_code} - {response.text}")
-                    return None
+            else:
+                logger.error(f"Login failed: {response.status_code} - {response.text}")
+                return None
 
         except httpx.ConnectError:
             logger.error(f"Could not connect to server: {server_url}")
@@ -264,7 +311,6 @@ class UploaderV3:
         """
         filepath = queue_entry["filepath"]
         sha256 = queue_entry["sha256"]
-        queue_id = queue_entry["id"]
         retry_count = queue_entry.get("retry_count", 0)
 
         self._current_file = filepath
@@ -293,7 +339,7 @@ class UploaderV3:
             if not file_path.exists():
                 # File deleted - remove from queue and files table
                 logger.warning(f"File no longer exists, removing: {filepath}")
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
                 await db.delete_file(filepath)
                 self._failed_today += 1
                 return False
@@ -316,7 +362,7 @@ class UploaderV3:
                 await db.mark_file_uploaded(filepath)
 
                 # Remove from queue_pending_upload
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
 
                 self._uploaded_today += 1
 
@@ -341,12 +387,12 @@ class UploaderV3:
 
                 # Requeue for retry after authentication
                 if retry_count < 3:
-                    delay = 5.0 * (2.0 ** retry_count)
-                    await db.retry_upload_queue_entry(queue_id, delay_seconds=delay)
+                    delay = 5 * 2 ** retry_count
+                    await db.retry_queue_item("queue_pending_upload", filepath, delay_seconds=delay)
                 else:
                     # Max retries - remove from queue and files table
                     logger.error(f"Max retries exhausted for {filepath} (401 errors)")
-                    await db.remove_from_upload_queue(queue_id)
+                    await db.remove_from_upload_queue(filepath)
                     await db.delete_file(filepath)
                     self._failed_today += 1
 
@@ -356,7 +402,7 @@ class UploaderV3:
                 # Conflict - file already exists on server
                 logger.info(f"File already on server (409 Conflict): {filepath}")
                 await db.mark_file_uploaded(filepath)
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
                 self._uploaded_today += 1
                 return True
 
@@ -366,12 +412,12 @@ class UploaderV3:
                 self._failed_today += 1
 
                 if retry_count < 3:
-                    delay = 5.0 * (2.0 ** retry_count)
-                    await db.retry_upload_queue_entry(queue_id, delay_seconds=delay)
+                    delay = 5 * 2 ** retry_count
+                    await db.retry_queue_item("queue_pending_upload", filepath, delay_seconds=delay)
                 else:
                     # Max retries - remove from queue and files table
                     logger.error(f"Max retries exhausted for {filepath}")
-                    await db.remove_from_upload_queue(queue_id)
+                    await db.remove_from_upload_queue(filepath)
                     await db.delete_file(filepath)
 
                 return False
@@ -379,7 +425,7 @@ class UploaderV3:
             else:
                 # Other HTTP error - remove from queue
                 logger.error(f"HTTP error {e.response.status_code} uploading {filepath}: {e}")
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
                 await db.delete_file(filepath)
                 self._failed_today += 1
                 return False
@@ -390,12 +436,12 @@ class UploaderV3:
             self._failed_today += 1
 
             if retry_count < 3:
-                delay = 5.0 * (2.0 ** retry_count)
-                await db.retry_upload_queue_entry(queue_id, delay_seconds=delay)
+                delay = 5 * 2 ** retry_count
+                await db.retry_queue_item("queue_pending_upload", filepath, delay_seconds=delay)
             else:
                 # Max retries - remove from queue and files table
                 logger.error(f"Max retries exhausted for {filepath}")
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
                 await db.delete_file(filepath)
 
             return False
@@ -406,12 +452,12 @@ class UploaderV3:
             self._failed_today += 1
 
             if retry_count < 3:
-                delay = 5.0 * (2.0 ** retry_count)
-                await db.retry_upload_queue_entry(queue_id, delay_seconds=delay)
+                delay = 5 * 2 ** retry_count
+                await db.retry_queue_item("queue_pending_upload", filepath, delay_seconds=delay)
             else:
                 # Max retries - remove from queue and files table
                 logger.error(f"Max retries exhausted for {filepath}")
-                await db.remove_from_upload_queue(queue_id)
+                await db.remove_from_upload_queue(filepath)
                 await db.delete_file(filepath)
 
             return False
@@ -441,63 +487,77 @@ class UploaderV3:
         """
         headers = {"Authorization": f"Bearer {token}"}
         chunk_size = settings.uploader_chunk_size_mb * 1024 * 1024  # Convert MB to bytes
-        total_chunks = (file_size + chunk_size - 1) // chunk_size  # Ceiling division
-
-        async with httpx.AsyncClient(timeout=float(settings.uploader_timeout_seconds)) as client:
-            # Step 1: Initiate upload
-            initiate_url = f"{server_url.rstrip('/')}/api/uploads/initiate"
-            hostname = get_hostname()
-            ip_address = get_ip_address()
-
-            init_data = {
-                "filepath": str(filepath.absolute()),
-                "hostname": hostname,
-                "ip_address": ip_address,
-                "sha256": sha256,
-                "file_size": file_size,
-                "total_chunks": total_chunks,
-            }
-
-            response = await client.post(initiate_url, json=init_data, headers=headers)
-            response.raise_for_status()
-            upload_response = response.json()
-            upload_id = upload_response["upload_id"]
-
-            logger.info(
-                f"Initiated chunked upload: {filepath.name} (upload_id={upload_id}, chunks={total_chunks})"
-            )
+        # Ceiling division; an empty file is still sent as one (empty) chunk
+        total_chunks = max(1, (file_size + chunk_size - 1) // chunk_size)
+
+        client = self._get_client()
+
+        # Step 1: Initiate upload
+        initiate_url = f"{server_url.rstrip('/')}/api/uploads/initiate"
+        hostname = get_hostname()
+        ip_address = get_ip_address()
+
+        init_data = {
+            "filepath": str(filepath.absolute()),
+            "hostname": hostname,
+            "ip_address": ip_address,
+            "sha256": sha256,
+            "file_size": file_size,
+            "chunk_size": chunk_size,
+            "total_chunks": total_chunks,
+        }
 
-            # Step 2: Upload chunks
-            uploaded_parts = []
-            with open(filepath, "rb") as f:
-                for chunk_num in range(total_chunks):
-                    chunk_data = f.read(chunk_size)
-
-                    chunk_url = f"{server_url.rstrip('/')}/api/uploads/{upload_id}/chunk/{chunk_num}"
-                    chunk_response = await client.put(
-                        chunk_url,
-                        content=chunk_data,
-                        headers={**headers, "Content-Type": "application/octet-stream"},
-                    )
-                    chunk_response.raise_for_status()
+        response = await client.post(initiate_url, json=init_data, headers=headers)
+        response.raise_for_status()
+        upload_response = response.json()
+        upload_id = upload_response["upload_id"]
+
+        logger.info(
+            f"Initiated chunked upload: {filepath.name} "
+            f"(upload_id={upload_id}, chunks={total_chunks})"
+        )
+
+        # Step 2: Upload chunks
+        uploaded_parts = []
+        with open(filepath, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            for chunk_num in range(total_chunks):
+                # Read off the event loop so other uploads keep streaming meanwhile
+                chunk_data = await asyncio.to_thread(f.read, chunk_size)
+
+                chunk_url = f"{server_url.rstrip('/')}/api/uploads/{upload_id}/chunk/{chunk_num}"
+                chunk_response = await client.put(
+                    chunk_url,
+                    content=chunk_data,
+                    headers={**headers, "Content-Type": "application/octet-stream"},
+                )
+                chunk_response.raise_for_status()
 
-                    chunk_result = chunk_response.json()
-                    uploaded_parts.append(
-                        {"chunk_num": chunk_num, "etag": chunk_result.get("etag", "")}
-                    )
+                chunk_result = chunk_response.json()
+                uploaded_parts.append(
+                    {"chunk_num": chunk_num, "etag": chunk_result.get("etag", "")}
+                )
 
-                    logger.debug(
-                        f"Uploaded chunk {chunk_num + 1}/{total_chunks} for {filepath.name}"
-                    )
+                logger.debug(
+                    f"Uploaded chunk {chunk_num + 1}/{total_chunks} for {filepath.name}"
+                )
+
+            # This was the last read of the file: hashing happened before it
+            # was queued, so drop its pages rather than let a large upload
+            # push other data out of the page cache
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
 
-            # Step 3: Complete upload
-            complete_url = f"{server_url.rstrip('/')}/api/uploads/{upload_id}/complete"
-            complete_data = {"parts": uploaded_parts}
-            complete_response = await client.post(complete_url, json=complete_data, headers=headers)
-            complete_response.raise_for_status()
+        # Step 3: Complete upload
+        complete_url = f"{server_url.rstrip('/')}/api/uploads/{upload_id}/complete"
+        complete_data = {"parts": uploaded_parts}
+        complete_response = await client.post(complete_url, json=complete_data, headers=headers)
+        complete_response.raise_for_status()
 
-            logger.info(f"Completed chunked upload: {filepath.name} ({sha256[:16]}...)")
-            return True
+        logger.info(f"Completed chunked upload: {filepath.name} ({sha256[:16]}...)")
+        return True
 
     async def _process_deletion(self, deletion_entry: dict) -> bool:
         """Process a deletion notification from queue_pending_deletion.
@@ -511,7 +571,6 @@ class UploaderV3:
         """
         filepath = deletion_entry["filepath"]
         sha256 = deletion_entry.get("sha256")
-        queue_id = deletion_entry["id"]
         retry_count = deletion_entry.get("retry_count", 0)
 
         try:
@@ -535,68 +594,72 @@ class UploaderV3:
             headers = {"Authorization": f"Bearer {token}"}
             delete_url = f"{server.url.rstrip('/')}/api/files/{sha256}"
 
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.delete(delete_url, headers=headers)
+            client = self._get_client()
+            response = await client.delete(delete_url, headers=headers, timeout=30.0)
 
-                if response.status_code == 200:
-                    # Success - remove from queue
-                    await db.remove_from_deletion_queue(queue_id)
-                    logger.info(f"Deletion notified: {filepath}")
+            if response.status_code == 200:
+                # Success - remove from queue
+                await db.remove_from_deletion_queue(filepath)
+                logger.info(f"Deletion notified: {filepath}")
 
-                    await activity_manager.emit(
-                        EventType.FILE_DELETED,
-                        filepath=filepath,
-                        message=f"Deletion notified: {Path(filepath).name}",
-                        details={"sha256": sha256[:16] + "..." if sha256 else "unknown"},
-                    )
+                await activity_manager.emit(
+                    EventType.FILE_DELETED,
+                    filepath=filepath,
+                    message=f"Deletion notified: {Path(filepath).name}",
+                    details={"sha256": sha256[:16] + "..." if sha256 else "unknown"},
+                )
 
-                    return True
+                return True
 
-                elif response.status_code == 404:
-                    # File doesn't exist on server anyway - remove from queue
-                    logger.info(f"File not found on server (deletion OK): {filepath}")
-                    await db.remove_from_deletion_queue(queue_id)
-                    return True
+            elif response.status_code == 404:
+                # File doesn't exist on server anyway - remove from queue
+                logger.info(f"File not found on server (deletion OK): {filepath}")
+                await db.remove_from_deletion_queue(filepath)
+                return True
 
-                elif response.status_code == 401:
-                    # Unauthorized - invalidate credentials and retry
-                    logger.warning(f"401 Unauthorized during deletion notification of {filepath}")
-                    self._access_tokens.pop(server.url, None)
+            elif response.status_code == 401:
+                # Unauthorized - invalidate credentials and retry
+                logger.warning(f"401 Unauthorized during deletion notification of {filepath}")
+                self._access_tokens.pop(server.url, None)
 
-                    if retry_count < 3:
-                        delay = 5.0 * (2.0 ** retry_count)
-                        await db.retry_deletion_queue_entry(queue_id, delay_seconds=delay)
-                    else:
-                        # Max retries - just remove from queue
-                        logger.error(f"Max retries exhausted for deletion notification: {filepath}")
-                        await db.remove_from_deletion_queue(queue_id)
+                if retry_count < 3:
+                    delay = 5 * 2 ** retry_count
+                    await db.retry_queue_item(
+                        "queue_pending_deletion", filepath, delay_seconds=delay
+                    )
+                else:
+                    # Max retries - just remove from queue
+                    logger.error(f"Max retries exhausted for deletion notification: {filepath}")
+                    await db.remove_from_deletion_queue(filepath)
 
-                    return False
+                return False
 
-                else:
-                    # Other error - retry
-                    logger.error(f"Deletion notification failed ({response.status_code}): {filepath}")
+            else:
+                # Other error - retry
+                logger.error(f"Deletion notification failed ({response.status_code}): {filepath}")
 
-                    if retry_count < 3:
-                        delay = 5.0 * (2.0 ** retry_count)
-                        await db.retry_deletion_queue_entry(queue_id, delay_seconds=delay)
-                    else:
-                        # Max retries - just remove from queue
-                        logger.error(f"Max retries exhausted for deletion notification: {filepath}")
-                        await db.remove_from_deletion_queue(queue_id)
+                if retry_count < 3:
+                    delay = 5 * 2 ** retry_count
+                    await db.retry_queue_item(
+                        "queue_pending_deletion", filepath, delay_seconds=delay
+                    )
+                else:
+                    # Max retries - just remove from queue
+                    logger.error(f"Max retries exhausted for deletion notification: {filepath}")
+                    await db.remove_from_deletion_queue(filepath)
 
-                    return False
+                return False
 
         except Exception as e:
             logger.error(f"Error processing deletion notification for {filepath}: {e}")
 
             if retry_count < 3:
-                delay = 5.0 * (2.0 ** retry_count)
-                await db.retry_deletion_queue_entry(queue_id, delay_seconds=delay)
+                delay = 5 * 2 ** retry_count
+                await db.retry_queue_item("queue_pending_deletion", filepath, delay_seconds=delay)
             else:
                 # Max retries - just remove from queue
                 logger.error(f"Max retries exhausted for deletion notification: {filepath}")
-                await db.remove_from_deletion_queue(queue_id)
+                await db.remove_from_deletion_queue(filepath)
 
             return False
 
@@ -613,8 +676,8 @@ class UploaderV3:
         """
         counts = await db.get_queue_counts()
         return {
-            "pending_uploads": counts.get("queue_pending_upload", 0),
-            "pending_deletions": counts.get("queue_pending_deletion", 0),
+            "pending_uploads": counts.get("pending_upload", 0),
+            "pending_deletions": counts.get("pending_deletion", 0),
         }
 
 
@@ -5,6 +5,7 @@ Monitors registered paths for file changes using watchdog.
 
 import asyncio
 import logging
+import stat
 from pathlib import Path
 from typing import Any, Callable, Optional
 
@@ -290,16 +291,9 @@ class FileWatcher:
 
     async def _handle_created_modified(self, path_id: int, filepath: Path) -> None:
         """Handle file creation or modification."""
-        if not filepath.exists():
-            return
-
-        if not filepath.is_file():
-            return
-
-        # Scan the file
+        # One stat off the event loop covers existence, type and metadata
         scanned = await get_file_metadata(filepath)
-        if scanned is None:
-            logger.warning(f"Failed to scan file: {filepath}")
+        if scanned is None or not stat.S_ISREG(scanned.file_mode):
             return
 
         # Check if file exists in database
@@ -191,3 +191,38 @@ class TestServerEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert data["servers"] == []
+
+
+@pytest.mark.asyncio
+class TestConfigEndpoints:
+    """Tests for configuration endpoints."""
+
+    async def test_save_config_keeps_missing_settings(
+        self, client: AsyncClient, tmp_path, monkeypatch
+    ):
+        """Test that saving merges into the config file instead of replacing it."""
+        import sys
+
+        from putplace_assist import config as config_module
+
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            import tomli as tomllib
+
+        config_file = tmp_path / "pp_assist.toml"
+        config_file.write_text(
+            '[remote_server]\nusername = "me"\npassword = "secret"\n\n'
+            "[scanner]\ncache_enabled = true\nworkers = 4\n"
+        )
+        monkeypatch.setattr(config_module, "find_config_file", lambda: config_file)
+
+        response = await client.post(
+            "/config",
+            json={"remote_server": {"username": "you"}, "scanner": {"cache_enabled": False}},
+        )
+        assert response.status_code == 200
+
+        saved = tomllib.loads(config_file.read_text())
+        assert saved["remote_server"] == {"username": "you", "password": "secret"}
+        assert saved["scanner"] == {"cache_enabled": False, "workers": 4}
@@ -41,6 +41,28 @@ class TestPathOperations:
         paths = await test_db.get_all_paths()
         assert len(paths) == 2
 
+    async def test_scan_cache_saved_with_path_scanned(self, test_db: Database):
+        """Test that scan cache signatures are replaced when a scan completes."""
+        path_id = await test_db.add_path("/data")
+        await test_db.update_path_scanned(
+            path_id, "/data", {"/data": (1.0, 2, ["a", "b"]), "/data/a": (2.0, 0, [])}
+        )
+        await test_db.update_path_scanned(path_id, "/data", {"/data": (3.0, 1, ["a"])})
+        await test_db.update_path_scanned(path_id, "/other", {"/other": (4.0, 0, [])})
+
+        assert await test_db.get_scan_cache("/data") == {"/data": (3.0, 1, ["a"])}
+        assert await test_db.clear_scan_cache() == 2
+        assert await test_db.get_scan_cache("/data") == {}
+
+    async def test_scan_cache_filesystem_root(self, test_db: Database):
+        """Test that the scan cache of the filesystem root covers every directory."""
+        path_id = await test_db.add_path("/")
+        signatures = {"/": (1.0, 0, ["data"]), "/data": (2.0, 1, [])}
+        await test_db.update_path_scanned(path_id, "/", signatures)
+
+        assert await test_db.get_scan_cache("/") == signatures
+        assert await test_db.clear_scan_cache("/") == 2
+
     async def test_delete_path(self, test_db: Database):
         """Test deleting a path."""
         path_id = await test_db.add_path("/var/log")
@@ -140,6 +162,73 @@ class TestFileOperations:
         file = await test_db.get_file("/var/log/nonexistent.log")
         assert file is None
 
+    async def test_upsert_files_bulk(self, test_db: Database):
+        """Test bulk upsert queues new and modified files only."""
+        def row(filepath: str, mtime: float) -> dict:
+            return {
+                "filepath": filepath,
+                "file_size": 100,
+                "file_mtime": mtime,
+                "file_mode": 0o644,
+                "file_uid": 0,
+                "file_gid": 0,
+                "file_atime": mtime,
+                "file_ctime": mtime,
+            }
+
+        await test_db.upsert_file(
+            filepath="/var/log/same.log", file_size=100, file_mtime=10.0,
+            sha256="a" * 64, status="completed",
+        )
+        await test_db.upsert_file(
+            filepath="/var/log/changed.log", file_size=100, file_mtime=10.0,
+        )
+
+        queued = await test_db.upsert_files_bulk([
+            row("/var/log/new.log", 10.0),
+            row("/var/log/same.log", 10.0),
+            row("/var/log/changed.log", 20.0),
+        ])
+
+        assert queued == {"/var/log/new.log": "new", "/var/log/changed.log": "modified"}
+
+        unchanged = await test_db.get_file("/var/log/same.log")
+        assert unchanged["sha256"] == "a" * 64
+        assert unchanged["status"] == "completed"
+
+        queue = await test_db.dequeue_for_checksum(limit=10)
+        assert {entry["filepath"] for entry in queue} == set(queued)
+
+    async def test_complete_checksums(self, test_db: Database):
+        """Test recording a batch of checksums in one call."""
+        for filepath in ("/var/log/a.log", "/var/log/b.log"):
+            await test_db.upsert_file(filepath=filepath, file_size=1, file_mtime=10.0)
+            await test_db.enqueue_for_checksum(filepath, "new")
+        assert await test_db.count_pending_checksums() == 2
+
+        await test_db.complete_checksums([
+            ("/var/log/a.log", "a" * 64, True),
+            ("/var/log/b.log", "b" * 64, False),
+        ])
+
+        changed = await test_db.get_file("/var/log/a.log")
+        assert changed["sha256"] == "a" * 64
+        assert changed["status"] == "ready_for_upload"
+        assert (await test_db.get_file("/var/log/b.log"))["status"] == "unchanged"
+
+        assert await test_db.count_pending_checksums() == 0
+        uploads = await test_db.dequeue_for_upload(limit=10)
+        assert [(e["filepath"], e["sha256"]) for e in uploads] == [("/var/log/a.log", "a" * 64)]
+
+    async def test_get_file_times(self, test_db: Database):
+        """Test getting recorded file times under a directory."""
+        await test_db.upsert_file(
+            filepath="/var/log/a.log", file_size=1, file_mtime=10.0, file_ctime=5.0
+        )
+        await test_db.upsert_file(filepath="/var/logs/b.log", file_size=1, file_mtime=20.0)
+
+        assert await test_db.get_file_times("/var/log") == {"/var/log/a.log": (10.0, 5.0)}
+
     async def test_get_file_stats(self, test_db: Database):
         """Test getting file statistics."""
         path_id = await test_db.add_path("/var/log")
@@ -1,12 +1,16 @@
 """Tests for file scanner."""
 
+import os
 from pathlib import Path
 
 import pytest
 
 from putplace_assist.scanner import (
+    DirectoryCache,
+    ExcludeMatcher,
     collect_files,
-    get_file_stats,
+    file_metadata_from_stat,
+    get_file_metadata,
     matches_exclude_pattern,
 )
 
@@ -14,20 +18,26 @@ from putplace_assist.scanner import (
 class TestFileStats:
     """Tests for file stat retrieval."""
 
-    def test_get_file_stats(self, temp_test_dir: Path):
-        """Test getting file stats."""
+    def test_file_metadata_from_stat(self, temp_test_dir: Path):
+        """Test building metadata from a stat result."""
         file_path = temp_test_dir / "file1.txt"
-        stats = get_file_stats(file_path)
+        metadata = file_metadata_from_stat(file_path, os.stat(file_path))
 
-        assert stats is not None
-        assert stats["file_size"] == len("Hello, World!")
-        assert "file_mode" in stats
-        assert "file_mtime" in stats
+        assert metadata.filepath == file_path
+        assert metadata.file_size == len("Hello, World!")
+        assert metadata.file_mtime == os.stat(file_path).st_mtime
 
-    def test_get_file_stats_nonexistent(self, tmp_path: Path):
-        """Test stats of nonexistent file."""
-        stats = get_file_stats(tmp_path / "nonexistent")
-        assert stats is None
+    async def test_get_file_metadata(self, temp_test_dir: Path):
+        """Test getting metadata for a single file."""
+        metadata = await get_file_metadata(temp_test_dir / "file1.txt")
+
+        assert metadata is not None
+        assert metadata.file_size == len("Hello, World!")
+
+    async def test_get_file_metadata_nonexistent(self, tmp_path: Path):
+        """Test metadata of nonexistent file."""
+        metadata = await get_file_metadata(tmp_path / "nonexistent")
+        assert metadata is None
 
 
 class TestExcludePatterns:
@@ -89,6 +99,50 @@ class TestExcludePatterns:
         assert result is True
 
 
+class TestExcludeMatcher:
+    """Tests for compiled exclude pattern matching."""
+
+    def test_multiple_patterns(self):
+        """Test literal and wildcard patterns compiled together."""
+        matcher = ExcludeMatcher(("node_modules", "*.log", "build/out"))
+
+        assert matcher.matches("a/node_modules/x.js", ("a", "node_modules", "x.js"))
+        assert matcher.matches("src/debug.log", ("src", "debug.log"))
+        assert matcher.matches("build/out", ("build", "out"))
+        assert not matcher.matches("src/main.py", ("src", "main.py"))
+
+    def test_literal_path_matches_whole_path_only(self):
+        """Test that a literal with a separator is not matched against parts."""
+        matcher = ExcludeMatcher((os.path.join("build", "out"), ".git"))
+
+        assert matcher.literal_paths == {os.path.join("build", "out")}
+        assert matcher.literal_parts == {".git"}
+        assert not matcher.matches(os.path.join("build", "out", "x"), ("build", "out", "x"))
+        assert matcher.matches(os.path.join("a", ".git"), ("a", ".git"))
+
+    def test_directory_pattern(self):
+        """Test that a trailing slash only matches directory names."""
+        matcher = ExcludeMatcher(("build/",))
+
+        assert matcher.matches_dir("build")
+        assert matcher.matches(os.path.join("build", "x.o"), ("build", "x.o"))
+        assert not matcher.matches("build", ("build",))
+
+    def test_matches_file_checks_path_and_name(self):
+        """Test matching a file whose directories were already pruned."""
+        matcher = ExcludeMatcher(("*.log", ".DS_Store", os.path.join("build", "out")))
+
+        assert matcher.matches_file(os.path.join("src", "debug.log"), "debug.log")
+        assert matcher.matches_file(os.path.join("a", ".DS_Store"), ".DS_Store")
+        assert matcher.matches_file(os.path.join("build", "out"), "out")
+        assert not matcher.matches_file(os.path.join("src", "main.py"), "main.py")
+
+    def test_empty_matcher_is_falsy(self):
+        """Test that a matcher without patterns is falsy."""
+        assert not ExcludeMatcher(())
+        assert ExcludeMatcher(("*.tmp",))
+
+
 class TestCollectFiles:
     """Tests for file collection."""
 
@@ -106,3 +160,60 @@ class TestCollectFiles:
         """Test file collection with excludes."""
         files = collect_files(temp_test_dir, recursive=True, exclude_patterns=[".*"])
         assert len(files) == 3  # Excludes .hidden
+
+    def test_collect_files_returns_stats(self, temp_test_dir: Path):
+        """Test that collected files carry their stat results."""
+        files = dict(collect_files(temp_test_dir, recursive=True, exclude_patterns=[]))
+        file1 = str((temp_test_dir / "file1.txt").resolve())
+        assert file1 in files
+        assert files[file1].st_size == len("Hello, World!")
+
+    def test_collect_files_parallel(self, temp_test_dir: Path):
+        """Test that threaded traversal finds the same files."""
+        (temp_test_dir / "subdir" / "deeper").mkdir()
+        (temp_test_dir / "subdir" / "deeper" / "file4.txt").write_text("Deep file")
+
+        serial = collect_files(temp_test_dir, recursive=True, exclude_patterns=[])
+        parallel = collect_files(
+            temp_test_dir, recursive=True, exclude_patterns=[], num_workers=4
+        )
+        assert sorted(p for p, _ in parallel) == sorted(p for p, _ in serial)
+        assert len(parallel) == 5
+
+    def test_collect_files_skips_unchanged_directories(self, temp_test_dir: Path):
+        """Test that a directory cache skips directories unchanged since the last walk."""
+        first = DirectoryCache({})
+        assert len(collect_files(temp_test_dir, True, [], cache=first)) == 4
+
+        subdir = str((temp_test_dir / "subdir").resolve())
+        (temp_test_dir / "subdir" / "file4.txt").write_text("New file")
+        os.utime(subdir, (1, 1))  # Make sure the change is visible on coarse clocks
+
+        second = DirectoryCache(first.current)
+        files = collect_files(temp_test_dir, True, [], cache=second)
+        assert sorted(os.path.basename(p) for p, _ in files) == ["file3.txt", "file4.txt"]
+        assert second.skipped_dirs == 1
+        assert second.skipped_files == 3
+        assert set(second.current) == set(first.current)
+
+    def test_directory_cache_counts_only_included_files(self, temp_test_dir: Path):
+        """Test that cached file counts leave out excluded files."""
+        first = DirectoryCache({})
+        assert len(collect_files(temp_test_dir, True, [".*"], cache=first)) == 3
+
+        second = DirectoryCache(first.current)
+        assert collect_files(temp_test_dir, True, [".*"], cache=second) == []
+        assert second.skipped_files == 3
+
+    def test_collect_files_prunes_excluded_directories(self, temp_test_dir: Path):
+        """Test that excluded directories are not descended into."""
+        (temp_test_dir / "subdir" / "deeper").mkdir()
+        (temp_test_dir / "subdir" / "deeper" / "file4.txt").write_text("Deep file")
+
+        cache = DirectoryCache({})
+        files = collect_files(temp_test_dir, True, ["deeper/"], cache=cache)
+
+        assert "file4.txt" not in {os.path.basename(p) for p, _ in files}
+        assert len(files) == 4
+        # The excluded directory was never listed
+        assert not any(d.endswith("deeper") for d in cache.current)
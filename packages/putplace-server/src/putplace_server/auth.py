@@ -7,9 +7,11 @@ from typing import Optional, TYPE_CHECKING
 
 from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
+from pymongo import ReturnDocument
 from pymongo.asynchronous.collection import AsyncCollection
 
 from . import database
+from .cache import TTLCache
 
 if TYPE_CHECKING:
     from .database import MongoDB
@@ -17,12 +19,31 @@ if TYPE_CHECKING:
 # API key header name
 API_KEY_HEADER = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Every API-key request verifies its key, so verified keys are cached
+# briefly. While a key is cached, its last_used_at is not refreshed, and
+# revocations made by other processes take up to this long to apply.
+API_KEY_CACHE_TTL_SECONDS = 30.0
+API_KEY_CACHE_MAX_SIZE = 20_000
 
-def get_auth_db() -> "MongoDB":
+# key hash -> key metadata
+_api_key_cache = TTLCache(API_KEY_CACHE_TTL_SECONDS, API_KEY_CACHE_MAX_SIZE)
+
+
+def invalidate_api_key_cache() -> None:
+    """Drop all verified API keys from the cache.
+
+    Called when a key is revoked or deleted. The cache is keyed by key hash,
+    not ID, and those changes are rare, so the whole cache is cleared.
+    """
+    _api_key_cache.clear()
+
+
+async def get_auth_db() -> "MongoDB":
     """Get database instance for authentication.
 
     This function is used as a dependency in FastAPI routes.
-    Returns the global database.mongodb instance.
+    Returns the global database.mongodb instance. It is async so that
+    FastAPI calls it directly instead of through the threadpool.
     """
     return database.mongodb
 
@@ -132,23 +153,23 @@ class APIKeyAuth:
         # Hash the provided key
         key_hash = hash_api_key(api_key)
 
-        # Look up in database
-        key_doc = await collection.find_one({
-            "key_hash": key_hash,
-            "is_active": True,
-        })
+        key_doc = _api_key_cache.get(key_hash)
+        if key_doc is not None:
+            return dict(key_doc)
+
+        # Look up in database and update the last used timestamp in one
+        # round trip, returning the metadata without the hash
+        key_doc = await collection.find_one_and_update(
+            {"key_hash": key_hash, "is_active": True},
+            {"$set": {"last_used_at": datetime.utcnow()}},
+            projection={"key_hash": 0},
+            return_document=ReturnDocument.AFTER,
+        )
 
         if key_doc:
-            # Update last used timestamp
-            await collection.update_one(
-                {"_id": key_doc["_id"]},
-                {"$set": {"last_used_at": datetime.utcnow()}}
-            )
-
-            # Return metadata (without hash)
-            key_doc.pop("key_hash", None)
             key_doc["_id"] = str(key_doc["_id"])
-            return key_doc
+            _api_key_cache.set(key_hash, key_doc)
+            return dict(key_doc)
 
         return None
 
@@ -169,6 +190,7 @@ class APIKeyAuth:
             {"_id": ObjectId(key_id)},
             {"$set": {"is_active": False}}
         )
+        invalidate_api_key_cache()
 
         return result.modified_count > 0
 
@@ -211,6 +233,7 @@ class APIKeyAuth:
         collection = await self.get_api_keys_collection()
 
         result = await collection.delete_one({"_id": ObjectId(key_id)})
+        invalidate_api_key_cache()
 
         return result.deleted_count > 0
 
@@ -90,6 +90,14 @@ def load_toml_config() -> dict[str, Any]:
                 config["mongodb_database"] = db["mongodb_database"]
             if "mongodb_collection" in db:
                 config["mongodb_collection"] = db["mongodb_collection"]
+            for key in (
+                "mongodb_max_pool_size",
+                "mongodb_min_pool_size",
+                "mongodb_max_idle_time_ms",
+                "mongodb_wait_queue_timeout_ms",
+            ):
+                if key in db:
+                    config[key] = db[key]
 
         # API settings
         if "api" in toml_data:
@@ -198,6 +206,12 @@ class Settings(BaseSettings):
     mongodb_database: str
     mongodb_collection: str
 
+    # MongoDB connection pool settings
+    mongodb_max_pool_size: int = 200  # Concurrent operations before requests queue for a socket
+    mongodb_min_pool_size: int = 10  # Connections kept open while idle
+    mongodb_max_idle_time_ms: int = 300_000  # Close connections idle longer than this
+    mongodb_wait_queue_timeout_ms: int = 10_000  # Fail instead of waiting longer for a socket
+
     # API settings
     api_title: str
     api_version: str = __version__
@@ -270,6 +284,12 @@ class Settings(BaseSettings):
             "mongodb_url": get_value("mongodb_url", "mongodb://localhost:27017"),
             "mongodb_database": get_value("mongodb_database", "putplace"),
             "mongodb_collection": get_value("mongodb_collection", "file_metadata"),
+            "mongodb_max_pool_size": int(get_value("mongodb_max_pool_size", 200)),
+            "mongodb_min_pool_size": int(get_value("mongodb_min_pool_size", 10)),
+            "mongodb_max_idle_time_ms": int(get_value("mongodb_max_idle_time_ms", 300_000)),
+            "mongodb_wait_queue_timeout_ms": int(
+                get_value("mongodb_wait_queue_timeout_ms", 10_000)
+            ),
             "api_title": get_value("api_title", "PutPlace API"),
             "api_description": get_value("api_description", "File metadata storage API"),
             "storage_backend": get_value("storage_backend", "local"),
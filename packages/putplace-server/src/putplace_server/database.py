@@ -1,9 +1,11 @@
 """MongoDB database connection and operations."""
 
+import asyncio
 import logging
+from datetime import datetime, timedelta
 from typing import Optional
 
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, IndexModel, ReturnDocument, UpdateOne
 from pymongo.asynchronous.collection import AsyncCollection
 from pymongo.errors import (
     ConnectionFailure,
@@ -12,10 +14,118 @@ from pymongo.errors import (
     ServerSelectionTimeoutError,
 )
 
+from .cache import TTLCache
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# A file metadata record is unique per location and content
+FILE_LOCATION_KEYS = ("hostname", "filepath", "sha256")
+
+# Content-tracking fields. An upsert only overwrites these when the new data
+# reports content, so re-submitting metadata for a file does not clear the
+# state of content that was already uploaded.
+_CONTENT_FIELDS = ("has_file_content", "file_uploaded_at", "storage_path")
+
+# File stat fields, with the placeholders a new record gets when the caller
+# does not know them (chunked uploads only learn a file's location and
+# content). They are only ever written on insert, so an existing record
+# keeps its real values.
+FILE_STAT_DEFAULTS = {
+    "ip_address": "",
+    "file_mode": 0,
+    "file_uid": 0,
+    "file_gid": 0,
+    "file_mtime": 0.0,
+    "file_atime": 0.0,
+    "file_ctime": 0.0,
+}
+
+# Unique index on file metadata location. Databases written before metadata
+# was upserted may hold duplicates that prevent it from being built.
+FILE_LOCATION_INDEX = IndexModel([(key, 1) for key in FILE_LOCATION_KEYS], unique=True)
+
+# Order in which get_files_by_sha256 returns the records for a hash: records
+# with content first (earliest upload first), then metadata-only records
+# (oldest first). The index on these keys serves both the lookup and the sort.
+FILE_SHA256_SORT = [
+    ("sha256", 1),
+    ("has_file_content", -1),
+    ("file_uploaded_at", 1),
+    ("created_at", 1),
+]
+FILE_SHA256_INDEX = IndexModel(FILE_SHA256_SORT)
+
+# Partial index over the records that have content, so content checks scan
+# only those records and are answered from the index alone
+FILE_CONTENT_INDEX = IndexModel(
+    [("sha256", 1), ("has_file_content", 1)],
+    partialFilterExpression={"has_file_content": True},
+)
+
+# File metadata indexes made redundant by the indexes above, mapped to the
+# name of the index that replaces each. They are dropped from existing
+# databases, since every index slows down writes, but only once their
+# replacement exists.
+OBSOLETE_FILE_INDEXES = {
+    "hostname_1_filepath_1": FILE_LOCATION_INDEX.document["name"],
+    "sha256_1": FILE_SHA256_INDEX.document["name"],
+}
+
+# MongoDB error code for dropping an index that does not exist
+INDEX_NOT_FOUND_CODE = 27
+
+# Every JWT-authenticated request looks up its user, so those lookups are
+# cached briefly. Changes made by other processes (e.g. pp_manage_users)
+# take up to USER_CACHE_TTL_SECONDS to apply.
+USER_CACHE_TTL_SECONDS = 15.0
+USER_CACHE_MAX_SIZE = 10_000
+
+# has_file_content results are cached too, but only positive ones. The server
+# never removes content or clears the flag once set (storage rejects content
+# that does not match its hash before it is stored), so a positive result only
+# goes stale if content is removed out of band, e.g. by pp_purge_data. That is
+# noticed within CONTENT_CACHE_TTL_SECONDS.
+CONTENT_CACHE_TTL_SECONDS = 60.0
+CONTENT_CACHE_MAX_SIZE = 100_000
+
+# /health reuses a ping result for this long, so frequent probes from
+# uptime monitors do not each cost a database round trip
+HEALTH_CHECK_CACHE_SECONDS = 5.0
+
+# How long a chunked upload session stays valid
+UPLOAD_SESSION_TTL = timedelta(hours=1)
+
+
+def _file_location(data: dict) -> dict:
+    """Get the filter identifying a file metadata record."""
+    return {key: data.get(key) for key in FILE_LOCATION_KEYS}
+
+
+def _file_upsert(data: dict) -> dict:
+    """Build the update document for upserting file metadata.
+
+    Args:
+        data: File metadata dictionary
+
+    Returns:
+        Update with $set for current values and $setOnInsert for values that
+        only apply to a new record (created_at, empty content fields and
+        placeholders for stat fields missing from data)
+    """
+    set_fields = {}
+    on_insert = {key: value for key, value in FILE_STAT_DEFAULTS.items() if key not in data}
+    for key, value in data.items():
+        if key == "created_at" or (key in _CONTENT_FIELDS and not value):
+            on_insert[key] = value
+        else:
+            set_fields[key] = value
+
+    update = {"$set": set_fields}
+    if on_insert:
+        update["$setOnInsert"] = on_insert
+    return update
+
 
 class MongoDB:
     """MongoDB connection manager."""
@@ -26,6 +136,14 @@ class MongoDB:
     pending_users_collection: Optional[AsyncCollection] = None
     upload_sessions_collection: Optional[AsyncCollection] = None
 
+    def __init__(self) -> None:
+        # email -> user document without the password hash
+        self._user_cache = TTLCache(USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE)
+        # sha256 -> True, for hashes known to have content
+        self._content_cache = TTLCache(CONTENT_CACHE_TTL_SECONDS, CONTENT_CACHE_MAX_SIZE)
+        # "ping" -> result of the last health check
+        self._health_cache = TTLCache(HEALTH_CHECK_CACHE_SECONDS, 1)
+
     async def connect(self) -> None:
         """Connect to MongoDB.
 
@@ -39,6 +157,10 @@ class MongoDB:
             self.client = AsyncMongoClient(
                 settings.mongodb_url,
                 serverSelectionTimeoutMS=5000,  # 5 second timeout
+                maxPoolSize=settings.mongodb_max_pool_size,
+                minPoolSize=settings.mongodb_min_pool_size,
+                maxIdleTimeMS=settings.mongodb_max_idle_time_ms,
+                waitQueueTimeoutMS=settings.mongodb_wait_queue_timeout_ms,
             )
 
             # Verify connection by pinging the server
@@ -51,33 +173,60 @@ class MongoDB:
             self.pending_users_collection = db["pending_users"]
             self.upload_sessions_collection = db["upload_sessions"]
 
-            # Create indexes on sha256 for efficient lookups
-            await self.collection.create_index("sha256")
-            await self.collection.create_index([("hostname", 1), ("filepath", 1)])
-            await self.collection.create_index("uploaded_by_user_id")
-            logger.info("File metadata indexes created successfully")
-
-            # Create indexes for API keys collection
             api_keys_collection = db["api_keys"]
-            await api_keys_collection.create_index("key_hash", unique=True)
-            await api_keys_collection.create_index([("is_active", 1)])
-            logger.info("API keys indexes created successfully")
-
-            # Create indexes for users collection
-            await self.users_collection.create_index("email", unique=True)
-            logger.info("Users indexes created successfully")
-
-            # Create indexes for pending_users collection
-            await self.pending_users_collection.create_index("confirmation_token", unique=True)
-            await self.pending_users_collection.create_index("email", unique=True)
-            await self.pending_users_collection.create_index("expires_at")  # For cleanup queries
-            logger.info("Pending users indexes created successfully")
-
-            # Create indexes for upload_sessions collection
-            await self.upload_sessions_collection.create_index("upload_id", unique=True)
-            await self.upload_sessions_collection.create_index("expires_at")  # For cleanup queries
-            await self.upload_sessions_collection.create_index("status")
-            logger.info("Upload sessions indexes created successfully")
+            indexes = [
+                # File metadata: sha256 (with sort keys) for efficient lookups
+                (
+                    self.collection,
+                    [
+                        FILE_SHA256_INDEX,
+                        FILE_LOCATION_INDEX,
+                        FILE_CONTENT_INDEX,
+                        IndexModel("uploaded_by_user_id"),
+                    ],
+                ),
+                (
+                    api_keys_collection,
+                    [IndexModel("key_hash", unique=True), IndexModel([("is_active", 1)])],
+                ),
+                (self.users_collection, [IndexModel("email", unique=True)]),
+                (
+                    self.pending_users_collection,
+                    [
+                        IndexModel("confirmation_token", unique=True),
+                        IndexModel("email", unique=True),
+                        IndexModel("expires_at"),  # For cleanup queries
+                    ],
+                ),
+                (
+                    self.upload_sessions_collection,
+                    [
+                        IndexModel("upload_id", unique=True),
+                        IndexModel("expires_at"),  # For cleanup queries
+                        IndexModel("status"),
+                    ],
+                ),
+            ]
+
+            # Creating an index is a round trip even when the index already
+            # exists, so list the existing indexes first (one round trip per
+            # collection, concurrently) and only create missing ones, with one
+            # createIndexes command per collection
+            existing = await asyncio.gather(
+                *(self._index_names(collection) for collection, _ in indexes)
+            )
+            await asyncio.gather(
+                *(
+                    self._create_indexes(
+                        collection,
+                        [model for model in models if model.document["name"] not in names],
+                    )
+                    for (collection, models), names in zip(indexes, existing, strict=True)
+                )
+            )
+            if any(name in existing[0] for name in OBSOLETE_FILE_INDEXES):
+                await self._drop_obsolete_indexes(self.collection)
+            logger.info("Database indexes created successfully")
 
         except ServerSelectionTimeoutError as e:
             logger.error(f"MongoDB connection timeout: {e}")
@@ -100,6 +249,74 @@ class MongoDB:
             self.collection = None
             raise ConnectionFailure(f"Unexpected error connecting to MongoDB: {e}") from e
 
+    @staticmethod
+    async def _index_names(collection: AsyncCollection) -> set[str]:
+        """Get the names of the indexes that exist on a collection.
+
+        Args:
+            collection: Collection to check
+
+        Returns:
+            Set of index names
+        """
+        cursor = await collection.list_indexes()
+        return {index["name"] async for index in cursor}
+
+    @staticmethod
+    async def _create_indexes(collection: AsyncCollection, models: list[IndexModel]) -> None:
+        """Create indexes on a collection with a single createIndexes command.
+
+        The unique file location index is created by a separate command, so
+        duplicate metadata records that prevent it from being built do not
+        fail the other indexes. That failure is logged rather than treated as
+        a connection failure.
+
+        Args:
+            collection: Collection to create the indexes on
+            models: Indexes to create
+        """
+        batch = [model for model in models if model is not FILE_LOCATION_INDEX]
+        if batch:
+            await collection.create_indexes(batch)
+
+        if len(batch) < len(models):
+            try:
+                await collection.create_indexes([FILE_LOCATION_INDEX])
+            except DuplicateKeyError as e:
+                logger.warning(
+                    "Could not create unique file location index, "
+                    f"duplicate metadata records exist: {e}"
+                )
+
+    @staticmethod
+    async def _drop_obsolete_indexes(collection: AsyncCollection) -> None:
+        """Drop obsolete file metadata indexes whose replacements exist.
+
+        Called once the replacement indexes have been created. An obsolete
+        index is kept if its replacement could not be built (e.g. the unique
+        file location index, while duplicate metadata records exist), so
+        lookups never lose their index. When several server workers start at
+        once another one may drop an index first, which counts as success.
+
+        Args:
+            collection: File metadata collection
+        """
+        names = await MongoDB._index_names(collection)
+        for name, replacement in OBSOLETE_FILE_INDEXES.items():
+            if name not in names:
+                continue
+            if replacement not in names:
+                logger.warning(
+                    f"Keeping index {name}, its replacement {replacement} does not exist"
+                )
+                continue
+            try:
+                await collection.drop_index(name)
+            except OperationFailure as e:
+                if e.code != INDEX_NOT_FOUND_CODE:
+                    raise
+            logger.info(f"Dropped obsolete index {name}")
+
     async def close(self) -> None:
         """Close MongoDB connection."""
         if self.client:
@@ -123,14 +340,31 @@ class MongoDB:
             logger.warning(f"Database health check failed: {e}")
             return False
 
+    async def is_healthy_cached(self) -> bool:
+        """Check if database connection is healthy, reusing a recent result.
+
+        Returns:
+            Result of the last is_healthy check if it is less than
+            HEALTH_CHECK_CACHE_SECONDS old, otherwise a fresh check
+        """
+        healthy: Optional[bool] = self._health_cache.get("ping")
+        if healthy is None:
+            healthy = await self.is_healthy()
+            self._health_cache.set("ping", healthy)
+        return healthy
+
     async def insert_file_metadata(self, data: dict) -> str:
-        """Insert file metadata into MongoDB.
+        """Insert or update file metadata in MongoDB.
+
+        Metadata is upserted on (hostname, filepath, sha256), so reporting the
+        same file again updates its record instead of adding a duplicate.
+        Stat fields left out of data keep their stored values.
 
         Args:
             data: File metadata dictionary
 
         Returns:
-            Inserted document ID
+            Document ID of the inserted or updated record
 
         Raises:
             RuntimeError: If database not connected
@@ -141,11 +375,16 @@ class MongoDB:
             raise RuntimeError("Database not connected")
 
         try:
-            # Make a copy to avoid modifying the input dict
-            # (insert_one adds an _id field to the dict)
-            data_copy = data.copy()
-            result = await self.collection.insert_one(data_copy)
-            return str(result.inserted_id)
+            result = await self.collection.find_one_and_update(
+                _file_location(data),
+                _file_upsert(data),
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            if result is None:
+                raise OperationFailure("File metadata upsert returned no document")
+            return str(result["_id"])
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Database connection lost during insert: {e}")
             raise ConnectionFailure("Lost connection to database") from e
@@ -153,11 +392,65 @@ class MongoDB:
             logger.error(f"Database operation failed during insert: {e}")
             raise
 
-    async def find_by_sha256(self, sha256: str) -> Optional[dict]:
+    async def insert_many_file_metadata(self, docs: list[dict]) -> list[str]:
+        """Insert or update several file metadata documents in one bulk write.
+
+        Upserts on (hostname, filepath, sha256) like insert_file_metadata.
+        IDs of records that already existed are looked up with one extra query.
+
+        Args:
+            docs: File metadata dictionaries
+
+        Returns:
+            Document IDs, in the same order as docs
+
+        Raises:
+            RuntimeError: If database not connected
+            ConnectionFailure: If database connection is lost
+            OperationFailure: If database operation fails
+        """
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+
+        if not docs:
+            return []
+
+        try:
+            result = await self.collection.bulk_write(
+                [UpdateOne(_file_location(doc), _file_upsert(doc), upsert=True) for doc in docs],
+                ordered=False,
+            )
+            doc_ids = {i: str(doc_id) for i, doc_id in (result.upserted_ids or {}).items()}
+
+            existing = [i for i in range(len(docs)) if i not in doc_ids]
+            if existing:
+                cursor = self.collection.find(
+                    {"$or": [_file_location(docs[i]) for i in existing]},
+                    projection={key: 1 for key in FILE_LOCATION_KEYS},
+                )
+                found = {
+                    tuple(doc.get(key) for key in FILE_LOCATION_KEYS): str(doc["_id"])
+                    async for doc in cursor
+                }
+                for i in existing:
+                    doc_ids[i] = found[tuple(docs[i].get(key) for key in FILE_LOCATION_KEYS)]
+
+            return [doc_ids[i] for i in range(len(docs))]
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"Database connection lost during bulk insert: {e}")
+            raise ConnectionFailure("Lost connection to database") from e
+        except OperationFailure as e:
+            logger.error(f"Database operation failed during bulk insert: {e}")
+            raise
+
+    async def find_by_sha256(
+        self, sha256: str, projection: Optional[dict] = None
+    ) -> Optional[dict]:
         """Find file metadata by SHA256 hash.
 
         Args:
             sha256: SHA256 hash to search for
+            projection: Fields to return (default: the whole document)
 
         Returns:
             File metadata document or None if not found
@@ -171,7 +464,7 @@ class MongoDB:
             raise RuntimeError("Database not connected")
 
         try:
-            return await self.collection.find_one({"sha256": sha256})
+            return await self.collection.find_one({"sha256": sha256}, projection=projection)
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Database connection lost during find: {e}")
             raise ConnectionFailure("Lost connection to database") from e
@@ -179,9 +472,33 @@ class MongoDB:
             logger.error(f"Database operation failed during find: {e}")
             raise
 
+    async def exists_by_sha256(self, sha256: str) -> bool:
+        """Check whether any file metadata exists for a SHA256 hash.
+
+        Only the sha256 field is projected, so the query is answered from the
+        sha256 index without fetching the document.
+
+        Args:
+            sha256: SHA256 hash to search for
+
+        Returns:
+            True if at least one record has this hash, False otherwise
+
+        Raises:
+            RuntimeError: If database not connected
+            ConnectionFailure: If database connection is lost
+            OperationFailure: If database operation fails
+        """
+        result = await self.find_by_sha256(sha256, projection={"_id": 0, "sha256": 1})
+        return result is not None
+
     async def has_file_content(self, sha256: str) -> bool:
         """Check if server already has file content for this SHA256.
 
+        Only the sha256 field is projected, so the query is answered from the
+        partial content index without fetching the document. Positive results
+        are cached briefly, since the server never removes stored content.
+
         Args:
             sha256: SHA256 hash to check
 
@@ -195,12 +512,49 @@ class MongoDB:
         if self.collection is None:
             raise RuntimeError("Database not connected")
 
+        if self._content_cache.get(sha256):
+            return True
+
         try:
             # Check if any document with this SHA256 has file content
             result = await self.collection.find_one(
-                {"sha256": sha256, "has_file_content": True}
+                {"sha256": sha256, "has_file_content": True},
+                projection={"_id": 0, "sha256": 1},
             )
-            return result is not None
+            if result is None:
+                return False
+            self._content_cache.set(sha256, True)
+            return True
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logger.error(f"Database connection lost during has_file_content check: {e}")
+            raise ConnectionFailure("Lost connection to database") from e
+        except OperationFailure as e:
+            logger.error(f"Database operation failed during has_file_content check: {e}")
+            raise
+
+    async def get_hashes_with_content(self, sha256s: list[str]) -> set[str]:
+        """Find which of several SHA256 hashes the server already has content for.
+
+        Args:
+            sha256s: SHA256 hashes to check
+
+        Returns:
+            The subset of sha256s that have file content
+
+        Raises:
+            RuntimeError: If database not connected
+            ConnectionFailure: If database connection is lost
+        """
+        if self.collection is None:
+            raise RuntimeError("Database not connected")
+
+        if not sha256s:
+            return set()
+
+        try:
+            return set(await self.collection.distinct(
+                "sha256", {"sha256": {"$in": list(sha256s)}, "has_file_content": True}
+            ))
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Database connection lost during has_file_content check: {e}")
             raise ConnectionFailure("Lost connection to database") from e
@@ -228,10 +582,8 @@ class MongoDB:
             raise RuntimeError("Database not connected")
 
         try:
-            from datetime import datetime
-
             result = await self.collection.update_one(
-                {"sha256": sha256, "hostname": hostname, "filepath": filepath},
+                _file_location({"hostname": hostname, "filepath": filepath, "sha256": sha256}),
                 {
                     "$set": {
                         "has_file_content": True,
@@ -240,6 +592,8 @@ class MongoDB:
                     }
                 },
             )
+            if result.matched_count:
+                self._content_cache.set(sha256, True)
             return result.modified_count > 0
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"Database connection lost during mark_file_uploaded: {e}")
@@ -267,14 +621,15 @@ class MongoDB:
             raise RuntimeError("Database not connected")
 
         try:
+            # Fetch the whole page in one batch; by default the first batch
+            # stops at 101 documents and the rest needs getMore round trips
             cursor = self.collection.find(
                 {"uploaded_by_user_id": user_id}
-            ).sort("created_at", -1).limit(limit).skip(skip)
+            ).sort("created_at", -1).limit(limit).skip(skip).batch_size(limit)
 
-            files = []
-            async for doc in cursor:
+            files = await cursor.to_list()
+            for doc in files:
                 doc["_id"] = str(doc["_id"])
-                files.append(doc)
 
             return files
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
@@ -301,23 +656,12 @@ class MongoDB:
             raise RuntimeError("Database not connected")
 
         try:
-            cursor = self.collection.find({"sha256": sha256})
+            cursor = self.collection.find({"sha256": sha256}).sort(FILE_SHA256_SORT[1:])
 
-            files = []
-            async for doc in cursor:
+            files = await cursor.to_list()
+            for doc in files:
                 doc["_id"] = str(doc["_id"])
-                files.append(doc)
-
-            # Sort: files with content first (by upload time), then metadata-only (by created time)
-            def sort_key(file):
-                if file.get("has_file_content"):
-                    # Files with content: sort by upload time (earliest first)
-                    return (0, file.get("file_uploaded_at", file.get("created_at")))
-                else:
-                    # Files without content: sort after files with content
-                    return (1, file.get("created_at"))
-
-            files.sort(key=sort_key)
+
             return files
 
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
@@ -352,8 +696,6 @@ class MongoDB:
         if self.users_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         user_data = {
             "email": email,
             "username": email,  # Use email as username
@@ -365,6 +707,7 @@ class MongoDB:
 
         try:
             result = await self.users_collection.insert_one(user_data)
+            self.invalidate_cached_user(email)
             return str(result.inserted_id)
         except DuplicateKeyError as e:
             if "email" in str(e):
@@ -385,6 +728,40 @@ class MongoDB:
 
         return await self.users_collection.find_one({"email": email})
 
+    async def get_cached_user_by_email(self, email: str) -> Optional[dict]:
+        """Get user by email, caching the result for a short time.
+
+        For authenticating requests. The password hash is not included, use
+        get_user_by_email to verify a password.
+
+        Args:
+            email: Email to search for
+
+        Returns:
+            User document without hashed_password, or None if not found
+        """
+        if self.users_collection is None:
+            raise RuntimeError("Database not connected")
+
+        user = self._user_cache.get(email)
+        if user is None:
+            user = await self.users_collection.find_one(
+                {"email": email}, projection={"hashed_password": 0}
+            )
+            if user is None:
+                return None
+            self._user_cache.set(email, user)
+
+        return dict(user)
+
+    def invalidate_cached_user(self, email: str) -> None:
+        """Drop a user from the get_cached_user_by_email cache.
+
+        Args:
+            email: Email of the user
+        """
+        self._user_cache.pop(email)
+
     # Admin dashboard methods
 
     async def get_all_users(self) -> list[dict]:
@@ -396,15 +773,14 @@ class MongoDB:
         if self.users_collection is None:
             raise RuntimeError("Database not connected")
 
-        users = []
         cursor = self.users_collection.find(
             {},
             {"hashed_password": 0}  # Exclude password hash
         ).sort("created_at", -1)
 
-        async for user in cursor:
+        users = await cursor.to_list()
+        for user in users:
             user["_id"] = str(user["_id"])
-            users.append(user)
 
         return users
 
@@ -417,15 +793,14 @@ class MongoDB:
         if self.pending_users_collection is None:
             raise RuntimeError("Database not connected")
 
-        pending_users = []
         cursor = self.pending_users_collection.find(
             {},
             {"hashed_password": 0}  # Exclude password hash
         ).sort("created_at", -1)
 
-        async for user in cursor:
+        pending_users = await cursor.to_list()
+        for user in pending_users:
             user["_id"] = str(user["_id"])
-            pending_users.append(user)
 
         return pending_users
 
@@ -504,8 +879,6 @@ class MongoDB:
         if self.pending_users_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         pending_user_data = {
             "email": email,
             "hashed_password": hashed_password,
@@ -563,8 +936,6 @@ class MongoDB:
         if self.pending_users_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         result = await self.pending_users_collection.delete_many({
             "expires_at": {"$lt": datetime.utcnow()}
         })
@@ -607,8 +978,7 @@ class MongoDB:
         if self.upload_sessions_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime, timedelta
-
+        now = datetime.utcnow()
         session_data = {
             "upload_id": upload_id,
             "filepath": filepath,
@@ -621,8 +991,8 @@ class MongoDB:
             "status": "initiated",  # initiated, uploading, completed, aborted, expired
             "storage_backend": storage_backend,
             "user_id": user_id,
-            "created_at": datetime.utcnow(),
-            "expires_at": datetime.utcnow() + timedelta(hours=1),
+            "created_at": now,
+            "expires_at": now + UPLOAD_SESSION_TTL,
             "completed_at": None,
         }
 
@@ -667,8 +1037,6 @@ class MongoDB:
         if self.upload_sessions_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         result = await self.upload_sessions_collection.update_one(
             {"upload_id": upload_id},
             {
@@ -698,8 +1066,6 @@ class MongoDB:
         if self.upload_sessions_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         result = await self.upload_sessions_collection.update_one(
             {"upload_id": upload_id},
             {
@@ -757,8 +1123,6 @@ class MongoDB:
         if self.upload_sessions_collection is None:
             raise RuntimeError("Database not connected")
 
-        from datetime import datetime
-
         result = await self.upload_sessions_collection.delete_many({
             "expires_at": {"$lt": datetime.utcnow()},
             "status": {"$ne": "completed"}
@@ -4,6 +4,7 @@ This module centralizes all dependency providers to avoid circular imports.
 Routers import from here instead of from main.py.
 """
 
+import re
 from pathlib import Path
 
 from fastapi import Depends, HTTPException, status
@@ -17,17 +18,27 @@ from .user_auth import decode_access_token
 # JWT bearer token scheme
 security = HTTPBearer()
 
+# SHA256 path parameters, matching the pattern FileMetadata.sha256 enforces
+SHA256_PATTERN = re.compile(r"[a-f0-9]{64}")
+
 # Global storage backend instance (set by main.py during lifespan)
 storage_backend: StorageBackend | None = None
 
 
-def get_db() -> MongoDB:
-    """Get database instance - dependency injection."""
+async def get_db() -> MongoDB:
+    """Get database instance - dependency injection.
+
+    Declared async so FastAPI calls it directly; sync dependencies are run
+    in the threadpool on every request.
+    """
     return database.mongodb
 
 
-def get_storage() -> StorageBackend:
-    """Get storage backend instance - dependency injection."""
+async def get_storage() -> StorageBackend:
+    """Get storage backend instance - dependency injection.
+
+    Declared async so FastAPI calls it directly, like get_db.
+    """
     if storage_backend is None:
         raise RuntimeError("Storage backend not initialized")
     return storage_backend
@@ -62,8 +73,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = await db.get_user_by_email(email)
+    # Get user from database (cached briefly, as this runs on every request)
+    user = await db.get_cached_user_by_email(email)
 
     if user is None:
         raise HTTPException(
@@ -104,6 +115,25 @@ async def get_current_admin_user(
     return current_user
 
 
+def validate_sha256(sha256: str) -> None:
+    """Reject a SHA256 path parameter that is not 64 lowercase hex characters.
+
+    Checked before any database or storage access, as the hash is used to
+    build storage paths.
+
+    Args:
+        sha256: SHA256 hash from the request path
+
+    Raises:
+        HTTPException: If the hash is malformed
+    """
+    if not SHA256_PATTERN.fullmatch(sha256):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="SHA256 hash must be exactly 64 characters (lowercase hex)",
+        )
+
+
 def get_chunk_storage_dir() -> Path:
     """Get directory for temporary chunk storage."""
     chunk_dir = Path("/tmp/putplace_chunks")
@@ -163,6 +163,69 @@ async def ensure_admin_exists(db: MongoDB) -> None:
         # Don't raise - allow app to start even if admin creation fails
 
 
+def check_storage_directory(storage_path: Path) -> None:
+    """Ensure the local storage directory exists and is writable.
+
+    Creates the directory if needed, then writes and removes a test file.
+
+    Args:
+        storage_path: Resolved local storage directory
+
+    Raises:
+        RuntimeError: If the directory cannot be created or written to
+    """
+    # Create directory if it doesn't exist
+    if not storage_path.exists():
+        try:
+            storage_path.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Created storage directory: {storage_path}")
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to create storage directory: {storage_path}\n"
+                f"Error: {e}\n"
+                f"Please ensure the parent directory is writable or create it manually."
+            )
+
+    if not storage_path.is_dir():
+        raise RuntimeError(
+            f"Storage path is not a directory: {storage_path}\n"
+            f"Please ensure STORAGE_PATH points to a valid directory."
+        )
+
+    # Test write permission by creating and removing a test file
+    test_filename = f".write_test_{uuid.uuid4().hex}"
+    test_file = storage_path / test_filename
+
+    # Ensure test file doesn't already exist (extremely unlikely with UUID)
+    if test_file.exists():
+        raise RuntimeError(
+            f"Test file unexpectedly exists: {test_file}\n"
+            f"Please remove it and restart the server."
+        )
+
+    try:
+        test_file.write_text("test")
+        test_file.unlink()
+        logger.info(f"Storage directory write test successful: {storage_path}")
+    except PermissionError as e:
+        raise RuntimeError(
+            f"Cannot write to storage directory: {storage_path}\n"
+            f"Error: {e}\n"
+            f"Please check directory permissions or update STORAGE_PATH in your .env file."
+        ) from e
+    except Exception as e:
+        # Clean up test file if it was created
+        if test_file.exists():
+            try:
+                test_file.unlink()
+            except:
+                pass
+        raise RuntimeError(
+            f"Failed to write to storage directory: {storage_path}\n"
+            f"Error: {e}"
+        ) from e
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application lifespan events."""
@@ -193,60 +256,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             logger.info(f"Initialized local storage backend at {settings.storage_path}")
 
             # Test write access to storage directory
-            from pathlib import Path
-            storage_path = Path(settings.storage_path).resolve()
-
-            # Create directory if it doesn't exist
-            if not storage_path.exists():
-                try:
-                    storage_path.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"Created storage directory: {storage_path}")
-                except Exception as e:
-                    raise RuntimeError(
-                        f"Failed to create storage directory: {storage_path}\n"
-                        f"Error: {e}\n"
-                        f"Please ensure the parent directory is writable or create it manually."
-                    )
-
-            if not storage_path.is_dir():
-                raise RuntimeError(
-                    f"Storage path is not a directory: {storage_path}\n"
-                    f"Please ensure STORAGE_PATH points to a valid directory."
-                )
-
-            # Test write permission by creating and removing a test file
-            import uuid
-            test_filename = f".write_test_{uuid.uuid4().hex}"
-            test_file = storage_path / test_filename
-
-            # Ensure test file doesn't already exist (extremely unlikely with UUID)
-            if test_file.exists():
-                raise RuntimeError(
-                    f"Test file unexpectedly exists: {test_file}\n"
-                    f"Please remove it and restart the server."
-                )
-
-            try:
-                test_file.write_text("test")
-                test_file.unlink()
-                logger.info(f"Storage directory write test successful: {storage_path}")
-            except PermissionError as e:
-                raise RuntimeError(
-                    f"Cannot write to storage directory: {storage_path}\n"
-                    f"Error: {e}\n"
-                    f"Please check directory permissions or update STORAGE_PATH in your .env file."
-                ) from e
-            except Exception as e:
-                # Clean up test file if it was created
-                if test_file.exists():
-                    try:
-                        test_file.unlink()
-                    except:
-                        pass
-                raise RuntimeError(
-                    f"Failed to write to storage directory: {storage_path}\n"
-                    f"Error: {e}"
-                ) from e
+            check_storage_directory(Path(settings.storage_path).resolve())
 
         elif settings.storage_backend == "s3":
             if not settings.s3_bucket_name:
@@ -393,9 +403,13 @@ app.include_router(admin_router)
 
 
 @app.get("/health", tags=["health"])
-async def health(db: MongoDB = Depends(get_db)) -> dict[str, str | dict]:
-    """Health check endpoint with database connectivity check."""
-    db_healthy = await db.is_healthy()
+async def health(db: MongoDB = Depends(get_db), fresh: bool = False) -> dict[str, str | dict]:
+    """Health check endpoint with database connectivity check.
+
+    The database ping result is reused for a few seconds; pass fresh=true to
+    force a new ping.
+    """
+    db_healthy = await (db.is_healthy() if fresh else db.is_healthy_cached())
 
     if db_healthy:
         return {
@@ -1,18 +1,41 @@
 """File operations router for PutPlace API."""
 
 import logging
+from typing import AsyncIterator
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
 
 from ..database import MongoDB
-from ..dependencies import get_db, get_storage, get_current_user
+from ..dependencies import get_db, get_storage, get_current_user, validate_sha256
 from ..models import FileMetadata, FileMetadataResponse, FileMetadataUploadResponse
-from ..storage import StorageBackend
+from ..storage import ContentHashMismatchError, StorageBackend
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["files"])
 
+# Maximum number of metadata documents accepted by one /put_files request
+MAX_BATCH_SIZE = 1000
+
+
+def _upload_response(data: dict, doc_id: str, has_content: bool) -> FileMetadataUploadResponse:
+    """Build the response for stored metadata, saying whether content is needed.
+
+    Args:
+        data: Stored file metadata
+        doc_id: MongoDB document ID
+        has_content: Whether the server already has content for this SHA256
+
+    Returns:
+        Stored metadata with upload requirement information
+    """
+    # Skip upload requirement for 0-byte files (no content to upload)
+    upload_required = not has_content and data["file_size"] != 0
+    upload_url = f"/upload_file/{data['sha256']}" if upload_required else None
+    return FileMetadataUploadResponse(
+        **data, _id=doc_id, upload_required=upload_required, upload_url=upload_url
+    )
+
 
 @router.post(
     "/put_file",
@@ -53,20 +76,73 @@ async def put_file(
         # Insert into MongoDB
         doc_id = await db.insert_file_metadata(data)
 
-        # Determine if upload is required
-        # Skip upload requirement for 0-byte files (no content to upload)
-        is_zero_byte_file = file_metadata.file_size == 0
-        upload_required = not has_content and not is_zero_byte_file
-        upload_url = None
-        if upload_required:
-            # Provide the upload URL
-            upload_url = f"/upload_file/{file_metadata.sha256}"
-
         # Return response with ID and upload information
-        return FileMetadataUploadResponse(
-            **data, _id=doc_id, upload_required=upload_required, upload_url=upload_url
+        return _upload_response(data, doc_id, has_content)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to store file metadata: {str(e)}",
+        ) from e
+
+
+@router.post(
+    "/put_files",
+    response_model=list[FileMetadataUploadResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def put_files(
+    files_metadata: list[FileMetadata],
+    db: MongoDB = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+) -> list[FileMetadataUploadResponse]:
+    """Store metadata for many files in one request.
+
+    Behaves like /put_file for each entry, but checks existing content and
+    inserts all documents with one database round trip each, so a client
+    scanning many small files is not bound by per-file request latency.
+
+    Requires authentication via JWT Bearer token.
+
+    Args:
+        files_metadata: List of file metadata entries (at most MAX_BATCH_SIZE)
+        db: Database instance (injected)
+        current_user: Current authenticated user (injected)
+
+    Returns:
+        Stored file metadata with IDs and upload requirement information, in request order
+
+    Raises:
+        HTTPException: If the batch is too large, database operation fails or authentication fails
+    """
+    if len(files_metadata) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch too large: {len(files_metadata)} entries (maximum {MAX_BATCH_SIZE})",
         )
 
+    try:
+        # Check which SHA256s already have content in a single query
+        has_content = await db.get_hashes_with_content(
+            list({file_metadata.sha256 for file_metadata in files_metadata})
+        )
+
+        user_id = str(current_user.get("_id"))
+        email = current_user.get("email")
+        docs = []
+        for file_metadata in files_metadata:
+            data = file_metadata.model_dump()
+            data["uploaded_by_user_id"] = user_id
+            data["uploaded_by_email"] = email
+            docs.append(data)
+
+        doc_ids = await db.insert_many_file_metadata(docs)
+
+        return [
+            _upload_response(data, doc_id, data["sha256"] in has_content)
+            for data, doc_id in zip(docs, doc_ids, strict=True)
+        ]
+
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,11 +174,7 @@ async def get_file(
     Raises:
         HTTPException: If file not found, invalid hash, or authentication fails
     """
-    if len(sha256) != 64:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="SHA256 hash must be exactly 64 characters",
-        )
+    validate_sha256(sha256)
 
     result = await db.find_by_sha256(sha256)
 
@@ -156,29 +228,27 @@ async def upload_file(
     Raises:
         HTTPException: If validation fails, database operation fails, or authentication fails
     """
-    import hashlib
+    validate_sha256(sha256)
 
-    if len(sha256) != 64:
+    # Reject content for unregistered hashes before streaming the body
+    if not await db.exists_by_sha256(sha256):
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="SHA256 hash must be exactly 64 characters",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No metadata found for sha256={sha256}",
         )
 
     # Streaming chunk size: 1MB chunks for efficient memory usage
     CHUNK_SIZE = 1024 * 1024  # 1MB
 
-    # Hash calculator for incremental SHA256
-    hash_calculator = hashlib.sha256()
     total_size = 0
 
-    async def streaming_hash_generator():
-        """Async generator that reads file in chunks and calculates hash incrementally."""
+    async def read_chunks() -> AsyncIterator[bytes]:
+        """Async generator that reads the uploaded file in chunks."""
         nonlocal total_size
         while True:
             chunk = await file.read(CHUNK_SIZE)
             if not chunk:
                 break
-            hash_calculator.update(chunk)
             total_size += len(chunk)
             yield chunk
 
@@ -191,12 +261,17 @@ async def upload_file(
             f"expected size: {content_length} bytes"
         )
 
-        # Store file content using streaming
-        stored = await storage.store_stream(
-            sha256,
-            streaming_hash_generator(),
-            content_length,
-        )
+        # Store file content using streaming. The backend hashes the content
+        # and only commits it if it matches, so a bad upload never touches
+        # content already stored under this hash.
+        try:
+            stored = await storage.store_stream(sha256, read_chunks(), content_length)
+        except ContentHashMismatchError as e:
+            logger.error(f"SHA256 mismatch for upload: expected {sha256}, got {e.actual}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File content SHA256 ({e.actual}) does not match provided hash ({sha256})",
+            ) from e
 
         if not stored:
             raise HTTPException(
@@ -204,25 +279,6 @@ async def upload_file(
                 detail="Failed to store file content",
             )
 
-        # Verify hash after streaming completes
-        calculated_hash = hash_calculator.hexdigest()
-
-        if calculated_hash != sha256:
-            # Hash mismatch - delete the stored file
-            logger.error(
-                f"SHA256 mismatch for upload: expected {sha256}, got {calculated_hash}"
-            )
-            try:
-                await storage.delete(sha256)
-                logger.info(f"Deleted mismatched file: {sha256}")
-            except Exception as delete_error:
-                logger.error(f"Failed to delete mismatched file {sha256}: {delete_error}")
-
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File content SHA256 ({calculated_hash}) does not match provided hash ({sha256})",
-            )
-
         logger.info(f"File upload verified for SHA256: {sha256}, size: {total_size} bytes")
 
         # Get the storage path where file was stored
@@ -321,11 +377,7 @@ async def get_clones(
     Raises:
         HTTPException: If validation fails or database operation fails
     """
-    if len(sha256) != 64:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="SHA256 hash must be exactly 64 characters",
-        )
+    validate_sha256(sha256)
 
     try:
         # Get all files with this SHA256 across all users
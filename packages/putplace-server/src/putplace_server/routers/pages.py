@@ -1,6 +1,9 @@
 """HTML page routes for PutPlace web interface."""
 
-from fastapi import APIRouter
+import gzip
+import hashlib
+
+from fastapi import APIRouter, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
 
 from ..config import settings
@@ -15,10 +18,114 @@ from ..templates import (
 router = APIRouter(tags=["pages"])
 
 
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a gzipped response.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        True if gzip, or "*" when gzip is not listed, has a non-zero q-value
+    """
+    qvalues = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+
+    if "gzip" in qvalues:
+        return qvalues["gzip"] > 0
+    return qvalues.get("*", 0.0) > 0
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check whether an If-None-Match header matches an ETag.
+
+    Uses the weak comparison If-None-Match calls for, so W/ prefixes are
+    ignored; "*" matches any ETag.
+
+    Args:
+        if_none_match: If-None-Match header value (a comma-separated list)
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class StaticPage:
+    """An HTML page rendered once, with a gzipped copy and ETags.
+
+    Browsers revalidate the page on each visit (Cache-Control: no-cache) and
+    get an empty 304 while it is unchanged, so a new release is picked up
+    immediately.
+    """
+
+    def __init__(self, html: str):
+        """Render the page.
+
+        Args:
+            html: Page HTML
+        """
+        self.body = html.encode("utf-8")
+        self.gzip_body = gzip.compress(self.body, compresslevel=6)
+        digest = hashlib.blake2b(self.body, digest_size=8).hexdigest()
+        # The gzipped representation has different bytes, so its own ETag
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def response(self, request: Request) -> Response:
+        """Build the response to a request for this page.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            304 if the client's copy is current, otherwise the page,
+            gzipped if the client accepts it
+        """
+        use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+        etag = self.gzip_etag if use_gzip else self.etag
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if _etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return HTMLResponse(self.gzip_body, headers=headers)
+        return HTMLResponse(self.body, headers=headers)
+
+
+# These pages do not change between requests, so they are rendered once
+HOME_PAGE = StaticPage(get_home_page(settings.api_version))
+LOGIN_PAGE = StaticPage(get_login_page())
+REGISTER_PAGE = StaticPage(get_register_page())
+MY_FILES_PAGE = StaticPage(get_my_files_page())
+
+
 @router.get("/", response_class=HTMLResponse)
-async def root() -> str:
+async def root(request: Request) -> Response:
     """Root endpoint - Home page."""
-    return get_home_page(settings.api_version)
+    return HOME_PAGE.response(request)
 
 
 @router.get("/downloads")
@@ -28,15 +135,15 @@ async def downloads_page() -> RedirectResponse:
 
 
 @router.get("/login", response_class=HTMLResponse)
-async def login_page() -> str:
+async def login_page(request: Request) -> Response:
     """Login page."""
-    return get_login_page()
+    return LOGIN_PAGE.response(request)
 
 
 @router.get("/register", response_class=HTMLResponse)
-async def register_page() -> str:
+async def register_page(request: Request) -> Response:
     """Registration page."""
-    return get_register_page()
+    return REGISTER_PAGE.response(request)
 
 
 @router.get("/awaiting-confirmation", response_class=HTMLResponse)
@@ -46,6 +153,6 @@ async def awaiting_confirmation_page(email: str = "") -> str:
 
 
 @router.get("/my_files", response_class=HTMLResponse)
-async def my_files_page() -> str:
+async def my_files_page(request: Request) -> Response:
     """Display the user's uploaded files."""
-    return get_my_files_page()
+    return MY_FILES_PAGE.response(request)
@@ -1,16 +1,24 @@
 """Chunked upload operations router for PutPlace API."""
 
+import asyncio
 import hashlib
 import logging
 import os
 import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from fastapi import APIRouter, Body, Depends, File, HTTPException, Request, UploadFile, status
 
 from ..database import MongoDB
-from ..dependencies import get_db, get_storage, get_current_user, get_chunk_storage_dir
+from ..dependencies import (
+    get_chunk_storage_dir,
+    get_current_user,
+    get_db,
+    get_storage,
+    validate_sha256,
+)
 from ..models import (
     ChunkUploadResponse,
     FileDeletionNotification,
@@ -20,12 +28,64 @@ from ..models import (
     UploadSessionInitiate,
     UploadSessionResponse,
 )
-from ..storage import StorageBackend
+from ..storage import ContentHashMismatchError, StorageBackend
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/uploads", tags=["chunked_uploads"])
 
+# Buffer size used when concatenating chunk files (1MB)
+ASSEMBLY_BUFFER_SIZE = 1024 * 1024
+
+
+def _assemble_chunks(chunk_dir: Path, total_chunks: int, final_file_path: Path) -> str:
+    """Concatenate chunk files into one file, hashing the data as it is copied.
+
+    Chunks are copied through a single reused buffer so that neither a whole
+    chunk nor the assembled file is held in memory. This does blocking I/O and
+    is meant to run in a worker thread.
+
+    Args:
+        chunk_dir: Directory holding the chunk_NNNNNN files
+        total_chunks: Number of chunks to concatenate
+        final_file_path: Path of the assembled file to write
+
+    Returns:
+        SHA256 hex digest of the assembled content
+
+    Raises:
+        FileNotFoundError: If a chunk file is missing
+    """
+    hash_calculator = hashlib.sha256()
+    buffer = bytearray(ASSEMBLY_BUFFER_SIZE)
+    view = memoryview(buffer)
+
+    with open(final_file_path, "wb") as final_file:
+        for i in range(total_chunks):
+            with open(chunk_dir / f"chunk_{i:06d}", "rb") as chunk_file:
+                while n := chunk_file.readinto(buffer):
+                    hash_calculator.update(view[:n])
+                    final_file.write(view[:n])
+
+    return hash_calculator.hexdigest()
+
+
+async def _iter_file(
+    file_path: Path, chunk_size: int = ASSEMBLY_BUFFER_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a file's content in chunks, reading in a worker thread.
+
+    Args:
+        file_path: File to read
+        chunk_size: Maximum size of each chunk
+
+    Yields:
+        Successive chunks of the file
+    """
+    with open(file_path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
 
 @router.post("/initiate", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
 async def initiate_upload(
@@ -45,13 +105,41 @@ async def initiate_upload(
         storage: Storage backend (injected)
         current_user: Current authenticated user (injected)
 
+    If the server already has content for this SHA256, no session is created:
+    the metadata is recorded against the existing content and 409 Conflict is
+    returned, so the client can skip sending any chunks.
+
     Returns:
         Upload session information with upload_id
 
     Raises:
-        HTTPException: If validation fails or session creation fails
+        HTTPException: 409 if the content is already stored, or if validation
+            fails or session creation fails
     """
     try:
+        # Skip the transfer entirely when the content is already stored
+        if await db.has_file_content(request.sha256):
+            # Only the location and content are known here; stat fields are
+            # left out so an existing record keeps its real values
+            now = datetime.utcnow()
+            await db.insert_file_metadata({
+                "filepath": request.filepath,
+                "hostname": request.hostname,
+                "sha256": request.sha256,
+                "file_size": request.file_size,
+                "has_file_content": True,
+                "file_uploaded_at": now,
+                "storage_path": storage.get_storage_path(request.sha256),
+                "uploaded_by_user_id": str(current_user.get("_id")),
+                "uploaded_by_email": current_user.get("email"),
+                "created_at": now,
+            })
+            logger.info(f"Content already stored, skipping upload: {request.sha256}")
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="File content already exists"
+            )
+
         # Generate unique upload ID
         upload_id = str(uuid.uuid4())
 
@@ -96,6 +184,8 @@ async def initiate_upload(
             message="Upload session created successfully"
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to initiate upload: {e}")
         raise HTTPException(
@@ -143,7 +233,6 @@ async def upload_chunk(
             )
 
         # Check if session expired
-        from datetime import datetime
         if session["expires_at"] < datetime.utcnow():
             raise HTTPException(
                 status_code=status.HTTP_410_GONE,
@@ -301,24 +390,19 @@ async def complete_upload(
             chunk_dir = get_chunk_storage_dir() / upload_id
             final_file_path = chunk_dir / "assembled_file"
 
-            # Calculate SHA256 while assembling
-            hash_calculator = hashlib.sha256()
-
-            with open(final_file_path, "wb") as final_file:
-                for i in range(session["total_chunks"]):
-                    chunk_file = chunk_dir / f"chunk_{i:06d}"
-                    if not chunk_file.exists():
-                        raise HTTPException(
-                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail=f"Chunk file {i} missing"
-                        )
-
-                    chunk_data = chunk_file.read_bytes()
-                    hash_calculator.update(chunk_data)
-                    final_file.write(chunk_data)
+            # Calculate SHA256 while assembling, off the event loop
+            try:
+                calculated_hash = await asyncio.to_thread(
+                    _assemble_chunks, chunk_dir, session["total_chunks"], final_file_path
+                )
+            except FileNotFoundError as e:
+                final_file_path.unlink(missing_ok=True)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Chunk file missing: {Path(e.filename).name}"
+                ) from e
 
             # Verify final SHA256
-            calculated_hash = hash_calculator.hexdigest()
             if calculated_hash != session["sha256"]:
                 # Hash mismatch - delete assembled file
                 final_file_path.unlink(missing_ok=True)
@@ -329,10 +413,18 @@ async def complete_upload(
 
             logger.info(f"SHA256 verified for upload {upload_id}: {calculated_hash}")
 
-            # Store final file using storage backend
-            with open(final_file_path, "rb") as f:
-                file_data = f.read()
-                stored = await storage.store(session["sha256"], file_data)
+            # Stream final file into the storage backend
+            try:
+                stored = await storage.store_stream(
+                    session["sha256"],
+                    _iter_file(final_file_path),
+                    session["file_size"],
+                )
+            except ContentHashMismatchError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"SHA256 mismatch: expected {e.expected}, got {e.actual}"
+                ) from e
 
             if not stored:
                 raise HTTPException(
@@ -353,27 +445,22 @@ async def complete_upload(
         # Get storage path
         storage_path = storage.get_storage_path(session["sha256"])
 
-        # Create file metadata entry
-        from ..models import FileMetadata
-        file_metadata = FileMetadata(
-            filepath=session["filepath"],
-            hostname=session["hostname"],
-            ip_address="",  # Not provided in chunked upload
-            sha256=session["sha256"],
-            file_size=session["file_size"],
-            file_mode=0,
-            file_uid=0,
-            file_gid=0,
-            file_mtime=0.0,
-            file_atime=0.0,
-            file_ctime=0.0,
-            has_file_content=True,
-            storage_path=storage_path,
-            uploaded_by_user_id=str(current_user.get("_id")),
-        )
-
-        # Insert file metadata
-        file_id = await db.insert_file_metadata(file_metadata.model_dump())
+        # Record the content against the file's metadata. A chunked upload
+        # does not know the file's stat fields, so they are left out and an
+        # existing record keeps its real values.
+        now = datetime.utcnow()
+        file_id = await db.insert_file_metadata({
+            "filepath": session["filepath"],
+            "hostname": session["hostname"],
+            "sha256": session["sha256"],
+            "file_size": session["file_size"],
+            "has_file_content": True,
+            "file_uploaded_at": now,
+            "storage_path": storage_path,
+            "uploaded_by_user_id": str(current_user.get("_id")),
+            "uploaded_by_email": current_user.get("email"),
+            "created_at": now,
+        })
 
         # Mark upload session as completed
         await db.complete_upload_session(upload_id)
@@ -493,11 +580,7 @@ async def delete_file_notification(
     Raises:
         HTTPException: If file not found or validation fails
     """
-    if len(sha256) != 64:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="SHA256 hash must be exactly 64 characters"
-        )
+    validate_sha256(sha256)
 
     try:
         # Mark file as deleted
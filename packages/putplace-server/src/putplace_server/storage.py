@@ -1,9 +1,13 @@
 """Storage backend abstraction for file content storage."""
 
+import asyncio
+import hashlib
 import logging
+import os
+import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, BinaryIO, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +15,27 @@ logger = logging.getLogger(__name__)
 DEFAULT_CHUNK_SIZE = 1024 * 1024
 
 
+class ContentHashMismatchError(ValueError):
+    """Streamed content does not hash to the SHA256 it was stored under."""
+
+    def __init__(self, expected: str, actual: str):
+        """Initialize the error.
+
+        Args:
+            expected: SHA256 the content was stored under
+            actual: SHA256 of the content received
+        """
+        super().__init__(f"Content SHA256 {actual} does not match expected {expected}")
+        self.expected = expected
+        self.actual = actual
+
+
+def _write_and_hash(f: BinaryIO, hasher: "hashlib._Hash", chunk: bytes) -> None:
+    """Write a chunk to a file and add it to a running hash."""
+    f.write(chunk)
+    hasher.update(chunk)
+
+
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
 
@@ -37,7 +62,9 @@ class StorageBackend(ABC):
         """Store file content from an async stream.
 
         This method supports large files by streaming chunks instead of
-        loading the entire file into memory.
+        loading the entire file into memory. The content is hashed as it
+        streams and only committed under sha256 if the hashes match, so a bad
+        upload never replaces content already stored.
 
         Args:
             sha256: SHA256 hash of the file (used as key)
@@ -46,6 +73,10 @@ class StorageBackend(ABC):
 
         Returns:
             True if stored successfully, False otherwise
+
+        Raises:
+            ContentHashMismatchError: If the content does not hash to sha256;
+                nothing is stored
         """
         pass
 
@@ -162,6 +193,12 @@ class LocalStorage(StorageBackend):
     ) -> bool:
         """Store file content from an async stream to local filesystem.
 
+        Chunks are written to a temporary file next to the final path and
+        hashed, off the event loop. The file is renamed into place only once
+        the stream has ended and its hash matches sha256. An interrupted or
+        mismatched upload therefore never leaves a partial file at the final
+        path, nor replaces content already stored there.
+
         Args:
             sha256: SHA256 hash of the file
             stream: Async iterator yielding file content chunks
@@ -169,20 +206,31 @@ class LocalStorage(StorageBackend):
 
         Returns:
             True if stored successfully, False otherwise
+
+        Raises:
+            ContentHashMismatchError: If the content does not hash to sha256
         """
+        file_path = self._get_file_path(sha256)
+        temp_path = file_path.with_name(f".{sha256}.{uuid.uuid4().hex}.tmp")
         try:
-            file_path = self._get_file_path(sha256)
-
             # Create parent directory if it doesn't exist
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
             bytes_written = 0
-            # Write chunks to file
-            with open(file_path, "wb") as f:
+            hasher = hashlib.sha256()
+            # Write chunks to the temporary file
+            with open(temp_path, "wb") as f:
                 async for chunk in stream:
-                    f.write(chunk)
+                    await asyncio.to_thread(_write_and_hash, f, hasher, chunk)
                     bytes_written += len(chunk)
 
+            actual = hasher.hexdigest()
+            if actual != sha256:
+                temp_path.unlink(missing_ok=True)
+                raise ContentHashMismatchError(sha256, actual)
+
+            os.replace(temp_path, file_path)
+
             logger.info(f"Stored file (streaming): {sha256} ({bytes_written} bytes) at {file_path}")
             return True
 
@@ -190,9 +238,7 @@ class LocalStorage(StorageBackend):
             logger.error(f"Failed to store file {sha256} (streaming): {e}")
             # Clean up partial file if it exists
             try:
-                file_path = self._get_file_path(sha256)
-                if file_path.exists():
-                    file_path.unlink()
+                temp_path.unlink(missing_ok=True)
             except Exception:
                 pass
             return False
@@ -400,6 +446,8 @@ class S3Storage(StorageBackend):
 
         Uses S3 multipart upload for efficient streaming of large files.
         Parts are uploaded as soon as we have 5MB+ of data (S3 minimum part size).
+        The upload is only completed if the content hashes to sha256; otherwise
+        it is aborted and the existing object, if any, is left in place.
 
         Args:
             sha256: SHA256 hash of the file
@@ -408,6 +456,9 @@ class S3Storage(StorageBackend):
 
         Returns:
             True if stored successfully, False otherwise
+
+        Raises:
+            ContentHashMismatchError: If the content does not hash to sha256
         """
         # S3 multipart upload minimum part size is 5MB (except last part)
         MIN_PART_SIZE = 5 * 1024 * 1024  # 5MB
@@ -430,8 +481,10 @@ class S3Storage(StorageBackend):
                 part_number = 1
                 buffer = bytearray()
                 total_uploaded = 0
+                hasher = hashlib.sha256()
 
                 async for chunk in stream:
+                    hasher.update(chunk)
                     buffer.extend(chunk)
 
                     # Upload part when buffer exceeds minimum part size
@@ -474,6 +527,10 @@ class S3Storage(StorageBackend):
                     })
                     total_uploaded += len(buffer)
 
+                actual = hasher.hexdigest()
+                if actual != sha256:
+                    raise ContentHashMismatchError(sha256, actual)
+
                 # Complete multipart upload
                 await s3.complete_multipart_upload(
                     Bucket=self.bucket_name,
@@ -502,6 +559,8 @@ class S3Storage(StorageBackend):
                     logger.info(f"Aborted multipart upload for {sha256}")
                 except Exception as abort_error:
                     logger.error(f"Failed to abort multipart upload for {sha256}: {abort_error}")
+            if isinstance(e, ContentHashMismatchError):
+                raise
             return False
 
     async def retrieve(self, sha256: str) -> Optional[bytes]:
@@ -305,6 +305,10 @@ def get_home_page(api_version: str) -> str:
                             <span class="method method-post">POST</span>
                             <code>/put_file</code> - Store file metadata
                         </li>
+                        <li>
+                            <span class="method method-post">POST</span>
+                            <code>/put_files</code> - Store metadata for many files at once
+                        </li>
                         <li>
                             <span class="method method-get">GET</span>
                             <code>/get_file/{{sha256}}</code> - Retrieve file by SHA256 hash
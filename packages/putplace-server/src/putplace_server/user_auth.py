@@ -1,5 +1,7 @@
 """User authentication utilities."""
 
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -7,6 +9,7 @@ from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 from jose import JWTError, jwt
 
+from .cache import TTLCache
 from .config import settings
 
 # Password hashing using Argon2
@@ -21,6 +24,14 @@ def get_access_token_expire_minutes() -> int:
 # For backward compatibility with existing code
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.jwt_access_token_expire_minutes
 
+# Decoded tokens are cached so that requests reusing a bearer token skip
+# signature verification. An entry never outlives the token's own expiry.
+TOKEN_CACHE_TTL_SECONDS = 30.0
+TOKEN_CACHE_MAX_SIZE = 10_000
+
+# SHA-256 digest of the token -> email
+_token_cache = TTLCache(TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_MAX_SIZE)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -49,10 +60,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def decode_access_token(token: str) -> Optional[str]:
-    """Decode a JWT token and return the email."""
+    """Decode a JWT token and return the email.
+
+    Valid tokens are cached, keyed by their hash rather than the raw token.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    email: Optional[str] = _token_cache.get(key)
+    if email is not None:
+        return email
+
     try:
         payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        email: str = payload.get("sub")
-        return email
     except JWTError:
         return None
+
+    email = payload.get("sub")
+    if email is not None:
+        expires_at = payload.get("exp")
+        ttl = TOKEN_CACHE_TTL_SECONDS
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl > 0:
+            _token_cache.set(key, email, ttl=ttl)
+    return email
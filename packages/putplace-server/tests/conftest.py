@@ -215,8 +215,16 @@ async def test_db(test_settings: Settings) -> AsyncGenerator[MongoDB, None]:
     await api_keys_collection.drop()
 
     # Create indexes for file metadata
-    await db.collection.create_index("sha256")
-    await db.collection.create_index([("hostname", 1), ("filepath", 1)])
+    await db.collection.create_index(
+        [("sha256", 1), ("has_file_content", -1), ("file_uploaded_at", 1), ("created_at", 1)]
+    )
+    await db.collection.create_index(
+        [("hostname", 1), ("filepath", 1), ("sha256", 1)], unique=True
+    )
+    await db.collection.create_index(
+        [("sha256", 1), ("has_file_content", 1)],
+        partialFilterExpression={"has_file_content": True},
+    )
 
     # Create indexes for users collection
     await db.users_collection.create_index("email", unique=True)
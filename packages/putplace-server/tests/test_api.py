@@ -80,6 +80,29 @@ async def test_put_file_missing_field(client: AsyncClient, sample_file_metadata,
     assert response.status_code == 422  # Validation error
 
 
+@pytest.mark.asyncio
+async def test_put_files_batch(client: AsyncClient, sample_file_metadata, test_user_token: str):
+    """Test storing metadata for several files in one request."""
+    empty_file = {**sample_file_metadata, "filepath": "/var/log/empty.log", "file_size": 0}
+    other_file = {**sample_file_metadata, "filepath": "/var/log/other.log", "sha256": "b" * 64}
+
+    response = await client.post(
+        "/put_files",
+        json=[sample_file_metadata, empty_file, other_file],
+        headers={"Authorization": f"Bearer {test_user_token}"}
+    )
+    assert response.status_code == 201
+
+    data = response.json()
+    assert [d["filepath"] for d in data] == [
+        "/var/log/test.log",
+        "/var/log/empty.log",
+        "/var/log/other.log",
+    ]
+    assert [d["upload_required"] for d in data] == [True, False, True]
+    assert len({d["_id"] for d in data}) == 3
+
+
 @pytest.mark.asyncio
 async def test_get_file_by_sha256(client: AsyncClient, sample_file_metadata, test_user_token: str):
     """Test retrieving file metadata by SHA256."""
@@ -134,6 +157,16 @@ async def test_get_file_invalid_sha256_length(client: AsyncClient, test_user_tok
     assert "64 characters" in data["detail"]
 
 
+@pytest.mark.asyncio
+async def test_get_file_non_hex_sha256(client: AsyncClient, test_user_token: str):
+    """Test that a 64-character hash with non-hex characters returns 400."""
+    response = await client.get(
+        f"/get_file/{'g' * 64}",
+        headers={"Authorization": f"Bearer {test_user_token}"}
+    )
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_put_multiple_files(client: AsyncClient, sample_file_metadata, test_user_token: str):
     """Test storing multiple different files."""
@@ -190,8 +223,9 @@ async def test_put_duplicate_sha256(client: AsyncClient, sample_file_metadata, t
         json=sample_file_metadata,
         headers={"Authorization": f"Bearer {test_user_token}"}
     )
-    # Should still succeed (MongoDB will create a new document)
+    # Should still succeed (the existing record is updated)
     assert response2.status_code == 201
+    assert response2.json()["_id"] == response1.json()["_id"]
 
 
 @pytest.mark.asyncio
@@ -203,6 +237,28 @@ async def test_api_cors_headers(client: AsyncClient):
     assert "application/json" in response.headers.get("content-type", "")
 
 
+def test_check_storage_directory(tmp_path):
+    """Test that the storage check creates the directory and cleans up."""
+    from putplace_server.main import check_storage_directory
+
+    storage_path = tmp_path / "storage"
+    check_storage_directory(storage_path)
+
+    assert storage_path.is_dir()
+    assert list(storage_path.iterdir()) == []
+
+
+def test_check_storage_directory_not_a_directory(tmp_path):
+    """Test that a storage path pointing at a file is rejected."""
+    from putplace_server.main import check_storage_directory
+
+    storage_path = tmp_path / "file"
+    storage_path.write_text("not a directory")
+
+    with pytest.raises(RuntimeError, match="not a directory"):
+        check_storage_directory(storage_path)
+
+
 @pytest.mark.asyncio
 async def test_app_lifespan(test_settings, test_db, monkeypatch):
     """Test application lifespan manager handles startup/shutdown.
@@ -90,6 +90,19 @@ async def test_upload_file_endpoint(client: AsyncClient, test_user_token: str, s
     assert response.status_code in [200, 400]
 
 
+@pytest.mark.asyncio
+async def test_upload_file_unregistered_sha256(client: AsyncClient, test_user_token: str):
+    """Test that content for a SHA256 with no metadata is rejected."""
+    response = await client.post(
+        f"/upload_file/{'f' * 64}",
+        params={"hostname": "host", "filepath": "/tmp/x"},
+        files={"file": ("x.txt", BytesIO(b"data"), "text/plain")},
+        headers={"Authorization": f"Bearer {test_user_token}"}
+    )
+
+    assert response.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_api_my_files_endpoint(client: AsyncClient, test_user_token: str, sample_file_metadata):
     """Test GET /api/my_files endpoint."""
@@ -310,6 +310,63 @@ async def test_jwt_token_contains_email(client: AsyncClient, test_db):
     assert email == "jwt@example.com"
 
 
+def test_decode_access_token_cached():
+    """Test that a decoded token is served from the cache until it expires."""
+    from datetime import timedelta
+
+    from putplace_server.user_auth import create_access_token, decode_access_token
+
+    token = create_access_token({"sub": "cached@example.com"}, timedelta(minutes=5))
+    assert decode_access_token(token) == "cached@example.com"
+
+    with patch("putplace_server.user_auth.jwt.decode") as mock_decode:
+        assert decode_access_token(token) == "cached@example.com"
+        mock_decode.assert_not_called()
+
+
+def test_decode_access_token_expired_not_cached():
+    """Test that expired and invalid tokens are rejected."""
+    from datetime import timedelta
+
+    from putplace_server.user_auth import create_access_token, decode_access_token
+
+    token = create_access_token({"sub": "expired@example.com"}, timedelta(seconds=-1))
+    assert decode_access_token(token) is None
+    assert decode_access_token("not-a-token") is None
+
+
+@pytest.mark.asyncio
+async def test_home_page_etag(client: AsyncClient):
+    """Test that the home page is gzipped and revalidated with its ETag."""
+    response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+
+    response = await client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_static_page_content_negotiation():
+    """Test Accept-Encoding q-values and If-None-Match list parsing."""
+    from putplace_server.routers.pages import _accepts_gzip, _etag_matches
+
+    assert _accepts_gzip("gzip, deflate, br")
+    assert _accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert _accepts_gzip("*")
+    assert not _accepts_gzip("")
+    assert not _accepts_gzip("gzip;q=0")
+    assert not _accepts_gzip("*, gzip;q=0")
+    assert not _accepts_gzip("identity")
+
+    assert _etag_matches('"abc"', '"abc"')
+    assert _etag_matches('"old", W/"abc"', '"abc"')
+    assert _etag_matches("*", '"abc"')
+    assert not _etag_matches('"abc-gzip"', '"abc"')
+    assert not _etag_matches("", '"abc"')
+
+
 @pytest.mark.asyncio
 async def test_home_page_has_auth_links(client: AsyncClient):
     """Test that home page contains links to login and register."""
@@ -126,6 +126,31 @@ async def test_verify_api_key_inactive(test_db):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_verify_api_key_cached():
+    """Test that verified keys are cached until a key is revoked or deleted."""
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from putplace_server.auth import invalidate_api_key_cache
+
+    collection = MagicMock()
+    collection.find_one_and_update = AsyncMock(
+        return_value={"_id": "abc", "name": "cached-key", "is_active": True}
+    )
+    auth = APIKeyAuth(MagicMock())
+
+    with patch.object(APIKeyAuth, "get_api_keys_collection", AsyncMock(return_value=collection)):
+        first = await auth.verify_api_key("cached_key_12345")
+        second = await auth.verify_api_key("cached_key_12345")
+        assert first == second
+        assert first["name"] == "cached-key"
+        assert collection.find_one_and_update.await_count == 1
+
+        invalidate_api_key_cache()
+        await auth.verify_api_key("cached_key_12345")
+        assert collection.find_one_and_update.await_count == 2
+
+
 @pytest.mark.asyncio
 async def test_revoke_api_key(test_db):
     """Test revoking an API key."""
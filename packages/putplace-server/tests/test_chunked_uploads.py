@@ -280,6 +280,41 @@ async def test_complete_upload_success(client: AsyncClient, auth_headers, test_f
     # File metadata creation confirmed by successful completion response
 
 
+@pytest.mark.asyncio
+async def test_initiate_upload_existing_content(
+    client: AsyncClient, auth_headers, test_file_data, test_db
+):
+    """Test that initiating an upload of already stored content returns 409."""
+    await test_db.insert_file_metadata({
+        "filepath": "/other/host/copy.txt",
+        "hostname": "other-machine",
+        "sha256": test_file_data["sha256"],
+        "has_file_content": True,
+    })
+
+    response = await client.post(
+        "/api/uploads/initiate",
+        json={
+            "filepath": test_file_data["filepath"],
+            "hostname": test_file_data["hostname"],
+            "sha256": test_file_data["sha256"],
+            "file_size": test_file_data["file_size"],
+            "chunk_size": test_file_data["chunk_size"],
+            "total_chunks": test_file_data["total_chunks"]
+        },
+        headers=auth_headers
+    )
+
+    assert response.status_code == 409
+
+    # The new location is recorded against the existing content
+    clone = await test_db.collection.find_one(
+        {"sha256": test_file_data["sha256"], "hostname": test_file_data["hostname"]}
+    )
+    assert clone is not None
+    assert clone["has_file_content"] is True
+
+
 @pytest.mark.asyncio
 async def test_complete_upload_missing_chunks(client: AsyncClient, auth_headers, test_file_data):
     """Test completing upload with missing chunks fails."""
@@ -788,3 +823,32 @@ async def test_concurrent_uploads_different_files(client: AsyncClient, auth_head
     assert complete2_data["sha256"] == file2_sha256
     assert complete1_data["status"] == "completed"
     assert complete2_data["status"] == "completed"
+
+
+def test_assemble_chunks_hashes_concatenated_content(tmp_path: Path):
+    """Test that chunk assembly writes and hashes the chunks in order."""
+    from putplace_server.routers.uploads import ASSEMBLY_BUFFER_SIZE, _assemble_chunks
+
+    chunks = [b"a" * (ASSEMBLY_BUFFER_SIZE + 7), b"", b"tail"]
+    for i, data in enumerate(chunks):
+        (tmp_path / f"chunk_{i:06d}").write_bytes(data)
+
+    final_path = tmp_path / "assembled_file"
+    digest = _assemble_chunks(tmp_path, len(chunks), final_path)
+
+    assert final_path.read_bytes() == b"".join(chunks)
+    assert digest == hashlib.sha256(b"".join(chunks)).hexdigest()
+
+    with pytest.raises(FileNotFoundError):
+        _assemble_chunks(tmp_path, len(chunks) + 1, tmp_path / "other")
+
+
+async def test_iter_file_yields_bounded_chunks(tmp_path: Path):
+    """Test that the assembled file is streamed in bounded chunks."""
+    from putplace_server.routers.uploads import _iter_file
+
+    file_path = tmp_path / "assembled_file"
+    file_path.write_bytes(b"x" * 10)
+
+    chunks = [chunk async for chunk in _iter_file(file_path, chunk_size=4)]
+    assert chunks == [b"xxxx", b"xxxx", b"xx"]
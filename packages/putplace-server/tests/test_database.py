@@ -2,7 +2,7 @@
 
 import pytest
 
-from putplace_server.database import MongoDB
+from putplace_server.database import OBSOLETE_FILE_INDEXES, MongoDB
 
 
 @pytest.mark.asyncio
@@ -48,6 +48,20 @@ async def test_find_by_sha256_not_exists(test_db: MongoDB):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_find_by_sha256_projection(test_db: MongoDB, sample_file_metadata):
+    """Test finding by SHA256 with a projection and checking existence."""
+    await test_db.insert_file_metadata(sample_file_metadata)
+
+    result = await test_db.find_by_sha256(
+        sample_file_metadata["sha256"], projection={"_id": 0, "hostname": 1}
+    )
+    assert result == {"hostname": sample_file_metadata["hostname"]}
+
+    assert await test_db.exists_by_sha256(sample_file_metadata["sha256"]) is True
+    assert await test_db.exists_by_sha256("f" * 64) is False
+
+
 @pytest.mark.asyncio
 async def test_insert_multiple_documents(test_db: MongoDB, sample_file_metadata):
     """Test inserting multiple documents."""
@@ -72,6 +86,62 @@ async def test_insert_multiple_documents(test_db: MongoDB, sample_file_metadata)
     assert result2["filepath"] == second_metadata["filepath"]
 
 
+@pytest.mark.asyncio
+async def test_insert_same_file_upserts(test_db: MongoDB, sample_file_metadata):
+    """Test that re-submitting a file updates its record without clearing content state."""
+    doc_id1 = await test_db.insert_file_metadata(sample_file_metadata)
+    await test_db.mark_file_uploaded(
+        sample_file_metadata["sha256"],
+        sample_file_metadata["hostname"],
+        sample_file_metadata["filepath"],
+        "/storage/aa/" + sample_file_metadata["sha256"],
+    )
+
+    rescanned = {**sample_file_metadata, "file_mtime": 1700000000.0, "has_file_content": False}
+    doc_id2 = await test_db.insert_file_metadata(rescanned)
+
+    assert doc_id1 == doc_id2
+    assert await test_db.collection.count_documents({}) == 1
+
+    record = await test_db.find_by_sha256(sample_file_metadata["sha256"])
+    assert record["file_mtime"] == 1700000000.0
+    assert record["has_file_content"] is True
+
+
+@pytest.mark.asyncio
+async def test_insert_without_stat_fields_keeps_them(test_db: MongoDB, sample_file_metadata):
+    """Test that metadata without stat fields does not overwrite stored ones."""
+    await test_db.insert_file_metadata(sample_file_metadata)
+
+    location_only = {
+        key: sample_file_metadata[key] for key in ("filepath", "hostname", "sha256", "file_size")
+    }
+    await test_db.insert_file_metadata({**location_only, "filepath": "/var/log/other.log"})
+    await test_db.insert_file_metadata(location_only)
+
+    record = await test_db.collection.find_one({"filepath": sample_file_metadata["filepath"]})
+    assert record["file_mode"] == sample_file_metadata["file_mode"]
+    assert record["file_mtime"] == sample_file_metadata["file_mtime"]
+    assert record["ip_address"] == sample_file_metadata["ip_address"]
+
+    other = await test_db.collection.find_one({"filepath": "/var/log/other.log"})
+    assert other["file_mode"] == 0
+    assert other["ip_address"] == ""
+
+
+@pytest.mark.asyncio
+async def test_insert_many_file_metadata(test_db: MongoDB, sample_file_metadata):
+    """Test bulk upsert returns IDs for new and existing records in order."""
+    existing_id = await test_db.insert_file_metadata(sample_file_metadata)
+    new_file = {**sample_file_metadata, "filepath": "/var/log/new.log"}
+
+    doc_ids = await test_db.insert_many_file_metadata([new_file, sample_file_metadata])
+
+    assert doc_ids[1] == existing_id
+    assert doc_ids[0] != existing_id
+    assert await test_db.collection.count_documents({}) == 2
+
+
 @pytest.mark.asyncio
 async def test_database_indexes(test_db: MongoDB):
     """Test that database indexes are created."""
@@ -85,6 +155,86 @@ async def test_database_indexes(test_db: MongoDB):
     assert any("sha256" in name for name in index_names)
 
 
+@pytest.mark.asyncio
+async def test_index_names():
+    """Test that index names are read from the collection's index listing."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    class Cursor:
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if not existing:
+                raise StopAsyncIteration
+            return {"name": existing.pop(0), "key": {}}
+
+    existing = ["_id_", "sha256_1"]
+    collection = MagicMock()
+    collection.list_indexes = AsyncMock(return_value=Cursor())
+
+    assert await MongoDB._index_names(collection) == {"_id_", "sha256_1"}
+
+
+def _index_collection(names: set[str]):
+    """Mock a collection whose index listing holds the given names."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    class Cursor:
+        def __init__(self):
+            self.names = list(names)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            if not self.names:
+                raise StopAsyncIteration
+            return {"name": self.names.pop(0), "key": {}}
+
+    collection = MagicMock()
+    collection.list_indexes = AsyncMock(side_effect=lambda: Cursor())
+    collection.drop_index = AsyncMock()
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_obsolete_location_index_kept_without_replacement():
+    """Test that the old location index stays if the unique index could not be built."""
+    collection = _index_collection({"_id_", "hostname_1_filepath_1"})
+
+    await MongoDB._drop_obsolete_indexes(collection)
+
+    collection.drop_index.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_obsolete_location_index_dropped_concurrently():
+    """Test that an index already dropped by another worker is not an error."""
+    from pymongo.errors import OperationFailure
+
+    collection = _index_collection(
+        {"_id_", "hostname_1_filepath_1", OBSOLETE_FILE_INDEXES["hostname_1_filepath_1"]}
+    )
+    collection.drop_index.side_effect = OperationFailure("index not found", code=27)
+
+    await MongoDB._drop_obsolete_indexes(collection)
+
+    collection.drop_index.assert_awaited_once_with("hostname_1_filepath_1")
+
+
+@pytest.mark.asyncio
+async def test_obsolete_sha256_index_dropped_after_replacement():
+    """Test that the old sha256 index is only dropped once the sort index exists."""
+    collection = _index_collection({"_id_", "sha256_1"})
+    await MongoDB._drop_obsolete_indexes(collection)
+    collection.drop_index.assert_not_called()
+
+    collection = _index_collection({"_id_", "sha256_1", OBSOLETE_FILE_INDEXES["sha256_1"]})
+    await MongoDB._drop_obsolete_indexes(collection)
+    collection.drop_index.assert_awaited_once_with("sha256_1")
+
+
 @pytest.mark.asyncio
 async def test_insert_without_connection():
     """Test that insert fails without database connection."""
@@ -225,11 +375,13 @@ async def test_insert_with_connection_loss(test_db: MongoDB, sample_file_metadat
     from unittest.mock import AsyncMock
 
     # Save original method
-    original_insert = test_db.collection.insert_one
+    original_upsert = test_db.collection.find_one_and_update
 
     try:
-        # Mock insert to raise ConnectionFailure
-        test_db.collection.insert_one = AsyncMock(side_effect=ConnectionFailure("Connection lost"))
+        # Mock upsert to raise ConnectionFailure
+        test_db.collection.find_one_and_update = AsyncMock(
+            side_effect=ConnectionFailure("Connection lost")
+        )
 
         # Should raise ConnectionFailure
         with pytest.raises(ConnectionFailure, match="Lost connection to database"):
@@ -237,7 +389,7 @@ async def test_insert_with_connection_loss(test_db: MongoDB, sample_file_metadat
 
     finally:
         # Restore original method
-        test_db.collection.insert_one = original_insert
+        test_db.collection.find_one_and_update = original_upsert
 
 
 @pytest.mark.asyncio
@@ -502,6 +654,61 @@ async def test_create_user_without_connection():
         await db.create_user("email@test.com", "pass")
 
 
+@pytest.mark.asyncio
+async def test_get_cached_user_by_email():
+    """Test that user lookups for authentication are cached until invalidated."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    db = MongoDB()
+    db.users_collection = MagicMock()
+    db.users_collection.find_one = AsyncMock(
+        return_value={"_id": "abc", "email": "cached@example.com", "is_active": True}
+    )
+
+    first = await db.get_cached_user_by_email("cached@example.com")
+    second = await db.get_cached_user_by_email("cached@example.com")
+
+    assert first == second == {"_id": "abc", "email": "cached@example.com", "is_active": True}
+    assert db.users_collection.find_one.await_count == 1
+    assert db.users_collection.find_one.await_args.kwargs["projection"] == {"hashed_password": 0}
+
+    db.invalidate_cached_user("cached@example.com")
+    await db.get_cached_user_by_email("cached@example.com")
+    assert db.users_collection.find_one.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_has_file_content_caches_positive_results():
+    """Test that only hashes found to have content are cached."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    db = MongoDB()
+    db.collection = MagicMock()
+    db.collection.find_one = AsyncMock(return_value=None)
+
+    assert await db.has_file_content("a" * 64) is False
+    assert await db.has_file_content("a" * 64) is False
+    assert db.collection.find_one.await_count == 2
+
+    db.collection.find_one.return_value = {"sha256": "a" * 64}
+    assert await db.has_file_content("a" * 64) is True
+    assert await db.has_file_content("a" * 64) is True
+    assert db.collection.find_one.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_is_healthy_cached():
+    """Test that health check results are reused for a short time."""
+    from unittest.mock import AsyncMock
+
+    db = MongoDB()
+    db.is_healthy = AsyncMock(return_value=False)
+
+    assert await db.is_healthy_cached() is False
+    assert await db.is_healthy_cached() is False
+    assert db.is_healthy.await_count == 1
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_email(test_db: MongoDB):
     """Test getting user by email."""
@@ -6,7 +6,7 @@ from pathlib import Path
 
 import pytest
 
-from putplace_server.storage import LocalStorage, get_storage_backend
+from putplace_server.storage import ContentHashMismatchError, LocalStorage, get_storage_backend
 
 
 class TestLocalStorage:
@@ -74,6 +74,50 @@ class TestLocalStorage:
         result = await local_storage.retrieve(sha256)
         assert result is None
 
+    async def test_store_stream(self, local_storage: LocalStorage, temp_storage_path: Path) -> None:
+        """Test streaming storage leaves only the final file behind."""
+        content = b"streamed content" * 1000
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        async def chunks():
+            for i in range(0, len(content), 4096):
+                yield content[i:i + 4096]
+
+        assert await local_storage.store_stream(sha256, chunks(), len(content))
+        assert await local_storage.retrieve(sha256) == content
+        assert [p.name for p in (temp_storage_path / sha256[:2]).iterdir()] == [sha256]
+
+    async def test_store_stream_failure_keeps_existing(self, local_storage: LocalStorage) -> None:
+        """Test that a failed stream does not replace stored content."""
+        content = b"original content"
+        sha256 = hashlib.sha256(content).hexdigest()
+        await local_storage.store(sha256, content)
+
+        async def failing_chunks():
+            yield b"partial"
+            raise OSError("connection reset")
+
+        assert not await local_storage.store_stream(sha256, failing_chunks(), 100)
+        assert await local_storage.retrieve(sha256) == content
+
+    async def test_store_stream_hash_mismatch_keeps_existing(
+        self, local_storage: LocalStorage, temp_storage_path: Path
+    ) -> None:
+        """Test that mismatched content is rejected before it replaces stored content."""
+        content = b"original content"
+        sha256 = hashlib.sha256(content).hexdigest()
+        await local_storage.store(sha256, content)
+
+        async def wrong_chunks():
+            yield b"different content"
+
+        with pytest.raises(ContentHashMismatchError) as exc_info:
+            await local_storage.store_stream(sha256, wrong_chunks(), 17)
+
+        assert exc_info.value.actual == hashlib.sha256(b"different content").hexdigest()
+        assert await local_storage.retrieve(sha256) == content
+        assert [p.name for p in (temp_storage_path / sha256[:2]).iterdir()] == [sha256]
+
     async def test_subdirectory_organization(self, local_storage: LocalStorage, temp_storage_path: Path) -> None:
         """Test that files are organized into subdirectories by first 2 chars of SHA256."""
         content = b"Subdirectory test"
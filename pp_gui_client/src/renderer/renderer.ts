@@ -131,7 +131,8 @@ interface PPassistConfigResult {
       };
       sha256: {
         chunk_size: number;
-        chunk_delay_ms: number;
+        nice: number;
+        workers: number;
         batch_size: number;
         batch_delay_seconds: number;
       };
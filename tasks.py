@@ -12,6 +12,7 @@ from invoke_tasks.gui import (
 from invoke_tasks.utils import (
     flush_dns,
     install_electron_client,
+    pp_scan_cache_clear,
 )
 
 